@@ -1,31 +1,71 @@
 import streamlit as st
-import pandas as pd
 import plotly.graph_objects as go
-from PIL import Image
-from io import BytesIO
-import base64
+import assets
+import charts
+import elasticity
+from figure_cache import FIGURES
+import goal_seek
+import pricing
+import projection
+import roi_engine
+import scenario_store
+import session_memory
+import staffing
+import timings
+import functools
+import numpy as np
+from datetime import datetime
+
+# Modules behind sections that are off by default (call log upload, Monte Carlo, sensitivity, monthly outlook)
+# are imported when those sections first render, keeping a new worker's cold start short.
+# See benchmarks/startup.py for the budget.
 
 # --- Page Setup ---
 st.set_page_config(page_title="ConnexUs.AI Calculator", page_icon="favicon-32x32.png", layout="wide")
 
-# --- Favicon Injection (Base64 Embedded) ---
-def load_favicon_base64(path="favicon-32x32.png"):
+# --- Debug Timings (opt-in, see timings.py) ---
+# ?debug=timings shows the timing panel for this session; CONNEXUS_DEBUG_TIMINGS=1 times every session
+show_timings = st.query_params.get("debug") == "timings"
+st.session_state["debug_timings"] = show_timings or timings.ENABLED_FOR_ALL
+timings.begin_run(st.session_state["debug_timings"])
+
+# Idle sessions are evicted by session_memory.py; every script and fragment run counts as activity
+session_memory.touch()
+
+def timed_fragment(name):
+    timed = timings.instrumented(name, lambda: st.session_state.get("debug_timings", False))
+
+    def decorate(func):
+        func = timed(func)
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            session_memory.touch()
+            return func(*args, **kwargs)
+        return wrapper
+    return decorate
+
+def plotly_chart(name, fig):
+    with timings.section(f"chart.{name}"):
+        st.plotly_chart(fig, use_container_width=True)
+
+# --- Static Assets (optimized once per process and served from static/, see assets.py) ---
+def static_asset_url(name, fmt="webp"):
     try:
-        img = Image.open(path)
-        buffer = BytesIO()
-        img.save(buffer, format="PNG")
-        return base64.b64encode(buffer.getvalue()).decode("utf-8")
+        return assets.asset_url(name, fmt)
     except Exception:
         return None
 
-favicon_b64 = load_favicon_base64()
-if favicon_b64:
-    st.markdown(
-        f"""
-        <link rel="icon" type="image/png" sizes="32x32" href="data:image/png;base64,{favicon_b64}">
-        """,
-        unsafe_allow_html=True
-    )
+# --- Favicon Injection ---
+with timings.section("assets.favicon"):
+    favicon_url = static_asset_url("favicon", "png")
+    if favicon_url:
+        st.markdown(
+            f"""
+            <link rel="icon" type="image/png" sizes="32x32" href="{favicon_url}">
+            """,
+            unsafe_allow_html=True
+        )
 
 # --- Theme-safe Global Styling ---
 st.markdown(
@@ -46,41 +86,35 @@ st.markdown(
 )
 
 # --- Watermark Setup ---
-def load_watermark_base64(path="connexus_logo_watermark.png"):
-    try:
-        with open(path, "rb") as f:
-            img = Image.open(f)
-            buffer = BytesIO()
-            img.save(buffer, format="PNG")
-            return base64.b64encode(buffer.getvalue()).decode("utf-8")
-    except:
-        return None
-
-watermark_b64 = load_watermark_base64()
-if watermark_b64:
-    st.markdown(
-        f"""
-        <style>
-        .watermark {{
-            position: fixed;
-            top: 80px;
-            left: calc(540px + 30%);
-            transform: translateX(-50%);
-            height: 800px;
-            width: 850px;
-            z-index: 0;
-            pointer-events: none;
-            background-image: url("data:image/png;base64,{watermark_b64}");
-            background-repeat: no-repeat;
-            background-position: center center;
-            background-size: contain;
-            opacity: 0.15;
-        }}
-        </style>
-        <div class="watermark"></div>
-        """,
-        unsafe_allow_html=True
-    )
+# A static URL lets the browser cache the image instead of receiving a data URI on every rerun
+with timings.section("assets.watermark"):
+    watermark_webp = static_asset_url("watermark", "webp")
+    watermark_png = static_asset_url("watermark", "png")
+    if watermark_webp and watermark_png:
+        st.markdown(
+            f"""
+            <style>
+            .watermark {{
+                position: fixed;
+                top: 80px;
+                left: calc(540px + 30%);
+                transform: translateX(-50%);
+                height: 800px;
+                width: 850px;
+                z-index: 0;
+                pointer-events: none;
+                background-image: url("{watermark_png}");
+                background-image: image-set(url("{watermark_webp}") type("image/webp"), url("{watermark_png}") type("image/png"));
+                background-repeat: no-repeat;
+                background-position: center center;
+                background-size: contain;
+                opacity: 0.15;
+            }}
+            </style>
+            <div class="watermark"></div>
+            """,
+            unsafe_allow_html=True
+        )
 
 # --- Title ---
 st.markdown("""
@@ -104,7 +138,7 @@ TRANSPARENT_LAYOUT = dict(
 # Now whenever you create a figure:
 # fig.update_layout(**TRANSPARENT_LAYOUT)
 
-def metric_block(label, value, color="#00FFAA", border="#00FFAA", prefix="", suffix=""):
+def metric_block(label, value, color="#00FFAA", border="#00FFAA", prefix="", suffix="", decimals=1):
     return f"""
     <div style='
         background-color: #111;
@@ -115,171 +149,447 @@ def metric_block(label, value, color="#00FFAA", border="#00FFAA", prefix="", suf
         margin-bottom: 25px;
     '>
         <div style='color: white; font-size: 16px; margin-bottom: 5px;'>{label}</div>
-        <div style='color: {color}; font-size: 36px; font-weight: bold;'>{prefix}{value:,.1f}{suffix}</div>
+        <div style='color: {color}; font-size: 36px; font-weight: bold;'>{prefix}{value:,.{decimals}f}{suffix}</div>
     </div>
     """
     
 def caption(text):
     return f"<div style='color: white; font-size: 15px; margin-bottom: 10px;'>{text}</div>"
 
-# Load logo
-logo = Image.open("connexus_logo.png")
+# --- Call Log Upload (parsed once per file, see call_logs.py) ---
+def load_call_log(upload):
+    # Remember the summary per upload so reruns don't re-hash the file
+    cached = st.session_state.get("call_log")
+    if cached is not None and cached[0] == upload.file_id:
+        return cached[1]
+    import call_logs
+
+    try:
+        with st.spinner("Reading call log..."):
+            summary = call_logs.load(upload, upload.name)
+    except Exception as exc:
+        st.sidebar.error(f"Couldn't read the call log: {exc}")
+        return None
+    st.session_state["call_log"] = (upload.file_id, summary)
+    # Seed the peak assumptions in the HR section from the log
+    if summary["hr_peak_staffing"] is not None:
+        st.session_state["bottom_peak_staffing"] = summary["hr_peak_staffing"]
+        st.session_state["bottom_peak_freq"] = summary["hr_peak_frequency"]
+    return summary
+
+# --- Saved Scenarios (stored and encoded by scenario_store.py) ---
+# Sidebar widgets take their defaults from the restored scenario; bumping the generation in
+# their keys gives them fresh state when another scenario is opened.
+HR_STATE_KEYS = {
+    "hr_attrition": "bottom_attrition",
+    "hr_no_show": "bottom_noshow",
+    "hr_pto_days": "bottom_pto",
+    "hr_new_hire_cost": "bottom_hire_cost",
+    "hr_peak_staffing": "bottom_peak_staffing",
+    "hr_peak_frequency": "bottom_peak_freq",
+}
+# Seeded here rather than through the widgets' default values: load_call_log and
+# restore_scenario also write these keys, and a widget may not have both
+for field, key in HR_STATE_KEYS.items():
+    st.session_state.setdefault(key, roi_engine.DEFAULT_INPUTS[field])
+
+def restore_scenario(restored_inputs, profile=None, scenario_id=None):
+    st.session_state["restored_inputs"] = restored_inputs
+    st.session_state["restored_profile"] = profile
+    st.session_state["restored_generation"] = st.session_state.get("restored_generation", -1) + 1
+    st.session_state["open_scenario"] = None
+    if scenario_id is not None:
+        st.session_state["open_scenario"] = (scenario_id, scenario_store.inputs_key(restored_inputs, profile))
+    if restored_inputs.get("use_hr_impact"):
+        for field, key in HR_STATE_KEYS.items():
+            st.session_state[key] = restored(field)
+
+def restored(name):
+    default = roi_engine.DEFAULT_INPUTS[name]
+    value = st.session_state["restored_inputs"].get(name, default)
+    # Match the widget's type (sliders reject mixed int/float arguments)
+    return type(default)(round(value) if isinstance(default, int) and not isinstance(default, bool) else value)
+
+def input_key(name):
+    return f"{name}_{st.session_state['restored_generation']}"
+
+if "restored_inputs" not in st.session_state:
+    # First run of the session: pick up the scenario from the URL (survives a reload)
+    url_id = st.query_params.get("scenario", "")
+    url_scenario = scenario_store.get(int(url_id)) if url_id.isdigit() else None
+    if url_scenario is not None:
+        restore_scenario(url_scenario["inputs"], url_scenario["volume_profile"], url_scenario["id"])
+    else:
+        restore_scenario(scenario_store.decode_inputs(st.query_params.get("s", "")))
 
 # --- SIDEBAR INPUTS ---
-st.sidebar.image(logo, use_container_width=True)
+with timings.section("assets.logo"):
+    logo_webp = static_asset_url("logo", "webp")
+    logo_png = static_asset_url("logo", "png")
+    if logo_webp and logo_png:
+        st.sidebar.markdown(
+            f"""
+            <picture>
+                <source srcset="{logo_webp}" type="image/webp">
+                <img src="{logo_png}" alt="ConnexUS" style="width: 100%;">
+            </picture>
+            """,
+            unsafe_allow_html=True
+        )
 st.sidebar.header("📊 Input Your Call Center Data")
 
 # Revenue & Volume
 st.sidebar.subheader("📈 Revenue & Volume")
-monthly_revenue   = st.sidebar.number_input("Monthly Revenue ($)", value=250000, step=10000)
-weekly_interactions = st.sidebar.number_input("Weekly Interactions", value=10000, step=100)
-aht             = st.sidebar.slider("Average Handle Time (minutes)", 1, 20, 6)
+monthly_revenue   = st.sidebar.number_input("Monthly Revenue ($)", value=restored("monthly_revenue"), step=10000, key=input_key("monthly_revenue"))
+call_log = st.sidebar.file_uploader("Call Detail Export (CSV or Parquet)", type=["csv", "parquet"],
+                                    help="One row per call with a start timestamp and handle time "
+                                         "(or talk/hold/wrap columns).")
+call_summary = load_call_log(call_log) if call_log is not None else None
+if call_summary is not None:
+    st.sidebar.caption(
+        f"{call_summary['calls']:,} calls from {call_summary['first_day']} to {call_summary['last_day']}."
+    )
+    weekly_interactions = st.sidebar.number_input("Weekly Interactions", value=round(call_summary["weekly_interactions"]), step=100)
+    if call_summary["aht"] is not None:
+        aht = st.sidebar.slider("Average Handle Time (minutes)", 1.0, 20.0, min(max(round(call_summary["aht"], 1), 1.0), 20.0), step=0.1)
+    else:
+        aht = st.sidebar.slider("Average Handle Time (minutes)", 1, 20, restored("aht"), key=input_key("aht"))
+else:
+    weekly_interactions = st.sidebar.number_input("Weekly Interactions", value=restored("weekly_interactions"), step=100, key=input_key("weekly_interactions"))
+    aht             = st.sidebar.slider("Average Handle Time (minutes)", 1, 20, restored("aht"), key=input_key("aht"))
 
 # Workforce & Agent Metrics
 st.sidebar.subheader("👥 Workforce & Agent Metrics")
-agents          = st.sidebar.slider("Agents (FTE)", 1, 100, 25)
-hourly_cost     = st.sidebar.slider("Agent Hourly Cost ($)", 10.0, 60.0, 15.0)
-hours_per_week  = st.sidebar.slider("Weekly Hours per Agent", 35, 45, 40)
-shift_hours     = st.sidebar.number_input("Shift Length (hours)", value=8.5, step=0.5)
+agents          = st.sidebar.slider("Agents (FTE)", 1, 100, restored("agents"), key=input_key("agents"))
+hourly_cost     = st.sidebar.slider("Agent Hourly Cost ($)", 10.0, 60.0, restored("hourly_cost"), key=input_key("hourly_cost"))
+hours_per_week  = st.sidebar.slider("Weekly Hours per Agent", 35, 45, restored("hours_per_week"), key=input_key("hours_per_week"))
+shift_hours     = st.sidebar.number_input("Shift Length (hours)", value=restored("shift_hours"), step=0.5, key=input_key("shift_hours"))
+use_erlang_staffing = st.sidebar.checkbox("Size Staffing with Erlang C (Service Level)", value=restored("use_erlang_staffing"), key=input_key("use_erlang_staffing"))
+if use_erlang_staffing:
+    service_level_percent = st.sidebar.slider("Service Level Target (%)", 50, 99, restored("service_level_percent"), key=input_key("service_level_percent"))
+    answer_time_seconds   = st.sidebar.number_input("Answer Within (seconds)", value=restored("answer_time_seconds"), step=5, key=input_key("answer_time_seconds"))
+else:
+    service_level_percent = 80
+    answer_time_seconds   = 20
 
 # Business Impact Assumptions
 st.sidebar.subheader("💼 Business Impact Assumptions")
-production_percent = st.sidebar.number_input("Production Improvement (%)", value=25.0, step=0.1)
-upsell_percent     = st.sidebar.number_input("Upsell Improvement (%)", value=10.0, step=0.1)
+production_percent = st.sidebar.number_input("Production Improvement (%)", value=restored("production_percent"), step=0.1, key=input_key("production_percent"))
+upsell_percent     = st.sidebar.number_input("Upsell Improvement (%)", value=restored("upsell_percent"), step=0.1, key=input_key("upsell_percent"))
 
 # AI Cost Inputs
 st.sidebar.markdown("---")
 st.sidebar.subheader("🤖 AI Cost Inputs")
-automation       = st.sidebar.slider("AI Automation % Target", 0, 100, 50)
-subscription      = st.sidebar.number_input("AI Monthly Subscription ($)", value=2000, step=100)
-integration       = st.sidebar.number_input("One-time Integration Fee ($)", value=15000, step=1000)
-ai_cost_per_min  = st.sidebar.number_input("AI Cost per Minute ($)", value=0.18, step=0.01)
+automation       = st.sidebar.slider("AI Automation % Target", 0, 100, restored("automation"), key=input_key("automation"))
+subscription      = st.sidebar.number_input("AI Monthly Subscription ($)", value=restored("subscription"), step=100, key=input_key("subscription"))
+integration       = st.sidebar.number_input("One-time Integration Fee ($)", value=restored("integration"), step=1000, key=input_key("integration"))
+ai_cost_per_min  = st.sidebar.number_input("AI Cost per Minute ($)", value=restored("ai_cost_per_min"), step=0.01, key=input_key("ai_cost_per_min"))
+use_tiered_pricing = st.sidebar.checkbox("Tiered AI Minute Pricing", value=False,
+                                         help="Bill AI minutes with included minutes, tiers and a committed spend "
+                                              "instead of the flat cost per minute.")
+ai_pricing = None
+if use_tiered_pricing:
+    with st.sidebar.expander("Tiered Pricing Schedule", expanded=True):
+        included_minutes = st.number_input("Included Minutes / Month", value=10000, step=1000, min_value=0)
+        tier_mode = st.selectbox("Tier Pricing", pricing.TIER_MODES, format_func=str.capitalize,
+                                 help="Graduated: each tier's rate applies to the minutes inside it. "
+                                      "Volume: every billable minute at the rate of the tier the month reaches.")
+        tier1_up_to = st.number_input("Tier 1 Up To (minutes/month)", value=50000, step=5000)
+        tier1_rate = st.number_input("Tier 1 Rate ($/min)", value=0.18, step=0.01)
+        tier2_up_to = st.number_input("Tier 2 Up To (minutes/month)", value=150000, step=5000)
+        tier2_rate = st.number_input("Tier 2 Rate ($/min)", value=0.15, step=0.01)
+        overage_rate = st.number_input("Overage Rate ($/min)", value=0.12, step=0.01)
+        commit_spend = st.number_input("Committed Monthly Spend ($)", value=0, step=500, min_value=0)
+        commit_discount = st.number_input("Commit Discount (%)", value=0.0, step=1.0, min_value=0.0, max_value=99.0)
+    try:
+        ai_pricing = pricing.PricingSchedule(
+            [(tier1_up_to, tier1_rate), (tier2_up_to, tier2_rate), (None, overage_rate)],
+            included_minutes, tier_mode, commit_spend, commit_discount,
+        )
+    except ValueError as exc:
+        st.sidebar.error(f"{exc} — using the flat cost per minute.")
 
 # ROI Calculation Toggles
 st.sidebar.markdown("---")
-use_indirects    = st.sidebar.checkbox("Include Indirect Value in ROI Calculation", value=True)
-use_hr_impact    = st.sidebar.checkbox("Include Strategic HR Savings in ROI", value=False)
-
-# --- MAIN LAYOUT ---
-st.markdown("<hr style='margin-top: -1rem; margin-bottom: 1rem;'>", unsafe_allow_html=True)
-
-# --- 1. Total Monthly Workload ---
-monthly_minutes = weekly_interactions * aht * 4.33
-
-# --- 2. AI vs Residual Human Cost ---
-ai_minutes       = (automation / 100) * monthly_minutes
-residual_minutes = monthly_minutes - ai_minutes
-
-# AI spend
-ai_cost         = ai_minutes * ai_cost_per_min
-
-# Residual human labor after automation, with fully-loaded multiplier
-fully_loaded_multiplier = 1.222431
-residual_cost    = (residual_minutes / 60) * hourly_cost * fully_loaded_multiplier
-
-ai_enabled_cost      = ai_cost + residual_cost + subscription
-# Cost excluding residual labor (pure AI spend + subscription)
-total_ai_monthly_cost  = ai_cost + subscription
-
-# --- 3. Indirect Value (Production & Upsell) ---
-production_multiplier = production_percent / 100
-upsell_multiplier     = upsell_percent / 100
-
-# Convert saved minutes to dollar savings for production
-production_minutes_saved = monthly_minutes * production_multiplier
-production_hours_saved   = production_minutes_saved / 60
-production_dollar_savings = production_hours_saved * hourly_cost * fully_loaded_multiplier
-
-# Upsell tied to incremental revenue lift\_dollar_savings = monthly_revenue * upsell_multiplier
-upsell_dollar_savings   = monthly_revenue * upsell_multiplier
-
-# Total indirect savings in $ 
-indirect_savings = production_dollar_savings + upsell_dollar_savings
-
-total_monthly_value = (ai_enabled_cost := ai_enabled_cost)  # to preserve ai_enabled_cost name
-net_savings           = None  # placeholder below
-
-# --- 4. Baseline Human Cost Calculation ---
-agent_monthly_hours = hours_per_week * 4.33
-minutes_per_agent   = agent_monthly_hours * 60
-required_agents     = monthly_minutes / minutes_per_agent
-effective_agents   = max(agents, required_agents)
+use_indirects    = st.sidebar.checkbox("Include Indirect Value in ROI Calculation", value=restored("use_indirects"), key=input_key("use_indirects"))
+use_hr_impact    = st.sidebar.checkbox("Include Strategic HR Savings in ROI", value=restored("use_hr_impact"), key=input_key("use_hr_impact"))
 
-base_labor_cost     = effective_agents * agent_monthly_hours * hourly_cost
-baseline_human_cost = base_labor_cost * fully_loaded_multiplier
-
-# --- 5. Net Direct Savings ---
-net_savings         = baseline_human_cost - ai_enabled_cost
-
-# --- 6. ROI Value Basis (Direct + Optional Indirect + HR) ---
-value_basis = net_savings
-if use_indirects:
-    value_basis += indirect_savings
+# HR assumptions are edited inside the HR section fragment (hr_impact_section below);
+# the full-page run picks up their latest values from session state.
+if use_hr_impact:
+    hr_attrition = st.session_state["bottom_attrition"]
+    hr_no_show = st.session_state["bottom_noshow"]
+    hr_pto_days = st.session_state["bottom_pto"]
+    hr_new_hire_cost = st.session_state["bottom_hire_cost"]
+    hr_peak_staffing = st.session_state["bottom_peak_staffing"]
+    hr_peak_frequency = st.session_state["bottom_peak_freq"]
+else:
+    # Fallbacks if HR impact not used
+    hr_attrition = 0
+    hr_no_show = 0
+    hr_pto_days = 0
+    hr_new_hire_cost = 0
+    hr_peak_staffing = 0
+    hr_peak_frequency = 0
 
-# Placeholder for strategic (HR) impact; will be added later if toggled
-strategic_total = 0
+st.sidebar.markdown("---")
+use_monte_carlo  = st.sidebar.checkbox("Run Monte Carlo Uncertainty Analysis", value=False)
+use_sensitivity  = st.sidebar.checkbox("Show Sensitivity Analysis", value=False)
+use_monthly_outlook = st.sidebar.checkbox("Show Month-by-Month Outlook", value=False)
+use_saved_scenarios = st.sidebar.checkbox("Browse Saved Scenarios", value=False)
 
-# --- 7. ROI & Payback on Operating Cost ---
-roi_percent          = (value_basis / ai_enabled_cost) * 100 if ai_enabled_cost > 0 else 0
-annual_roi_percent   = roi_percent * 12
-payback_days         = (integration / value_basis) * 30 if value_basis > 0 else float('inf')
+# --- MAIN LAYOUT ---
+st.markdown("<hr style='margin-top: -1rem; margin-bottom: 1rem;'>", unsafe_allow_html=True)
 
-# --- 8. ROI vs Investment (Integration) ---
-annual_net_savings    = total_monthly_value * 12
-investment_roi       = ((annual_net_savings - integration) / integration) * 100 if integration > 0 else 0
-investment_payback_months = (integration / annual_net_savings) * 12 if annual_net_savings > 0 else float('inf')
+# --- 1-8. ROI Calculation (see roi_engine.py for the step-by-step formulas) ---
+inputs = dict(
+    monthly_revenue=monthly_revenue,
+    weekly_interactions=weekly_interactions,
+    aht=aht,
+    agents=agents,
+    hourly_cost=hourly_cost,
+    hours_per_week=hours_per_week,
+    shift_hours=shift_hours,
+    production_percent=production_percent,
+    upsell_percent=upsell_percent,
+    automation=automation,
+    subscription=subscription,
+    integration=integration,
+    ai_cost_per_min=ai_cost_per_min,
+    use_indirects=use_indirects,
+    use_hr_impact=use_hr_impact,
+    hr_attrition=hr_attrition,
+    hr_no_show=hr_no_show,
+    hr_pto_days=hr_pto_days,
+    hr_new_hire_cost=hr_new_hire_cost,
+    hr_peak_staffing=hr_peak_staffing,
+    hr_peak_frequency=hr_peak_frequency,
+    use_erlang_staffing=use_erlang_staffing,
+    service_level_percent=service_level_percent,
+    answer_time_seconds=answer_time_seconds,
+)
+# An uploaded call log's intraday volume profile drives Erlang C staffing (else the opened scenario's)
+if call_summary is not None:
+    import call_logs
+    volume_profile = call_logs.volume_profile(call_summary)
+else:
+    volume_profile = st.session_state["restored_profile"]
+# Cached on the inputs: reopening a saved scenario or revisiting inputs doesn't recompute
+with timings.section("calculation"):
+    results = scenario_store.cached_results(inputs, volume_profile, pricing=ai_pricing,
+                                            lap=timings.laps("calculation"))
+
+# Keep the URL in sync with the inputs so a reload (or a shared link) restores them
+inputs_token = scenario_store.encode_inputs(inputs)
+if st.query_params.get("s", "") != inputs_token:
+    if inputs_token:
+        st.query_params["s"] = inputs_token
+    else:
+        del st.query_params["s"]
+open_scenario = st.session_state["open_scenario"]
+if open_scenario is not None and open_scenario[1] != scenario_store.inputs_key(inputs, volume_profile, ai_pricing):
+    # Edited since it was opened or saved: the link no longer points at a stored scenario
+    st.session_state["open_scenario"] = open_scenario = None
+if open_scenario is None and "scenario" in st.query_params:
+    del st.query_params["scenario"]
+
+if use_erlang_staffing:
+    st.sidebar.caption(
+        f"Erlang C staffing over {staffing.INTERVALS_PER_WEEK} 15-minute intervals: "
+        f"{results['required_agents']:,.1f} FTE human-only, "
+        f"{results['residual_required_agents']:,.1f} FTE after automation."
+    )
+if ai_pricing is not None:
+    st.sidebar.caption(
+        f"Tiered pricing: ${results['ai_cost']:,.0f}/month for {results['ai_minutes']:,.0f} AI minutes "
+        f"(${float(ai_pricing.effective_rate(results['ai_minutes'])):.4f}/min effective)."
+    )
 
-dollar_saved_per_ai_dollar = (value_basis / total_ai_monthly_cost) if total_ai_monthly_cost > 0 else 0
+ai_cost                    = results["ai_cost"]
+residual_cost              = results["residual_cost"]
+ai_enabled_cost            = results["ai_enabled_cost"]
+production_dollar_savings  = results["production_dollar_savings"]
+upsell_dollar_savings      = results["upsell_dollar_savings"]
+indirect_savings           = results["indirect_savings"]
+baseline_human_cost        = results["baseline_human_cost"]
+net_savings                = results["net_savings"]
+roi_percent                = results["roi_percent"]
+annual_roi_percent         = results["annual_roi_percent"]
+payback_days               = results["payback_days"]
+investment_roi             = results["investment_roi"]
+investment_payback_months  = results["investment_payback_months"]
+dollar_saved_per_ai_dollar = results["dollar_saved_per_ai_dollar"]
+
+# Save the current scenario
+st.sidebar.markdown("---")
+st.sidebar.subheader("💾 Save Scenario")
+client_name   = st.sidebar.text_input("Client Name")
+scenario_name = st.sidebar.text_input("Scenario Name (optional)")
+if ai_pricing is not None:
+    st.sidebar.caption("Scenarios are saved with flat per-minute pricing; turn off tiered pricing to save.")
+if st.sidebar.button("Save Scenario", disabled=not client_name.strip() or ai_pricing is not None):
+    scenario_id = scenario_store.save(inputs, results, client_name, scenario_name, volume_profile)
+    st.session_state["open_scenario"] = open_scenario = (scenario_id, scenario_store.inputs_key(inputs, volume_profile))
+    st.query_params["scenario"] = str(scenario_id)
+if open_scenario is not None:
+    st.sidebar.caption(f"Saved as scenario #{open_scenario[0]} — the page URL reopens it.")
 
 # --- 9. Build the Streamlit UI ---
 # Core Financial Metrics
 st.markdown("## 📊 Core Financial Metrics (Operating Basis)")
 st.markdown(caption("These values reflect cost savings compared to your human-only baseline."), unsafe_allow_html=True)
-col1, col2, col3, col4 = st.columns(4)
-with col1:
-    st.markdown(metric_block("💰 Net Monthly Savings", net_savings, prefix="$"), unsafe_allow_html=True)
-with col2:
-    st.markdown(metric_block("🧾 Break-even Period", payback_days, suffix=" days"), unsafe_allow_html=True)
-with col3:
-    st.markdown(metric_block("📈 ROI on Operating Cost (Monthly)", roi_percent, suffix="%"), unsafe_allow_html=True)
-with col4:
-    st.markdown(metric_block("📈 ROI on Operating Cost (Annual)", annual_roi_percent, suffix="%"), unsafe_allow_html=True)
+with timings.section("metrics.core"):
+    col1, col2, col3, col4 = st.columns(4)
+    with col1:
+        st.markdown(metric_block("💰 Net Monthly Savings", net_savings, prefix="$"), unsafe_allow_html=True)
+    with col2:
+        st.markdown(metric_block("🧾 Break-even Period", payback_days, suffix=" days"), unsafe_allow_html=True)
+    with col3:
+        st.markdown(metric_block("📈 ROI on Operating Cost (Monthly)", roi_percent, suffix="%"), unsafe_allow_html=True)
+    with col4:
+        st.markdown(metric_block("📈 ROI on Operating Cost (Annual)", annual_roi_percent, suffix="%"), unsafe_allow_html=True)
+
+# What Moves the Needle: elasticities of the headline metrics from one forward-mode pass (elasticity.py)
+NEEDLE_LABELS = {
+    "monthly_revenue": "Monthly Revenue ($)",
+    "weekly_interactions": "Weekly Interactions",
+    "aht": "Average Handle Time (minutes)",
+    "agents": "Agents (FTE)",
+    "hourly_cost": "Agent Hourly Cost ($)",
+    "hours_per_week": "Weekly Hours per Agent",
+    "shift_hours": "Shift Length (hours)",
+    "production_percent": "Production Improvement (%)",
+    "upsell_percent": "Upsell Improvement (%)",
+    "automation": "AI Automation % Target",
+    "subscription": "AI Monthly Subscription ($)",
+    "integration": "One-time Integration Fee ($)",
+    "ai_cost_per_min": "AI Cost per Minute ($)",
+    "hr_attrition": "Monthly Attrition Rate (%)",
+    "hr_no_show": "No‑Call/No‑Show Rate (%)",
+    "hr_pto_days": "PTO/Sick‑Leave Days/Year",
+    "hr_new_hire_cost": "Cost per New Hire ($)",
+    "hr_peak_staffing": "Peak Volume Staffing Increase (%)",
+    "hr_peak_frequency": "Peak Volume Occurrence (per year)",
+    "service_level_percent": "Service Level Target (%)",
+    "answer_time_seconds": "Answer Within (seconds)",
+}
+
+def needle_table(needle):
+    def fmt(value, template):
+        return template.format(value) if np.isfinite(value) else "—"
+
+    def signed_dollars(value):
+        return f"{'-' if value < 0 else '+'}${abs(value):,.0f}" if np.isfinite(value) else "—"
+
+    cell = "padding: 4px 12px; text-align: right;"
+    header = "".join(
+        f"<th style='{cell}'>{title}</th>"
+        for title in ("+1% Moves Net Savings", "Net Savings", "ROI", "Break-even")
+    )
+    body = []
+    for field, point, slopes, elasticities in elasticity.ranked(needle):
+        if all(not np.isfinite(e) or e == 0 for e in elasticities.values()):
+            continue  # doesn't move any headline metric (e.g. HR inputs, toggled-off terms)
+        body.append(
+            f"<tr><td style='padding: 4px 12px;'>{NEEDLE_LABELS[field]} <span style='color: #888;'>({point:,g})</span></td>"
+            f"<td style='{cell}'>{signed_dollars(slopes['net_savings'] * point / 100)}</td>"
+            + "".join(f"<td style='{cell}'>{fmt(elasticities[metric], '{:+.2f}')}</td>" for metric in elasticity.METRICS)
+            + "</tr>"
+        )
+    return (
+        "<table style='color: white; font-size: 15px; border-collapse: collapse;'>"
+        f"<tr><th style='padding: 4px 12px; text-align: left;'>Input (current)</th>{header}</tr>"
+        + "".join(body) + "</table>"
+    )
+
+with timings.section("metrics.elasticity"):
+    with st.expander("🧭 What Moves the Needle"):
+        st.markdown(caption("Elasticity: the % change in each metric for a 1% change in the input. "
+                            "A negative break-even elasticity means a faster payback."), unsafe_allow_html=True)
+        needle = elasticity.compute(inputs, profile=volume_profile, pricing=ai_pricing)
+        st.markdown(needle_table(needle), unsafe_allow_html=True)
 
 # Indirect Impact
 st.markdown("## 🧩 Indirect Impact from AI (Performance Uplift)" )
 st.markdown(caption("These gains reflect enhanced output from improved efficiency and revenue uplift..."), unsafe_allow_html=True)
-col1, col2, col3 = st.columns(3)
-with col1:
-    st.markdown(metric_block("🧠 Production Dollar Savings", production_dollar_savings, prefix="$"), unsafe_allow_html=True)
-with col2:
-    st.markdown(metric_block("🛒 Upsell Dollar Savings", upsell_dollar_savings, color="#1f77b4", border="#1f77b4", prefix="$"), unsafe_allow_html=True)
-with col3:
-    st.markdown(metric_block("🎯 Total Monthly Value", net_savings + indirect_savings, color="#FFD700", border="#FFD700", prefix="$"), unsafe_allow_html=True)
+with timings.section("metrics.indirect"):
+    col1, col2, col3 = st.columns(3)
+    with col1:
+        st.markdown(metric_block("🧠 Production Dollar Savings", production_dollar_savings, prefix="$"), unsafe_allow_html=True)
+    with col2:
+        st.markdown(metric_block("🛒 Upsell Dollar Savings", upsell_dollar_savings, color="#1f77b4", border="#1f77b4", prefix="$"), unsafe_allow_html=True)
+    with col3:
+        st.markdown(metric_block("🎯 Total Monthly Value", net_savings + indirect_savings, color="#FFD700", border="#FFD700", prefix="$"), unsafe_allow_html=True)
 
 # AI Investment Impact
 st.markdown("## 💡 AI Investment Impact")
 st.markdown(caption("Shows how much value is returned for every dollar spent on AI — includes cost savings and indirect gains."), unsafe_allow_html=True)
 
-st.markdown(
-    f"""
-    <div style='
-        background-color: #111;
-        border: 2px solid #00FFAA;
-        border-radius: 12px;
-        padding: 20px 30px;
-        margin-top: 10px;
-        margin-bottom: 20px;
-        font-size: 30px;
-        font-weight: 500;
-        color: white;
-        text-align: center;
-    '>
-        For every <span style='color:#FFD700; font-size: 46px; font-weight:800;'>$1</span> you invest in AI, you save:
-        <span style='color:#00FFAA; font-size: 50px; font-weight:900;'>${dollar_saved_per_ai_dollar:,.2f}</span>
-    </div>
-    """,
-    unsafe_allow_html=True
-)
+with timings.section("metrics.ai_investment"):
+    st.markdown(
+        f"""
+        <div style='
+            background-color: #111;
+            border: 2px solid #00FFAA;
+            border-radius: 12px;
+            padding: 20px 30px;
+            margin-top: 10px;
+            margin-bottom: 20px;
+            font-size: 30px;
+            font-weight: 500;
+            color: white;
+            text-align: center;
+        '>
+            For every <span style='color:#FFD700; font-size: 46px; font-weight:800;'>$1</span> you invest in AI, you save:
+            <span style='color:#00FFAA; font-size: 50px; font-weight:900;'>${dollar_saved_per_ai_dollar:,.2f}</span>
+        </div>
+        """,
+        unsafe_allow_html=True
+    )
+
+# --- Goal Seek ---
+# Runs as a fragment: changing the target or the input to solve for re-solves only this panel
+GOAL_SEEK_DECIMALS = {"ai_cost_per_min": 4}
+
+@st.fragment
+@timed_fragment("goal_seek")
+def goal_seek_section(inputs, volume_profile, ai_pricing):
+    st.markdown("## 🎯 Goal Seek")
+    st.markdown(caption("Pick a target and the input to solve for — the break-even value is calculated directly."), unsafe_allow_html=True)
+    target_labels = {metric: spec[0] for metric, spec in goal_seek.TARGET_METRICS.items()}
+    free_labels = {field: spec[0] for field, spec in goal_seek.FREE_VARIABLES.items()
+                   if ai_pricing is None or field != "ai_cost_per_min"}
+    conditions = {"<=": "at most", ">=": "at least"}
+    col1, col2, col3, col4 = st.columns(4)
+    with col1:
+        gs_metric = st.selectbox("Target Metric", list(target_labels), format_func=target_labels.get)
+    _, default_op, default_target = goal_seek.TARGET_METRICS[gs_metric]
+    with col2:
+        gs_op = st.selectbox("Condition", list(conditions), index=list(conditions).index(default_op), format_func=conditions.get)
+    with col3:
+        gs_target = st.number_input("Target Value", value=default_target)
+    with col4:
+        default_field = "ai_cost_per_min" if "ai_cost_per_min" in free_labels else "automation"
+        gs_field = st.selectbox("Solve For", list(free_labels), index=list(free_labels).index(default_field),
+                                format_func=free_labels.get)
+
+    solution = goal_seek.solve(inputs, gs_field, gs_metric, gs_op, gs_target, profile=volume_profile,
+                               pricing=ai_pricing)
+    status, side, value = solution["status"][0], solution["side"][0], solution["value"][0]
+    label, low, high = goal_seek.FREE_VARIABLES[gs_field]
+    decimals = GOAL_SEEK_DECIMALS.get(gs_field, 2)
+    goal = f"{target_labels[gs_metric]} {conditions[gs_op]} {gs_target:,g}"
+    if status == goal_seek.SOLVED:
+        bound = "Maximum" if side == "<=" else "Minimum"
+        st.markdown(metric_block(f"{bound} {label}", value, color="#FFD700", border="#FFD700", decimals=decimals),
+                    unsafe_allow_html=True)
+        st.markdown(caption(f"Break-even for {goal} (currently {inputs[gs_field]:,.{decimals}f})."), unsafe_allow_html=True)
+    elif status == goal_seek.ALWAYS:
+        st.markdown(caption(f"{goal} holds for any {label} between {low:,g} and {high:,g}."), unsafe_allow_html=True)
+    else:
+        st.markdown(caption(f"No {label} between {low:,g} and {high:,g} reaches {goal}."), unsafe_allow_html=True)
+
+goal_seek_section(inputs, volume_profile, ai_pricing)
 
 # ROI & Break-even (Investment)
 st.markdown("## 💼 ROI & Break-even Based on Investment")
@@ -297,34 +607,12 @@ st.markdown(
 col1, col2 = st.columns(2)
 
 with col1:
-    inv_fig = go.Figure(go.Indicator(
-        mode="gauge+number+delta",
-        value=investment_roi,
-        delta={'reference': 100},
-        # Removed hardcoded font size for dynamic scaling
-        title={'text': 'Investment ROI (%)', 'font': {'color': 'white'}},
-        gauge={'axis': {'range': [0, 200]}}
-    ))
-    st.plotly_chart(inv_fig, use_container_width=True)
+    inv_fig = FIGURES.get(charts.investment_gauge, investment_roi)
+    plotly_chart("investment_gauge", inv_fig)
 
 with col2:
-    pay_fig = go.Figure(go.Indicator(
-        mode="gauge+number",
-        value=investment_payback_months,
-        # Also removed font size for responsive behavior
-        title={'text': "Payback Period (Months)", 'font': {'color': 'white'}},
-        gauge={
-            'axis': {'range': [0, 30]},
-            'bar': {'color': "black"},
-            'steps': [
-                {'range': [0, 7], 'color': "lightgreen"},
-                {'range': [7, 14], 'color': "yellow"},
-                {'range': [14, 30], 'color': "tomato"}
-            ],
-            'threshold': {'line': {'color': "red", 'width': 4}, 'value': 15}
-        }
-    ))
-    st.plotly_chart(pay_fig, use_container_width=True)
+    pay_fig = FIGURES.get(charts.payback_gauge, investment_payback_months)
+    plotly_chart("payback_gauge", pay_fig)
 
 # Cost Comparison Waterfall
 st.markdown("## 💧 Monthly Cost Breakdown")
@@ -339,14 +627,8 @@ st.markdown(
     """,
     unsafe_allow_html=True
 )
-waterfall_fig = go.Figure(go.Waterfall(
-    measure=["absolute","relative","relative","relative","absolute"],
-    x=["100% Human Cost","- Reduced Labor","+ AI Usage","+ Subscription","Net AI-Enabled Cost"],
-    y=[baseline_human_cost, -residual_cost, ai_cost, subscription, ai_enabled_cost],
-    connector={'line':{'color':'rgb(63,63,63)'}}
-))
-waterfall_fig.update_layout(plot_bgcolor='rgba(0,0,0,0)', yaxis_title='Monthly Cost ($)')
-st.plotly_chart(waterfall_fig, use_container_width=True)
+waterfall_fig = FIGURES.get(charts.cost_waterfall, baseline_human_cost, residual_cost, ai_cost, subscription, ai_enabled_cost)
+plotly_chart("cost_waterfall", waterfall_fig)
 
 # Line Chart: Savings vs Integration Cost
 st.markdown("## 📈 Savings vs Integration Cost Over Time")
@@ -360,16 +642,51 @@ st.markdown(
     """,
     unsafe_allow_html=True
 )
-df = pd.DataFrame({
-    'Month': list(range(1,13)),
-    'Cumulative Savings': [net_savings*m for m in range(1,13)],
-    'Integration Cost': [integration]*12
-})
-line_fig = go.Figure()
-line_fig.add_trace(go.Scatter(x=df['Month'], y=df['Cumulative Savings'], mode='lines+markers', name='Savings', line=dict(color='green')))
-line_fig.add_trace(go.Scatter(x=df['Month'], y=df['Integration Cost'], mode='lines', name='Integration Cost', line=dict(color='red', dash='dash')))
-line_fig.update_layout(plot_bgcolor='rgba(0,0,0,0)', xaxis_title='Month', yaxis_title='Cumulative Savings ($)')
-st.plotly_chart(line_fig, use_container_width=True)
+
+# Runs as a fragment: changing a projection assumption redraws only this chart
+@st.fragment
+@timed_fragment("projection")
+def projection_section(inputs, volume_profile, ai_pricing):
+    with st.expander("Projection Assumptions"):
+        col1, col2, col3 = st.columns(3)
+        with col1:
+            horizon = st.slider("Projection Horizon (months)", 12, projection.MAX_HORIZON_MONTHS, 12, step=12)
+            ramp_months = st.slider("Automation Ramp-up (months)", 0, 24, 0)
+        with col2:
+            ramp_curve = st.selectbox("Ramp-up Curve", ["linear", "s-curve"])
+            ramp_start = st.slider("Automation at Go-live (% of target)", 0, 100, 0)
+        with col3:
+            wage_inflation = st.number_input("Annual Wage Inflation (%)", value=0.0, step=0.5)
+            ai_price_change = st.number_input("Annual AI Price Change (%)", value=0.0, step=0.5)
+            discount_rate = st.number_input("Annual Discount Rate (%)", value=0.0, step=0.5)
+
+    proj = projection.project(inputs, horizon_months=horizon, ramp_months=ramp_months, ramp_curve=ramp_curve,
+                              ramp_start_percent=ramp_start, wage_inflation_percent=wage_inflation,
+                              ai_price_change_percent=ai_price_change, discount_rate_percent=discount_rate,
+                              profile=volume_profile, pricing=ai_pricing)
+    months = tuple(proj["months"].tolist())
+    cumulative = tuple(proj["cumulative"][0].tolist())
+    discounted = tuple(proj["discounted_cumulative"][0].tolist()) if discount_rate else None
+    line_fig = FIGURES.get(charts.savings_line, months, cumulative, inputs["integration"], discounted)
+    plotly_chart("savings_line", line_fig)
+
+    irr_percent = proj["irr_annual_percent"][0]
+    discounted_payback = proj["discounted_payback_months"][0]
+    col1, col2, col3 = st.columns(3)
+    with col1:
+        st.markdown(metric_block(f"💵 NPV ({horizon} months)", proj["npv"][0], prefix="$"), unsafe_allow_html=True)
+    with col2:
+        if np.isfinite(irr_percent):
+            st.markdown(metric_block("📈 IRR (annualized)", irr_percent, suffix="%"), unsafe_allow_html=True)
+        else:
+            st.markdown(caption("IRR is undefined: the investment is never recovered in this horizon."), unsafe_allow_html=True)
+    with col3:
+        if np.isfinite(discounted_payback):
+            st.markdown(metric_block("⏱️ Discounted Payback", discounted_payback, suffix=" months"), unsafe_allow_html=True)
+        else:
+            st.markdown(caption(f"Discounted payback is beyond {horizon} months."), unsafe_allow_html=True)
+
+projection_section(inputs, volume_profile, ai_pricing)
 
 # Donut Chart: AI Cost Composition
 st.markdown("## 🍩 AI Cost Composition")
@@ -384,26 +701,8 @@ st.markdown(
     unsafe_allow_html=True
 )
 
-donut_fig = go.Figure(data=[go.Pie(
-    labels=["AI Usage", "Residual Labor", "Subscription"],
-    values=[ai_cost, residual_cost, subscription],
-    hole=0.5,
-    textinfo="label+percent+value",
-    textfont=dict(size=18),  # Match HR donut
-    marker=dict(colors=["#1f77b4", "#aec7e8", "#ff9896"])  # Optional: set consistent colors
-)])
-
-donut_fig.update_layout(
-    height=550,
-    showlegend=True,
-    title="AI-Enabled Monthly Cost Breakdown",
-    plot_bgcolor="rgba(0,0,0,0)",
-    font=dict(size=16),
-    legend=dict(font=dict(size=22)),  # Match other donut
-    margin=dict(t=40, b=40, l=60, r=60)
-)
-
-st.plotly_chart(donut_fig, use_container_width=True)
+donut_fig = FIGURES.get(charts.cost_donut, ai_cost, residual_cost, subscription)
+plotly_chart("cost_donut", donut_fig)
 
 st.markdown("## 💸 Monthly Cost Efficiency")
 st.markdown(
@@ -415,118 +714,444 @@ st.markdown(
     unsafe_allow_html=True
 )
 # Monthly Cost Efficiency\st.markdown("### 💸 Monthly Cost Efficiency")
-st.markdown(f"""
-    <div style='
-        background-color: #111;
-        border: 2px solid #00FFAA;
-        border-radius: 12px;
-        padding: 15px;
-        width: fit-content;
-        margin-bottom: 25px;
-    '>
-        <div style='color: #00FFAA; font-size: 36px; font-weight: bold;'>
-            {(net_savings / baseline_human_cost * 100):.2f}%
+with timings.section("metrics.cost_efficiency"):
+    st.markdown(f"""
+        <div style='
+            background-color: #111;
+            border: 2px solid #00FFAA;
+            border-radius: 12px;
+            padding: 15px;
+            width: fit-content;
+            margin-bottom: 25px;
+        '>
+            <div style='color: #00FFAA; font-size: 36px; font-weight: bold;'>
+                {results["cost_efficiency_percent"]:.2f}%
+            </div>
         </div>
-    </div>
-""", unsafe_allow_html=True)
+    """, unsafe_allow_html=True)
 
-# ✅ Step 1: Add HR-impact section placeholder at the bottom
 # --- HR Efficiency & Operational Impact ---
-st.markdown("---")
-st.markdown("## 🧠 Strategic Operational Impact (HR & Seasonal Savings)")
-st.markdown(
-    """
-    <div style='color: white; font-size: 15px; margin-top: -10px; margin-bottom: 20px;'>
-        These insights reflect cost avoidance and hidden savings from reduced churn, absenteeism, and seasonal volume strain.
-    </div>
-    """,
-    unsafe_allow_html=True
-)
+# Runs as a fragment: moving an HR assumption slider reruns only this section,
+# recomputing strategic_total and redrawing the HR metrics and donut.
+@st.fragment
+@timed_fragment("hr_impact")
+def hr_impact_section(inputs, volume_profile, ai_pricing):
+    st.markdown("---")
+    st.markdown("## 🧠 Strategic Operational Impact (HR & Seasonal Savings)")
+    st.markdown(
+        """
+        <div style='color: white; font-size: 15px; margin-top: -10px; margin-bottom: 20px;'>
+            These insights reflect cost avoidance and hidden savings from reduced churn, absenteeism, and seasonal volume strain.
+        </div>
+        """,
+        unsafe_allow_html=True
+    )
 
-if use_hr_impact:
-    with st.sidebar.expander("Adjust HR Impact Assumptions"):
-        hr_attrition = st.slider("Monthly Attrition Rate (%)", 0, 50, 10, key="bottom_attrition")
-        hr_no_show = st.slider("No‑Call/No‑Show Rate (%)", 0, 20, 5, key="bottom_noshow")
-        hr_pto_days = st.slider("PTO/Sick‑Leave Days/Year", 0, 30, 5, key="bottom_pto")
-        hr_new_hire_cost = st.number_input("Cost per New Hire ($)", value=2000, step=500, key="bottom_hire_cost")
-        hr_peak_staffing = st.slider("Peak Volume Staffing Increase (%)", 0, 50, 10, key="bottom_peak_staffing")
-        hr_peak_frequency = st.slider("Peak Volume Occurrence (per year)", 0, 12, 3, key="bottom_peak_freq")
-else:
-    # Fallbacks if HR impact not used
-    hr_attrition = 0
-    hr_no_show = 0
-    hr_pto_days = 0
-    hr_new_hire_cost = 0
-    hr_peak_staffing = 0
-    hr_peak_frequency = 0
+    hr_inputs = {}
+    if inputs["use_hr_impact"]:
+        with st.expander("Adjust HR Impact Assumptions"):
+            hr_inputs["hr_attrition"] = st.slider("Monthly Attrition Rate (%)", 0, 50, key="bottom_attrition")
+            hr_inputs["hr_no_show"] = st.slider("No‑Call/No‑Show Rate (%)", 0, 20, key="bottom_noshow")
+            hr_inputs["hr_pto_days"] = st.slider("PTO/Sick‑Leave Days/Year", 0, 30, key="bottom_pto")
+            hr_inputs["hr_new_hire_cost"] = st.number_input("Cost per New Hire ($)", min_value=0, step=500, key="bottom_hire_cost")
+            hr_inputs["hr_peak_staffing"] = st.slider("Peak Volume Staffing Increase (%)", 0, 50, key="bottom_peak_staffing")
+            hr_inputs["hr_peak_frequency"] = st.slider("Peak Volume Occurrence (per year)", 0, 12, key="bottom_peak_freq")
+    with timings.section("calculation.hr"):
+        hr_results = roi_engine.compute_scalar(inputs, volume_profile, ai_pricing, lap=timings.laps("calculation.hr"),
+                                               **hr_inputs)
+    recruiting_savings = hr_results["recruiting_savings"]
+    absentee_cost = hr_results["absentee_cost"]
+    seasonal_savings = hr_results["seasonal_savings"]
+    strategic_total = hr_results["strategic_total"]
+
+    # --- Display 3 Metrics in Boxes ---
+    with timings.section("metrics.hr"):
+        col1, col2, col3 = st.columns(3)
+
+        with col1:
+            st.markdown(metric_block("🧾 Recruiting Savings", recruiting_savings, color="#1f77b4", border="#1f77b4", prefix="$"), unsafe_allow_html=True)
+
+        with col2:
+            st.markdown(metric_block("🚫 Absenteeism Savings", absentee_cost, color="#bcbd22", border="#bcbd22", prefix="$"), unsafe_allow_html=True)
+
+        with col3:
+            st.markdown(metric_block("📈 Seasonal Staffing Savings", seasonal_savings, color="#17becf", border="#17becf", prefix="$"), unsafe_allow_html=True)
+
+        # --- Total Strategic HR Impact
+        st.markdown("## 💼 Total Strategic HR Efficiency Impact")
+        st.markdown(metric_block("⭐ Combined HR Efficiency Gains", strategic_total, color="#FFD700", border="#FFD700", prefix="$"), unsafe_allow_html=True)
+
+    # --- HR Strategic Donut Chart ---
+    st.markdown("## 📊 Breakdown of HR & Seasonal Efficiency Gains")
+    st.markdown(
+        """
+        <div style='color: white; font-size: 15px; margin-top: -10px; margin-bottom: 20px;'>
+            This donut chart shows how your total HR efficiency impact is split across recruiting cost avoidance,
+            absenteeism reductions, and seasonal staffing efficiency.
+        </div>
+        """,
+        unsafe_allow_html=True
+    )
 
-# --- Strategic HR Placeholder Values (to prevent NameErrors if HR toggle is off) ---
-absentee_cost = 0
-seasonal_savings = 0
-recruiting_savings = 0
+    hr_donut = FIGURES.get(charts.hr_donut, recruiting_savings, absentee_cost, seasonal_savings)
+    plotly_chart("hr_donut", hr_donut)
 
-# --- Strategic Value Calculations (Updated to Use Sidebar Inputs) ---
-if use_hr_impact:
-    total_annual_attrition = hr_attrition / 100 * effective_agents * 12
-    absence_rate = (hr_no_show / 100) + (hr_pto_days / 260)
-    recruiting_savings = total_annual_attrition * hr_new_hire_cost
-    seasonal_hours = (hr_peak_staffing / 100) * required_agents * shift_hours * hr_peak_frequency
-    seasonal_savings = seasonal_hours * hourly_cost * fully_loaded_multiplier
-    absentee_cost = absence_rate * base_labor_cost
-    strategic_total = recruiting_savings + absentee_cost + seasonal_savings
-    value_basis += strategic_total
-else:
-    strategic_total = 0
+hr_impact_section(inputs, volume_profile, ai_pricing)
 
-# --- Display 3 Metrics in Boxes ---
-col1, col2, col3 = st.columns(3)
+# --- Month-by-Month Outlook ---
+@st.fragment
+@timed_fragment("monthly_outlook")
+def monthly_outlook_section(inputs, volume_profile, ai_pricing, seasonal_index=None):
+    import seasonality
 
-col1, col2, col3 = st.columns(3)
+    st.markdown("---")
+    st.markdown("## 📅 Month-by-Month Outlook")
+    st.markdown(
+        """
+        <div style='color: white; font-size: 15px; margin-top: -10px; margin-bottom: 20px;'>
+            Each month is priced from its real calendar: contacts over its days, agent hours over its working days,
+            with volume, handle time and staffing following a seasonal pattern.
+            <br>Peak months are staffed up month by month, in place of the HR section's peak-staffing estimate.
+        </div>
+        """,
+        unsafe_allow_html=True
+    )
 
-with col1:
-    st.markdown(metric_block("🧾 Recruiting Savings", recruiting_savings, color="#1f77b4", border="#1f77b4", prefix="$"), unsafe_allow_html=True)
+    season_labels = {name: spec[0] for name, spec in seasonality.SEASONALITY_PROFILES.items()}
+    # An uploaded call log's own month-by-month volume comes first when there is one
+    logged_volume = None if seasonal_index is None else seasonality.observed_profile(seasonal_index)
+    volume_labels = season_labels if logged_volume is None else {"call_log": "From Call Log", **season_labels}
+    with st.expander("Seasonality & Calendar"):
+        col1, col2, col3 = st.columns(3)
+        with col1:
+            season_volume = st.selectbox("Volume Seasonality", list(volume_labels), format_func=volume_labels.get)
+            season_aht = st.selectbox("Handle Time Seasonality", list(season_labels), format_func=season_labels.get)
+        with col2:
+            staffing_follows = st.checkbox("Staffing Follows Volume", value=False,
+                                           help="Scale scheduled agents with the volume seasonality (else fixed headcount).")
+            start_month = st.date_input("First Month", value=datetime.now().date().replace(day=1))
+        with col3:
+            outlook_months = st.select_slider("Outlook Horizon (months)", options=[12, 24, 36], value=12)
+
+    if season_volume == "call_log":
+        season_volume = logged_volume
+    outlook = seasonality.monthly(inputs, start=start_month, months=outlook_months, volume=season_volume,
+                                  aht=season_aht, staffing=season_volume if staffing_follows else "flat",
+                                  profile=volume_profile, pricing=ai_pricing)
+    per_month, annual = outlook["monthly"], outlook["annual"]
+    best = int(np.argmax(per_month["net_savings"][0]))
+    worst = int(np.argmin(per_month["net_savings"][0]))
+    month_labels = tuple(np.datetime_as_string(outlook["month"]).tolist())
+
+    col1, col2, col3, col4 = st.columns(4)
+    with col1:
+        st.markdown(metric_block("💰 First-Year Net Savings", annual["net_savings"][0, 0], prefix="$", decimals=0), unsafe_allow_html=True)
+    with col2:
+        st.markdown(metric_block("📈 First-Year ROI", annual["roi_percent"][0, 0], suffix="%"), unsafe_allow_html=True)
+    with col3:
+        st.markdown(metric_block("🧾 Calendar Break-even", outlook["payback_days"][0], suffix=" days", decimals=0), unsafe_allow_html=True)
+    with col4:
+        st.markdown(metric_block("📉 Leanest Month", per_month["net_savings"][0, worst], prefix="$", decimals=0), unsafe_allow_html=True)
+    st.markdown(
+        caption(f"Best month {month_labels[best]} (${per_month['net_savings'][0, best]:,.0f}), "
+                f"leanest {month_labels[worst]}; {outlook['working_days'].sum():.0f} working days over the outlook."),
+        unsafe_allow_html=True
+    )
 
-with col2:
-    st.markdown(metric_block("🚫 Absenteeism Savings", absentee_cost, color="#bcbd22", border="#bcbd22", prefix="$"), unsafe_allow_html=True)
+    outlook_fig = FIGURES.get(
+        charts.monthly_outlook, month_labels, tuple(per_month["baseline_human_cost"][0].tolist()),
+        tuple(per_month["ai_enabled_cost"][0].tolist()), tuple(per_month["net_savings"][0].tolist())
+    )
+    plotly_chart("monthly_outlook", outlook_fig)
 
-with col3:
-    st.markdown(metric_block("📈 Seasonal Staffing Savings", seasonal_savings, color="#17becf", border="#17becf", prefix="$"), unsafe_allow_html=True)
+if use_monthly_outlook:
+    monthly_outlook_section(inputs, volume_profile, ai_pricing,
+                            call_summary["seasonal_index"] if call_summary is not None else None)
 
-# --- Total Strategic HR Impact
-st.markdown("## 💼 Total Strategic HR Efficiency Impact")
-st.markdown(metric_block("⭐ Combined HR Efficiency Gains", strategic_total, color="#FFD700", border="#FFD700", prefix="$"), unsafe_allow_html=True)
+# --- Monte Carlo Uncertainty Analysis ---
+@st.fragment
+@timed_fragment("monte_carlo")
+def monte_carlo_section(inputs, volume_profile, ai_pricing):
+    import monte_carlo
 
-# --- HR Strategic Donut Chart ---
-st.markdown("## 📊 Breakdown of HR & Seasonal Efficiency Gains")
-st.markdown(
-    """
-    <div style='color: white; font-size: 15px; margin-top: -10px; margin-bottom: 20px;'>
-        This donut chart shows how your total HR efficiency impact is split across recruiting cost avoidance,
-        absenteeism reductions, and seasonal staffing efficiency.
-    </div>
-    """,
-    unsafe_allow_html=True
-)
+    st.markdown("---")
+    st.markdown("## 🎲 Uncertainty Analysis (Monte Carlo)")
+    st.markdown(
+        """
+        <div style='color: white; font-size: 15px; margin-top: -10px; margin-bottom: 20px;'>
+            Business assumptions are estimates. This simulation draws each uncertain input from a range
+            around your sidebar value and shows the 10th (P10), median (P50) and 90th (P90) percentile outcomes.
+        </div>
+        """,
+        unsafe_allow_html=True
+    )
 
-hr_donut = go.Figure(data=[go.Pie(
-    labels=["Recruiting Savings", "Absenteeism Savings", "Seasonal Staffing Savings"],
-    values=[recruiting_savings, absentee_cost, seasonal_savings],
-    hole=0.5,
-    texttemplate='%{label}<br>$%{value:,.0f}<br>%{percent}',  # 👈 Format with $ and no decimals
-    textfont=dict(size=18),
-    marker=dict(colors=["#e377c2", "#bcbd22", "#17becf"])
-)])
-
-hr_donut.update_layout(
-    height=550,
-    showlegend=True,
-    title="Strategic Operational Impact Composition",
-    plot_bgcolor="rgba(0,0,0,0)",
-    font=dict(size=16),
-    legend=dict(font=dict(size=22)),
-    margin=dict(t=80, b=40, l=60, r=60)  # 👈 bump top to 80
-)
-st.plotly_chart(hr_donut, use_container_width=True)
+    uncertain_inputs = [
+        ("production_percent", "Production Improvement (%)", inputs["production_percent"], None),
+        ("upsell_percent", "Upsell Improvement (%)", inputs["upsell_percent"], None),
+        ("automation", "AI Automation % Target", inputs["automation"], 100),
+        ("aht", "Average Handle Time (minutes)", inputs["aht"], None),
+    ]
+    if inputs["use_hr_impact"]:
+        uncertain_inputs.append(("hr_attrition", "Monthly Attrition Rate (%)", inputs["hr_attrition"], 100))
+
+    with st.expander("Adjust Uncertainty Ranges"):
+        mc_kind = st.selectbox("Distribution", ["Triangular", "Uniform", "Normal (low/high = P10/P90)"])
+        if inputs["use_erlang_staffing"]:
+            # Every draw needs its own interval-level staffing solve
+            mc_draws = st.select_slider("Simulation Draws", options=[1_000, 5_000, 10_000], value=5_000)
+        else:
+            mc_draws = st.select_slider("Simulation Draws", options=[10_000, 100_000, 250_000, 1_000_000], value=1_000_000)
+        mc_seed = st.number_input("Random Seed", value=42, step=1)
+        distributions = {}
+        for field, label, point, upper in uncertain_inputs:
+            low_col, high_col = st.columns(2)
+            default_high = point * 1.2 if upper is None else min(point * 1.2, upper)
+            with low_col:
+                low = st.number_input(f"{label} – Low", value=float(point * 0.8), step=0.1)
+            with high_col:
+                high = st.number_input(f"{label} – High", value=float(default_high), step=0.1)
+            low, high = min(low, high), max(low, high)
+            if mc_kind == "Triangular":
+                distributions[field] = monte_carlo.triangular(low, min(max(point, low), high), high)
+            elif mc_kind == "Uniform":
+                distributions[field] = monte_carlo.uniform(low, high)
+            else:
+                distributions[field] = monte_carlo.normal_from_bounds(low, high)
+
+    mc_progress = st.progress(0.0)
+    mc_status = st.empty()
+
+    def show_mc_progress(done, estimates):
+        mc_progress.progress(done / mc_draws)
+        mc_status.markdown(
+            caption(f"Simulated {done:,} of {mc_draws:,} draws — running P50 net savings "
+                    f"${estimates['net_savings'][50]:,.0f}"),
+            unsafe_allow_html=True
+        )
+
+    mc_result = monte_carlo.simulate(inputs, distributions, draws=mc_draws, seed=int(mc_seed),
+                                     on_progress=show_mc_progress, profile=volume_profile,
+                                     pricing=ai_pricing)
+    mc_progress.empty()
+    mc_status.empty()
+    mc_pct = mc_result["percentiles"]
+
+    mc_metrics = [
+        ("net_savings", "💰 Net Monthly Savings", "$", ""),
+        ("roi_percent", "📈 ROI on Operating Cost", "", "%"),
+        ("payback_days", "🧾 Break-even Period", "", " days"),
+        ("investment_payback_months", "⏱️ Investment Payback", "", " months"),
+    ]
+    for col, (field, label, prefix, suffix) in zip(st.columns(4), mc_metrics):
+        with col:
+            st.markdown(metric_block(f"{label} (P50)", mc_pct[field][50], prefix=prefix, suffix=suffix), unsafe_allow_html=True)
+            st.markdown(
+                caption(f"P10 {prefix}{mc_pct[field][10]:,.1f}{suffix} · P90 {prefix}{mc_pct[field][90]:,.1f}{suffix}"),
+                unsafe_allow_html=True
+            )
+
+    mc_labels = {field: label for field, label, _, _ in mc_metrics}
+    mc_hist_field = st.selectbox("Histogram Metric", list(mc_labels), format_func=mc_labels.get)
+    counts, edges, never_pays_back = monte_carlo.histogram(mc_result["samples"][mc_hist_field])
+    mc_fig = go.Figure(go.Bar(x=(edges[:-1] + edges[1:]) / 2, y=counts, width=edges[1:] - edges[:-1],
+                              marker_color="#00FFAA"))
+    for p in monte_carlo.PERCENTILES:
+        mc_fig.add_vline(x=mc_pct[mc_hist_field][p], line_dash="dash", line_color="white",
+                         annotation_text=f"P{p}")
+    mc_fig.update_layout(plot_bgcolor='rgba(0,0,0,0)', xaxis_title=mc_labels[mc_hist_field],
+                         yaxis_title='Scenarios', bargap=0)
+    plotly_chart("monte_carlo_histogram", mc_fig)
+    if never_pays_back > 0:
+        st.markdown(caption(f"{never_pays_back:.1%} of simulated scenarios never pay back."), unsafe_allow_html=True)
+
+if use_monte_carlo:
+    monte_carlo_section(inputs, volume_profile, ai_pricing)
+
+# --- Sensitivity Analysis ---
+# Grids are memoized on the inputs they depend on, so unrelated sliders don't recompute them
+PRICING_HASH = {pricing.PricingSchedule: pricing.PricingSchedule.key}
+
+@st.cache_data(max_entries=32, show_spinner=False, hash_funcs=PRICING_HASH)
+def sensitivity_grid(fixed, x_field, y_field, size, volume_profile, ai_pricing):
+    import sensitivity
+    return sensitivity.grid(dict(fixed), x_field, y_field, size, profile=volume_profile, pricing=ai_pricing)
+
+@st.cache_data(max_entries=32, show_spinner=False, hash_funcs=PRICING_HASH)
+def sensitivity_tornado(fixed, swing, volume_profile, ai_pricing):
+    import sensitivity
+    return sensitivity.tornado(dict(fixed), swing=swing, profile=volume_profile, pricing=ai_pricing)
+
+@st.fragment
+@timed_fragment("sensitivity")
+def sensitivity_section(inputs, volume_profile, ai_pricing):
+    import sensitivity
+
+    st.markdown("---")
+    st.markdown("## 🔥 Sensitivity Analysis")
+    st.markdown(
+        """
+        <div style='color: white; font-size: 15px; margin-top: -10px; margin-bottom: 20px;'>
+            Sweep any two inputs across their full range to see where the deal works.
+            <br>The tornado chart ranks which inputs move net monthly savings the most.
+        </div>
+        """,
+        unsafe_allow_html=True
+    )
+
+    sweep_labels = {field: spec[0] for field, spec in sensitivity.SWEEP_FIELDS.items()
+                    if ai_pricing is None or field != "ai_cost_per_min"}
+    metric_labels = {"net_savings": "Net Monthly Savings ($)", "roi_percent": "ROI on Operating Cost (%)",
+                     "payback_days": "Break-even Period (days)"}
+    col1, col2, col3, col4 = st.columns(4)
+    with col1:
+        x_field = st.selectbox("X Axis Input", list(sweep_labels), index=list(sweep_labels).index("automation"),
+                               format_func=sweep_labels.get)
+    with col2:
+        default_y = "ai_cost_per_min" if "ai_cost_per_min" in sweep_labels else "aht"
+        y_field = st.selectbox("Y Axis Input", list(sweep_labels), index=list(sweep_labels).index(default_y),
+                               format_func=sweep_labels.get)
+    with col3:
+        heatmap_metric = st.selectbox("Heatmap Metric", list(metric_labels), format_func=metric_labels.get)
+    with col4:
+        grid_size = st.select_slider("Grid Resolution", options=[50, 100, 200, 400], value=200)
+
+    if x_field == y_field:
+        st.markdown(caption("Pick two different inputs to draw the heatmap."), unsafe_allow_html=True)
+    else:
+        x_values, y_values, grid_metrics = sensitivity_grid(
+            sensitivity.fixed_inputs(inputs, x_field, y_field), x_field, y_field, grid_size, volume_profile, ai_pricing
+        )
+        z = np.where(np.isfinite(grid_metrics[heatmap_metric]), grid_metrics[heatmap_metric], np.nan)
+        heatmap_fig = go.Figure(go.Heatmap(x=x_values, y=y_values, z=z, colorscale="Viridis",
+                                           colorbar=dict(title=metric_labels[heatmap_metric])))
+        heatmap_fig.add_trace(go.Scatter(x=[inputs[x_field]], y=[inputs[y_field]], mode="markers",
+                                         marker=dict(color="white", size=12, symbol="x"), name="Current"))
+        heatmap_fig.update_layout(plot_bgcolor='rgba(0,0,0,0)', height=550,
+                                  xaxis_title=sweep_labels[x_field], yaxis_title=sweep_labels[y_field])
+        plotly_chart("sensitivity_heatmap", heatmap_fig)
+
+    tornado_swing = st.slider("Tornado Swing (±%)", 5, 50, 20)
+    tornado_base, tornado_rows = sensitivity_tornado(sensitivity.fixed_inputs(inputs), tornado_swing / 100, volume_profile,
+                                                    ai_pricing)
+    tornado_rows = tornado_rows[::-1]  # widest bar on top
+    tornado_fig = go.Figure()
+    tornado_fig.add_trace(go.Bar(
+        y=[sweep_labels[row[0]] for row in tornado_rows], x=[row[1] - tornado_base for row in tornado_rows],
+        base=tornado_base, orientation="h", name=f"-{tornado_swing}%", marker_color="tomato"
+    ))
+    tornado_fig.add_trace(go.Bar(
+        y=[sweep_labels[row[0]] for row in tornado_rows], x=[row[2] - tornado_base for row in tornado_rows],
+        base=tornado_base, orientation="h", name=f"+{tornado_swing}%", marker_color="#00FFAA"
+    ))
+    tornado_fig.update_layout(plot_bgcolor='rgba(0,0,0,0)', barmode="overlay", height=550,
+                              xaxis_title="Net Monthly Savings ($)", title="What Moves Net Savings")
+    plotly_chart("tornado", tornado_fig)
+
+if use_sensitivity:
+    sensitivity_section(inputs, volume_profile, ai_pricing)
+
+# --- Saved Scenarios ---
+# Keyset-paged from the indexed store, so browsing stays fast however many scenarios are saved
+SCENARIO_COLUMNS = {
+    "created_at": "Saved",
+    "client": "Client",
+    "net_savings": "Net Monthly Savings ($)",
+    "payback_days": "Break-even Period (days)",
+    "roi_percent": "ROI on Operating Cost (%)",
+    "investment_roi": "Investment ROI (%)",
+    "investment_payback_months": "Investment Payback (months)",
+}
+SCENARIO_FILTERS = {
+    "none": "No filter",
+    "payback_days<": "Break-even under (days)",
+    "investment_payback_months<": "Investment payback under (months)",
+    "net_savings>": "Net monthly savings over ($)",
+    "roi_percent>": "ROI on operating cost over (%)",
+    "investment_roi>": "Investment ROI over (%)",
+}
+
+@st.fragment
+@timed_fragment("saved_scenarios")
+def saved_scenarios_section():
+    st.markdown("---")
+    st.markdown("## 🗂️ Saved Scenarios")
+    col1, col2, col3, col4 = st.columns(4)
+    with col1:
+        client_filter = st.text_input("Client", key="saved_client")
+    with col2:
+        filter_kind = st.selectbox("Filter", list(SCENARIO_FILTERS), format_func=SCENARIO_FILTERS.get, key="saved_filter")
+    with col3:
+        filter_value = st.number_input("Filter Value", value=60.0, step=1.0, key="saved_filter_value",
+                                       disabled=filter_kind == "none")
+    with col4:
+        order_by = st.selectbox("Sort By", list(SCENARIO_COLUMNS), format_func=SCENARIO_COLUMNS.get, key="saved_sort")
+    filters = [] if filter_kind == "none" else [(filter_kind[:-1], filter_kind[-1], filter_value)]
+    descending = order_by in ("created_at", "net_savings", "roi_percent", "investment_roi")
+
+    # Cursors of the pages visited so far; any change to the query starts over at page one
+    query = (client_filter.strip(), tuple(filters), order_by)
+    if st.session_state.get("saved_query") != query:
+        st.session_state["saved_query"] = query
+        st.session_state["saved_cursors"] = [None]
+    cursors = st.session_state["saved_cursors"]
+    rows, next_cursor = scenario_store.list_page(client_filter, filters, order_by, descending, cursor=cursors[-1])
+    total = scenario_store.count(client_filter, filters)
+
+    if not rows:
+        st.markdown(caption("No saved scenarios match."), unsafe_allow_html=True)
+        return
+    page_start = (len(cursors) - 1) * scenario_store.DEFAULT_PAGE_SIZE
+    st.markdown(caption(f"Scenarios {page_start + 1:,}–{page_start + len(rows):,} of {total:,}"), unsafe_allow_html=True)
+    table = {"#": [row["id"] for row in rows], "Name": [row["name"] for row in rows]}
+    for column, label in SCENARIO_COLUMNS.items():
+        table[label] = [row[column] for row in rows]
+    table["Saved"] = [datetime.fromtimestamp(value).strftime("%Y-%m-%d %H:%M") for value in table["Saved"]]
+    st.dataframe(table, hide_index=True, use_container_width=True)
+
+    col1, col2, col3, col4 = st.columns(4)
+    with col1:
+        if st.button("◀ Previous", disabled=len(cursors) == 1):
+            cursors.pop()
+            st.rerun(scope="fragment")
+    with col2:
+        if st.button("Next ▶", disabled=next_cursor is None):
+            cursors.append(next_cursor)
+            st.rerun(scope="fragment")
+    with col3:
+        labels = {row["id"]: f"#{row['id']} {row['client']} {row['name']}".strip() for row in rows}
+        chosen = st.selectbox("Scenario", list(labels), format_func=labels.get, label_visibility="collapsed")
+    with col4:
+        if st.button("Open Scenario"):
+            scenario = scenario_store.get(chosen)
+            if scenario is not None:
+                restore_scenario(scenario["inputs"], scenario["volume_profile"], scenario["id"])
+                st.query_params["scenario"] = str(scenario["id"])
+                st.rerun()
+
+if use_saved_scenarios:
+    saved_scenarios_section()
+
+# --- Debug Timing Panel ---
+# Drawn last so it covers the whole run; fragment-only reruns are logged but don't redraw it
+run_timings = timings.end_run()
+if show_timings and run_timings is not None:
+    with st.sidebar.expander("⏱️ Debug Timings", expanded=True):
+        if run_timings.bytes_counted:
+            st.caption(f"Last full run: {run_timings.seconds * 1000:,.1f} ms, "
+                       f"{run_timings.bytes_sent / 1024:,.1f} KB in {run_timings.messages:,} messages")
+        else:
+            st.caption(f"Last full run: {run_timings.seconds * 1000:,.1f} ms (bytes not counted on this "
+                       f"Streamlit version)")
+        sections = run_timings.as_dict()["sections"]
+        st.dataframe({
+            "Section": list(sections),
+            "ms": [round(entry["seconds"] * 1000, 2) for entry in sections.values()],
+            "KB": [round(entry["bytes"] / 1024, 1) for entry in sections.values()],
+            "Calls": [entry["calls"] for entry in sections.values()],
+        }, hide_index=True, use_container_width=True)
+        st.download_button("Download Prometheus Metrics", timings.prometheus_text(),
+                           file_name="connexus_timings.prom", mime="text/plain")
 
 # Make background of Plotly graphs transparent
 # This needs to be added wherever you define a chart layout, for example:
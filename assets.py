@@ -0,0 +1,166 @@
+"""Build-once static image assets for the dashboard.
+
+Images are resized to the size they are actually displayed at, written to
+``static/`` as compressed PNG and WebP variants with content-hashed file
+names, and served by Streamlit's static file server (see
+.streamlit/config.toml) instead of being base64-inlined into every rerun.
+
+Built variants are cached process-wide and rebuilt only when the source
+file's mtime changes. ``static/manifest.json`` records which variants were
+built from which source bytes, so a fresh worker reuses them without
+importing PIL or re-encoding anything. Run ``python assets.py`` at
+build/deploy time to pre-build everything; otherwise the first page load
+builds them.
+"""
+import hashlib
+import json
+import os
+import threading
+import time
+from io import BytesIO
+
+APP_DIR = os.path.dirname(os.path.abspath(__file__))
+STATIC_DIR = os.path.join(APP_DIR, "static")
+STATIC_URL = "app/static"
+
+# Asset name -> (source file, max display size in px)
+ASSETS = {
+    "favicon": ("favicon-32x32.png", (32, 32)),
+    # The watermark box is 850x800 with background-size: contain
+    "watermark": ("connexus_logo_watermark.png", (850, 800)),
+    # The sidebar is at most ~336px wide; 2x for high-DPI screens
+    "logo": ("connexus_logo.png", (672, 672)),
+}
+
+FORMATS = {
+    "png": dict(format="PNG", optimize=True),
+    "webp": dict(format="WEBP", quality=85, method=6),
+}
+
+MANIFEST_PATH = os.path.join(STATIC_DIR, "manifest.json")
+# A replaced variant stays this long after its replacement was written: other workers and
+# pages already sent to browsers can still be pointing at it
+STALE_VARIANT_GRACE_SECONDS = 24 * 60 * 60
+
+_lock = threading.Lock()
+_built = {}  # name -> (source mtime_ns, {fmt: file name})
+
+
+def _source_path(name):
+    return os.path.join(APP_DIR, ASSETS[name][0])
+
+
+def _build_key(name):
+    """Digest of the source bytes and the settings its variants are built with."""
+    digest = hashlib.sha256(repr((ASSETS[name][1], FORMATS)).encode())
+    with open(_source_path(name), "rb") as f:
+        digest.update(f.read())
+    return digest.hexdigest()
+
+
+def _read_manifest():
+    try:
+        with open(MANIFEST_PATH) as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+
+def _from_manifest(name, key):
+    """Variants built by an earlier process from the same source, if they are all still there."""
+    entry = _read_manifest().get(name)
+    if entry is None or entry.get("key") != key:
+        return None
+    files = entry.get("files", {})
+    if set(files) != set(FORMATS) or not all(os.path.exists(os.path.join(STATIC_DIR, f)) for f in files.values()):
+        return None
+    return files
+
+
+def _record(name, key, files):
+    manifest = _read_manifest()
+    manifest[name] = {"key": key, "files": files}
+    tmp_path = f"{MANIFEST_PATH}.{os.getpid()}.tmp"
+    with open(tmp_path, "w") as f:
+        json.dump(manifest, f, indent=2, sort_keys=True)
+    os.replace(tmp_path, MANIFEST_PATH)
+
+
+def _write_variant(name, fmt, data):
+    digest = hashlib.sha256(data).hexdigest()[:12]
+    filename = f"{name}.{digest}.{fmt}"
+    path = os.path.join(STATIC_DIR, filename)
+    if os.path.exists(path):
+        # Live again (e.g. the source was reverted): pruning dates variants by mtime
+        os.utime(path)
+    else:
+        tmp_path = f"{path}.{os.getpid()}.tmp"
+        with open(tmp_path, "wb") as f:
+            f.write(data)
+        os.replace(tmp_path, path)
+    _prune_variants(name, fmt)
+    return filename
+
+
+def _prune_variants(name, fmt, now=None):
+    """Remove variants replaced by a newer one more than ``STALE_VARIANT_GRACE_SECONDS`` ago."""
+    now = time.time() if now is None else now
+    written = {}
+    for existing in os.listdir(STATIC_DIR):
+        if existing.startswith(f"{name}.") and existing.endswith(f".{fmt}"):
+            try:
+                written[existing] = os.path.getmtime(os.path.join(STATIC_DIR, existing))
+            except OSError:
+                pass
+    for existing, mtime in written.items():
+        # A variant was replaced when the oldest variant written after it was
+        replaced = min((other for other in written.values() if other > mtime), default=None)
+        if replaced is not None and now - replaced > STALE_VARIANT_GRACE_SECONDS:
+            try:
+                os.remove(os.path.join(STATIC_DIR, existing))
+            except OSError:
+                pass
+
+
+def build_asset(name):
+    """Resize and encode one asset; returns {format: file name in static/}."""
+    from PIL import Image
+
+    _, max_size = ASSETS[name]
+    with Image.open(_source_path(name)) as img:
+        img.load()
+        img.thumbnail(max_size, Image.LANCZOS)
+
+    os.makedirs(STATIC_DIR, exist_ok=True)
+    files = {}
+    for fmt, save_args in FORMATS.items():
+        buffer = BytesIO()
+        img.save(buffer, **save_args)
+        files[fmt] = _write_variant(name, fmt, buffer.getvalue())
+    return files
+
+
+def asset_url(name, fmt="webp"):
+    """Relative URL of an optimized asset, building it on first use or after the source changes."""
+    mtime = os.stat(_source_path(name)).st_mtime_ns
+    entry = _built.get(name)
+    if entry is None or entry[0] != mtime:
+        with _lock:
+            entry = _built.get(name)
+            if entry is None or entry[0] != mtime:
+                key = _build_key(name)
+                files = _from_manifest(name, key)
+                if files is None:
+                    files = build_asset(name)
+                    _record(name, key, files)
+                entry = (mtime, files)
+                _built[name] = entry
+    return f"{STATIC_URL}/{entry[1][fmt]}"
+
+
+if __name__ == "__main__":
+    for name in ASSETS:
+        asset_url(name)
+        for fmt, filename in _built[name][1].items():
+            size = os.path.getsize(os.path.join(STATIC_DIR, filename))
+            print(f"{name:10s} {fmt:5s} {size:>8,d} bytes  static/{filename}")
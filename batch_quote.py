@@ -0,0 +1,229 @@
+"""Headless bulk quoting: run the ROI engine over a CSV/Parquet file of prospects.
+
+Usage:
+    python batch_quote.py prospects.csv quotes.csv
+    python batch_quote.py prospects.parquet quotes.parquet --chunksize 500000 --workers 8
+    python batch_quote.py prospects.csv quotes.csv --pricing tiers.json
+    python batch_quote.py prospects.csv quotes.csv --elasticities
+
+Each input row is one prospect with any of the sidebar fields as columns
+(see roi_engine.INPUT_FIELDS); missing columns fall back to the dashboard
+defaults and extra columns (client name, CRM id...) are passed through.
+The file is streamed in fixed-size chunks so memory stays bounded no
+matter how many rows it has. ``--pricing`` bills every row's AI minutes
+with a tiered schedule (a JSON file, see pricing.py) instead of the flat
+ai_cost_per_min. ``--elasticities`` adds ``<metric>_elasticity_<input>``
+columns for net_savings, roi_percent and payback_days (see elasticity.py).
+"""
+import argparse
+import os
+import sys
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+import pandas as pd
+
+import elasticity
+import pricing
+import roi_engine
+
+DEFAULT_CHUNKSIZE = 200_000
+
+_TRUE_STRINGS = {"1", "true", "t", "yes", "y", "on"}
+
+
+def _file_format(path):
+    ext = os.path.splitext(path)[1].lower()
+    if ext in (".parquet", ".pq"):
+        return "parquet"
+    if ext == ".csv":
+        return "csv"
+    raise ValueError(f"Unsupported file type: {path} (expected .csv or .parquet)")
+
+
+def _coerce_toggle(column):
+    if column.dtype == bool:
+        return column.to_numpy()
+    if column.dtype == object:
+        return column.astype(str).str.strip().str.lower().isin(_TRUE_STRINGS).to_numpy()
+    return column.fillna(0).to_numpy() != 0
+
+
+def read_chunks(path, chunksize=DEFAULT_CHUNKSIZE):
+    """Yield DataFrame chunks of at most ``chunksize`` rows from a CSV or Parquet file."""
+    if _file_format(path) == "parquet":
+        import pyarrow.parquet as pq
+
+        parquet_file = pq.ParquetFile(path)
+        for batch in parquet_file.iter_batches(batch_size=chunksize):
+            yield batch.to_pandas()
+    else:
+        yield from pd.read_csv(path, chunksize=chunksize)
+
+
+def chunk_inputs(chunk):
+    """Engine input columns present in a chunk, coerced to bool/float arrays.
+
+    Unreadable numbers become NaN, as do infinities and rows whose
+    weekly_interactions × aht overflows, so those rows quote as NaN.
+    """
+    inputs = {}
+    for name in roi_engine.INPUT_FIELDS:
+        if name not in chunk.columns:
+            continue
+        if name in roi_engine.TOGGLE_FIELDS:
+            inputs[name] = _coerce_toggle(chunk[name])
+        else:
+            values = pd.to_numeric(chunk[name], errors="coerce").to_numpy(dtype=np.float64)
+            inputs[name] = np.where(np.isinf(values), np.nan, values)
+    if "weekly_interactions" in inputs or "aht" in inputs:
+        workload = roi_engine.prepare_inputs(
+            {name: inputs[name] for name in ("weekly_interactions", "aht") if name in inputs}
+        )
+        overflow = ~roi_engine.workload_is_finite(workload["weekly_interactions"], workload["aht"])
+        if overflow.any():
+            inputs["weekly_interactions"] = np.where(overflow, np.nan, workload["weekly_interactions"])
+    return inputs
+
+
+def quote_chunk(chunk, pricing=None, elasticities=False):
+    """Append every ROI output column (and optionally input elasticities) to a chunk of prospect rows."""
+    inputs = chunk_inputs(chunk)
+    columns = dict(roi_engine.compute(inputs, pricing=pricing))
+    if elasticities:
+        needle = elasticity.compute(inputs, pricing=pricing)
+        for metric in elasticity.METRICS:
+            for i, field in enumerate(needle["fields"]):
+                columns[f"{metric}_elasticity_{field}"] = needle["elasticity"][metric][i]
+    outputs = pd.DataFrame(
+        {name: np.broadcast_to(values, (len(chunk),)) for name, values in columns.items()},
+        index=chunk.index,
+    )
+    # Output columns win over any stale copies in the input file
+    chunk = chunk.drop(columns=[c for c in outputs.columns if c in chunk.columns])
+    return pd.concat([chunk, outputs], axis=1)
+
+
+def _is_engine_column(name):
+    return name in roi_engine.INPUT_FIELDS or name in roi_engine.OUTPUT_FIELDS or "_elasticity_" in name
+
+
+def _writer_schema(table):
+    """The first chunk's schema, with passed-through columns that are empty in it typed as text.
+
+    An empty column's type says nothing about what later chunks hold;
+    text takes anything they do (numbers are written as their digits).
+    """
+    import pyarrow as pa
+
+    return pa.schema([
+        field.with_type(pa.string())
+        if column.null_count == len(column) and not _is_engine_column(field.name) else field
+        for field, column in zip(table.schema, table.columns)
+    ])
+
+
+class ChunkWriter:
+    # Arrow's CSV writer is an order of magnitude faster than DataFrame.to_csv
+    def __init__(self, path):
+        self.path = path
+        self.format = _file_format(path)
+        self._writer = None
+        self._schema = None
+
+    def write(self, table):
+        if self._writer is None:
+            self._schema = _writer_schema(table)
+            if self.format == "parquet":
+                import pyarrow.parquet as pq
+
+                self._writer = pq.ParquetWriter(self.path, self._schema)
+            else:
+                import pyarrow.csv as pa_csv
+
+                self._writer = pa_csv.CSVWriter(self.path, self._schema)
+        # Each chunk's types are inferred on their own (a column that's empty in one chunk
+        # comes back as float or null): hold every chunk to the writer's schema
+        self._writer.write_table(table.cast(self._schema))
+
+    def close(self):
+        if self._writer is not None:
+            self._writer.close()
+
+
+def _quote_to_table(chunk, pricing=None, elasticities=False):
+    # Runs in the worker so the Arrow conversion is parallelised too
+    import pyarrow as pa
+
+    return pa.Table.from_pandas(quote_chunk(chunk, pricing, elasticities), preserve_index=False)
+
+
+def _quoted_tables(chunks, workers, pricing=None, elasticities=False):
+    if workers <= 1:
+        for chunk in chunks:
+            yield _quote_to_table(chunk, pricing, elasticities)
+        return
+
+    # Keep at most two chunks per worker in flight so memory stays bounded
+    max_pending = workers * 2
+    pending = deque()
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        for chunk in chunks:
+            pending.append(pool.submit(_quote_to_table, chunk, pricing, elasticities))
+            if len(pending) >= max_pending:
+                yield pending.popleft().result()
+        while pending:
+            yield pending.popleft().result()
+
+
+def run(input_path, output_path, chunksize=DEFAULT_CHUNKSIZE, workers=1, progress=None, pricing=None,
+        elasticities=False):
+    """Quote every row of ``input_path`` into ``output_path``; returns (rows, seconds)."""
+    writer = ChunkWriter(output_path)
+    rows = 0
+    start = time.perf_counter()
+    try:
+        for table in _quoted_tables(read_chunks(input_path, chunksize), workers, pricing, elasticities):
+            writer.write(table)
+            rows += table.num_rows
+            if progress is not None:
+                progress(rows, time.perf_counter() - start)
+    finally:
+        writer.close()
+    return rows, time.perf_counter() - start
+
+
+def _print_progress(rows, elapsed):
+    rate = rows / elapsed if elapsed > 0 else 0.0
+    print(f"\r{rows:,} rows  {rate:,.0f} rows/sec", end="", file=sys.stderr, flush=True)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Bulk ROI quotes for a file of call-center profiles.")
+    parser.add_argument("input", help="CSV or Parquet file, one prospect per row")
+    parser.add_argument("output", help="CSV or Parquet file to write (format taken from the extension)")
+    parser.add_argument("--chunksize", type=int, default=DEFAULT_CHUNKSIZE, help="rows per chunk")
+    parser.add_argument("--workers", type=int, default=1,
+                        help="worker processes (0 = one per CPU core)")
+    parser.add_argument("--pricing", help="JSON pricing schedule for AI minutes (see pricing.py)")
+    parser.add_argument("--elasticities", action="store_true",
+                        help="add input elasticity columns for net_savings, roi_percent and payback_days")
+    parser.add_argument("--quiet", action="store_true", help="don't print running progress")
+    args = parser.parse_args(argv)
+
+    workers = args.workers or os.cpu_count() or 1
+    schedule = pricing.load(args.pricing) if args.pricing else None
+    rows, elapsed = run(args.input, args.output, args.chunksize, workers,
+                        progress=None if args.quiet else _print_progress, pricing=schedule,
+                        elasticities=args.elasticities)
+    rate = rows / elapsed if elapsed > 0 else 0.0
+    if not args.quiet:
+        print(file=sys.stderr)
+    print(f"Quoted {rows:,} rows in {elapsed:.2f}s ({rate:,.0f} rows/sec) -> {args.output}", file=sys.stderr)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,158 @@
+"""Latency and throughput of the local ROI API under concurrent clients.
+
+Usage:
+    python -m benchmarks.api_load [--url http://127.0.0.1:8765] [--clients 1 10 100] [--requests 2000]
+
+Starts ``roi_api.py`` on a free local port unless ``--url`` points at a
+running instance. Each client is a thread with its own keep-alive
+connection posting single scenarios to ``/v1/roi``. Every concurrency
+level runs twice: once with unique inputs (engine work, micro-batched) and
+once drawing from a small pool of repeated scenarios (mostly cache hits).
+"""
+import argparse
+import contextlib
+import http.client
+import json
+import statistics
+import subprocess
+import sys
+import threading
+import time
+import urllib.parse
+import urllib.request
+
+import numpy as np
+
+from benchmarks.streamlit_client import REPO_ROOT, _free_port
+
+REPEATED_POOL = 100
+
+
+@contextlib.contextmanager
+def running_api(startup_timeout=30):
+    """Start ``roi_api.py`` on a local port; yields its base URL."""
+    port = _free_port()
+    proc = subprocess.Popen([sys.executable, "roi_api.py", f"--port={port}"], cwd=REPO_ROOT,
+                            stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    url = f"http://127.0.0.1:{port}"
+    try:
+        deadline = time.monotonic() + startup_timeout
+        while True:
+            try:
+                with urllib.request.urlopen(f"{url}/health", timeout=1):
+                    break
+            except OSError:
+                if proc.poll() is not None or time.monotonic() > deadline:
+                    raise RuntimeError("ROI API did not start")
+                time.sleep(0.1)
+        yield url
+    finally:
+        proc.terminate()
+        proc.wait(timeout=10)
+
+
+def scenarios(count, seed):
+    rng = np.random.default_rng(seed)
+    return [
+        {
+            "weekly_interactions": int(rng.integers(1_000, 100_000)),
+            "aht": round(float(rng.uniform(2, 15)), 2),
+            "agents": int(rng.integers(5, 200)),
+            "hourly_cost": round(float(rng.uniform(12, 40)), 2),
+            "automation": int(rng.integers(10, 90)),
+            "ai_cost_per_min": round(float(rng.uniform(0.05, 0.5)), 3),
+            "integration": int(rng.integers(0, 100)) * 1000,
+        }
+        for _ in range(count)
+    ]
+
+
+def _get_json(url, path):
+    with urllib.request.urlopen(url + path, timeout=10) as response:
+        return json.loads(response.read())
+
+
+def run_clients(url, clients, bodies):
+    """Post ``bodies`` spread over ``clients`` keep-alive connections; returns latencies and wall time."""
+    parts = urllib.parse.urlsplit(url)
+    latencies = [[] for _ in range(clients)]
+    errors = []
+    start_gate = threading.Barrier(clients + 1)
+
+    def client(index):
+        conn = http.client.HTTPConnection(parts.hostname, parts.port, timeout=30)
+        headers = {"Content-Type": "application/json"}
+        start_gate.wait()
+        try:
+            for body in bodies[index::clients]:
+                began = time.perf_counter()
+                conn.request("POST", "/v1/roi", body, headers)
+                response = conn.getresponse()
+                response.read()
+                latencies[index].append(time.perf_counter() - began)
+                if response.status != 200:
+                    errors.append(f"status {response.status}")
+        except OSError as exc:
+            errors.append(repr(exc))
+        finally:
+            conn.close()
+
+    threads = [threading.Thread(target=client, args=(i,)) for i in range(clients)]
+    for thread in threads:
+        thread.start()
+    start_gate.wait()
+    began = time.perf_counter()
+    for thread in threads:
+        thread.join()
+    elapsed = time.perf_counter() - began
+    if errors:
+        raise RuntimeError(f"{len(errors)} requests failed ({errors[0]})")
+    return [latency for per_client in latencies for latency in per_client], elapsed
+
+
+def measure(url, clients=(1, 10, 100), requests=2000, seed=0):
+    results = []
+    for count in clients:
+        for mode in ("unique", "repeated"):
+            if mode == "unique":
+                # Fresh inputs every run so nothing is served from the cache
+                pool = scenarios(requests, seed + count)
+            else:
+                pool = scenarios(REPEATED_POOL, seed)
+                pool = [pool[i % REPEATED_POOL] for i in range(requests)]
+            bodies = [json.dumps(scenario).encode() for scenario in pool]
+            before = _get_json(url, "/v1/stats")
+            latencies, elapsed = run_clients(url, count, bodies)
+            after = _get_json(url, "/v1/stats")
+            batches = after["batches"] - before["batches"]
+            latencies.sort()
+            results.append({
+                "clients": count,
+                "mode": mode,
+                "requests": len(latencies),
+                "p50_ms": statistics.median(latencies) * 1000,
+                "p99_ms": latencies[min(len(latencies) - 1, int(len(latencies) * 0.99))] * 1000,
+                "requests_per_sec": len(latencies) / elapsed,
+                "cache_hits": after["cache_hits"] - before["cache_hits"],
+                "mean_batch_size": (after["batched_scenarios"] - before["batched_scenarios"]) / batches if batches else 0.0,
+            })
+    return results
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--url", help="base URL of a running roi_api.py (default: start one)")
+    parser.add_argument("--clients", type=int, nargs="+", default=[1, 10, 100])
+    parser.add_argument("--requests", type=int, default=2000, help="requests per run")
+    args = parser.parse_args(argv)
+
+    if args.url:
+        results = measure(args.url.rstrip("/"), args.clients, args.requests)
+    else:
+        with running_api() as url:
+            results = measure(url, args.clients, args.requests)
+    print(json.dumps(results, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,268 @@
+"""Rerun latency, payload and memory of the dashboard, plus ROI engine microbenchmarks.
+
+Usage:
+    python -m benchmarks.dashboard run [--app app.py] [--steps 10] [--output results.json] [--save-baseline]
+    python -m benchmarks.dashboard compare [--baseline benchmarks/baseline.json] results.json
+
+``run`` starts a local Streamlit server and replays scripted interactions
+through a headless session (benchmarks/streamlit_client.py): the default
+page load, slider drags on automation, AHT and agents, toggling
+use_indirects and use_hr_impact, and dragging sliders in the HR expander.
+Every rerun records wall time, bytes sent to the browser and the server's
+peak resident memory during the rerun (Linux only; ``null`` elsewhere).
+It then times ``roi_engine.compute`` on one scenario and on batches.
+
+``compare`` flags every metric that got worse than the baseline by more
+than its tolerance and exits with status 1 if any did.
+"""
+import argparse
+import json
+import os
+import platform
+import statistics
+import sys
+import time
+import timeit
+
+import numpy as np
+
+import roi_engine
+from benchmarks.streamlit_client import REPO_ROOT, StreamlitSession, running_server
+
+DEFAULT_BASELINE = os.path.join(REPO_ROOT, "benchmarks", "baseline.json")
+
+AUTOMATION_SLIDER = "AI Automation % Target"
+AHT_SLIDER = "Average Handle Time (minutes)"
+AGENTS_SLIDER = "Agents (FTE)"
+INDIRECTS_TOGGLE = "Include Indirect Value in ROI Calculation"
+HR_TOGGLE = "Include Strategic HR Savings in ROI"
+HR_SLIDERS = ("Monthly Attrition Rate (%)", "PTO/Sick‑Leave Days/Year")
+
+# (interaction, slider label, upper bound of the slider)
+DRAGS = (
+    ("drag_automation", AUTOMATION_SLIDER, 100),
+    ("drag_aht", AHT_SLIDER, 20),
+    ("drag_agents", AGENTS_SLIDER, 100),
+)
+TOGGLES = (
+    ("toggle_use_indirects", INDIRECTS_TOGGLE),
+    ("toggle_use_hr_impact", HR_TOGGLE),
+)
+
+ENGINE_ROWS = (1, 1_000, 100_000, 1_000_000)
+
+# Relative slack before a metric counts as a regression; wall times are the noisiest
+TOLERANCE = {
+    "median_ms": 0.20,
+    "p90_ms": 0.30,
+    "mean_bytes": 0.05,
+    "peak_rss_mb": 0.10,
+    "seconds_per_call": 0.20,
+}
+
+
+# --- Server memory (Linux /proc) ---
+def _reset_peak_rss(pid):
+    # Writing 5 to clear_refs resets VmHWM to the current RSS
+    try:
+        with open(f"/proc/{pid}/clear_refs", "w") as f:
+            f.write("5")
+    except OSError:
+        pass
+
+
+def _peak_rss_mb(pid):
+    try:
+        with open(f"/proc/{pid}/status") as f:
+            for line in f:
+                if line.startswith("VmHWM:"):
+                    return int(line.split()[1]) / 1024
+    except OSError:
+        pass
+    return None
+
+
+class _Recorder:
+    """Runs one interaction at a time and records every rerun it fires."""
+
+    def __init__(self, pid):
+        self.pid = pid
+
+    def __call__(self, action):
+        _reset_peak_rss(self.pid)
+        stats = action()
+        return {
+            "seconds": stats.seconds,
+            "bytes": stats.bytes_received,
+            "messages": stats.messages,
+            "fragment_run": stats.fragment_run,
+            "peak_rss_mb": _peak_rss_mb(self.pid),
+        }
+
+
+def summarize(name, runs):
+    seconds = sorted(run["seconds"] for run in runs)
+    peaks = [run["peak_rss_mb"] for run in runs if run["peak_rss_mb"] is not None]
+    return {
+        "name": name,
+        "reruns": len(runs),
+        "fragment_runs": sum(run["fragment_run"] for run in runs),
+        "median_ms": statistics.median(seconds) * 1000,
+        "p90_ms": seconds[min(len(seconds) - 1, int(len(seconds) * 0.9))] * 1000,
+        "max_ms": seconds[-1] * 1000,
+        "mean_bytes": statistics.mean(run["bytes"] for run in runs),
+        "mean_messages": statistics.mean(run["messages"] for run in runs),
+        "peak_rss_mb": max(peaks) if peaks else None,
+    }
+
+
+def measure_interactions(app="app.py", steps=10):
+    results = []
+    with running_server(app) as (url, proc):
+        record = _Recorder(proc.pid)
+
+        # Warm the process (imports, static assets, figure cache) so the first interaction isn't skewed
+        with StreamlitSession(url) as session:
+            session.rerun()
+
+        loads = []
+        for _ in range(steps):
+            with StreamlitSession(url) as session:
+                loads.append(record(session.rerun))
+        results.append(summarize("default_load", loads))
+
+        for name, label, upper in DRAGS:
+            with StreamlitSession(url) as session:
+                session.rerun()
+                start = session.widgets[label]["value"]
+                values = [min(start + step, upper) for step in range(1, steps + 1)]
+                runs = [record(lambda value=value: session.set(label, value)) for value in values]
+            results.append(summarize(name, runs))
+
+        for name, label in TOGGLES:
+            with StreamlitSession(url) as session:
+                session.rerun()
+                start = session.widgets[label]["value"]
+                states = [start if step % 2 else not start for step in range(steps)]
+                runs = [record(lambda on=on: session.set(label, on)) for on in states]
+            results.append(summarize(name, runs))
+
+        with StreamlitSession(url) as session:
+            session.rerun()
+            session.set(HR_TOGGLE, True)
+            runs = []
+            for label in HR_SLIDERS:
+                start = session.widgets[label]["value"]
+                runs.extend(record(lambda value=start + step: session.set(label, value))
+                            for step in range(1, steps + 1))
+        results.append(summarize("hr_expander", runs))
+    return results
+
+
+def random_inputs(rows, seed=0):
+    rng = np.random.default_rng(seed)
+    return {
+        "weekly_interactions": rng.integers(1_000, 100_000, rows),
+        "aht": rng.uniform(2, 15, rows),
+        "agents": rng.integers(5, 200, rows),
+        "hourly_cost": rng.uniform(12, 40, rows),
+        "automation": rng.integers(10, 90, rows),
+        "ai_cost_per_min": rng.uniform(0.05, 0.5, rows),
+        "use_hr_impact": rng.random(rows) < 0.5,
+    }
+
+
+def measure_engine(rows=ENGINE_ROWS, repeat=5):
+    results = [_time_engine("scalar", 1, lambda: roi_engine.compute_scalar(), repeat)]
+    for count in rows:
+        inputs = random_inputs(count)
+        results.append(_time_engine(f"batch_{count}", count, lambda: roi_engine.compute(inputs), repeat))
+    return results
+
+
+def _time_engine(name, rows, call, repeat):
+    timer = timeit.Timer(call)
+    number, _ = timer.autorange()
+    best = min(timer.repeat(repeat=repeat, number=number)) / number
+    return {"name": name, "rows": rows, "seconds_per_call": best, "rows_per_sec": rows / best}
+
+
+def run(app="app.py", steps=10, engine_only=False):
+    return {
+        "app": app,
+        "steps": steps,
+        "created": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "python": platform.python_version(),
+        "machine": platform.machine(),
+        "interactions": [] if engine_only else measure_interactions(app, steps),
+        "engine": measure_engine(),
+    }
+
+
+def compare(baseline, current, tolerance=None):
+    """Metrics worse than the baseline by more than their tolerance, as readable lines."""
+    tolerance = {**TOLERANCE, **(tolerance or {})}
+    regressions = []
+    for section in ("interactions", "engine"):
+        before = {row["name"]: row for row in baseline.get(section, [])}
+        for row in current.get(section, []):
+            old = before.get(row["name"])
+            if old is None:
+                continue
+            for metric, slack in tolerance.items():
+                if old.get(metric) is None or row.get(metric) is None or not old[metric]:
+                    continue
+                change = row[metric] / old[metric] - 1
+                if change > slack:
+                    regressions.append(
+                        f"{section}.{row['name']}.{metric}: {old[metric]:,.4g} -> {row[metric]:,.4g} "
+                        f"(+{change:.0%}, tolerance {slack:.0%})"
+                    )
+    return regressions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    run_parser = commands.add_parser("run", help="measure and print (or save) the results")
+    run_parser.add_argument("--app", default="app.py")
+    run_parser.add_argument("--steps", type=int, default=10, help="reruns per interaction")
+    run_parser.add_argument("--engine-only", action="store_true", help="skip the Streamlit interactions")
+    run_parser.add_argument("--output", help="write the results to this JSON file")
+    run_parser.add_argument("--save-baseline", action="store_true", help=f"also write {DEFAULT_BASELINE}")
+
+    compare_parser = commands.add_parser("compare", help="flag regressions against a baseline")
+    compare_parser.add_argument("results")
+    compare_parser.add_argument("--baseline", default=DEFAULT_BASELINE)
+    compare_parser.add_argument("--tolerance", nargs="*", default=[], metavar="METRIC=FRACTION",
+                                help=f"override a tolerance ({', '.join(TOLERANCE)})")
+    args = parser.parse_args(argv)
+
+    if args.command == "run":
+        result = run(args.app, args.steps, args.engine_only)
+        text = json.dumps(result, indent=2)
+        for path in [args.output] + ([DEFAULT_BASELINE] if args.save_baseline else []):
+            if path:
+                with open(path, "w") as f:
+                    f.write(text + "\n")
+        print(text)
+        return 0
+
+    tolerance = {}
+    for override in args.tolerance:
+        metric, _, fraction = override.partition("=")
+        if metric not in TOLERANCE:
+            parser.error(f"unknown metric {metric!r}")
+        tolerance[metric] = float(fraction)
+    with open(args.baseline) as f:
+        baseline = json.load(f)
+    with open(args.results) as f:
+        current = json.load(f)
+    regressions = compare(baseline, current, tolerance)
+    print(json.dumps({"baseline": args.baseline, "results": args.results, "regressions": regressions}, indent=2))
+    return 1 if regressions else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,48 @@
+"""Rerun latency and browser payload for a typical HR slider drag.
+
+Usage:
+    python -m benchmarks.hr_rerun [--app app.py] [--steps 10]
+
+Starts a local Streamlit server, loads the page, switches on
+"Include Strategic HR Savings in ROI" and then drags
+"Monthly Attrition Rate (%)" one step at a time, the way the slider fires
+reruns while a rep drags it.
+"""
+import argparse
+import json
+import statistics
+
+from benchmarks.streamlit_client import StreamlitSession, running_server
+
+HR_TOGGLE = "Include Strategic HR Savings in ROI"
+HR_SLIDER = "Monthly Attrition Rate (%)"
+
+
+def measure(app="app.py", steps=10):
+    with running_server(app) as (url, _), StreamlitSession(url) as session:
+        session.rerun()
+        session.set(HR_TOGGLE, True)
+        start = session.widgets[HR_SLIDER]["value"]
+        runs = [session.set(HR_SLIDER, start + step) for step in range(1, steps + 1)]
+
+    return {
+        "app": app,
+        "steps": steps,
+        "fragment_run": runs[-1].fragment_run,
+        "median_ms": statistics.median(r.seconds for r in runs) * 1000,
+        "max_ms": max(r.seconds for r in runs) * 1000,
+        "mean_bytes": statistics.mean(r.bytes_received for r in runs),
+        "mean_messages": statistics.mean(r.messages for r in runs),
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--app", default="app.py")
+    parser.add_argument("--steps", type=int, default=10)
+    args = parser.parse_args(argv)
+    print(json.dumps(measure(args.app, args.steps), indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,216 @@
+"""Concurrent sales-rep sessions against one server: latency, CPU and memory as N grows.
+
+Usage:
+    python -m benchmarks.session_load [--app app.py] [--sessions 1 10 50 100 200] [--actions 10] [--think-ms 500]
+
+Starts one local Streamlit server (as production does: every rep shares
+it) and, for each concurrency level N, opens N headless browser sessions
+(benchmarks/streamlit_client.py) at once. Each session loads the page and
+replays a random interaction trace with exponential think times between
+actions: slider drags on automation, AHT and agents, toggling
+use_indirects and use_hr_impact, and HR expander sliders once HR is on.
+
+Per level it reports rerun latency percentiles, reruns/second, server CPU
+per rerun, and, from the server's own accounting (session_memory.py),
+per-session session-state bytes, the shared figure cache and the process
+RSS while all N sessions are connected. Memory figures need Linux /proc.
+"""
+import argparse
+import json
+import os
+import random
+import statistics
+import sys
+import tempfile
+import threading
+import time
+
+from benchmarks.dashboard import AGENTS_SLIDER, AHT_SLIDER, AUTOMATION_SLIDER, HR_SLIDERS, HR_TOGGLE, INDIRECTS_TOGGLE
+from benchmarks.streamlit_client import StreamlitSession, running_server
+
+# Action -> relative frequency in a rep's trace
+TRACE_WEIGHTS = {
+    "automation": 30,
+    "aht": 15,
+    "agents": 15,
+    "indirects": 10,
+    "hr_toggle": 10,
+    "hr_slider": 20,
+}
+SLIDER_RANGES = {AUTOMATION_SLIDER: (0, 100), AHT_SLIDER: (1, 20), AGENTS_SLIDER: (1, 100)}
+HR_SLIDER_RANGES = {HR_SLIDERS[0]: (0, 50), HR_SLIDERS[1]: (0, 30)}
+REPORT_TIMEOUT_SECONDS = 30
+
+
+def _cpu_seconds(pid):
+    try:
+        with open(f"/proc/{pid}/stat") as f:
+            fields = f.read().rsplit(")", 1)[1].split()
+    except OSError:
+        return None
+    # utime and stime are fields 14 and 15 of the full line
+    return (int(fields[11]) + int(fields[12])) / os.sysconf("SC_CLK_TCK")
+
+
+def _drag(session, label, bounds, rng):
+    low, high = bounds
+    value = session.widgets[label]["value"] + rng.choice((-2, -1, 1, 2))
+    return session.set(label, min(max(value, low), high))
+
+
+def replay(session, actions, think_seconds, rng):
+    """Load the page, then run ``actions`` random interactions; returns RunStats per rerun."""
+    runs = [session.rerun()]
+    for _ in range(actions):
+        time.sleep(rng.expovariate(1 / think_seconds) if think_seconds else 0)
+        action = rng.choices(list(TRACE_WEIGHTS), weights=list(TRACE_WEIGHTS.values()))[0]
+        hr_on = session.widgets[HR_TOGGLE]["value"]
+        if action == "hr_slider" and not hr_on:
+            action = "hr_toggle"
+        if action == "automation":
+            runs.append(_drag(session, AUTOMATION_SLIDER, SLIDER_RANGES[AUTOMATION_SLIDER], rng))
+        elif action == "aht":
+            runs.append(_drag(session, AHT_SLIDER, SLIDER_RANGES[AHT_SLIDER], rng))
+        elif action == "agents":
+            runs.append(_drag(session, AGENTS_SLIDER, SLIDER_RANGES[AGENTS_SLIDER], rng))
+        elif action == "indirects":
+            runs.append(session.set(INDIRECTS_TOGGLE, not session.widgets[INDIRECTS_TOGGLE]["value"]))
+        elif action == "hr_toggle":
+            runs.append(session.set(HR_TOGGLE, not hr_on))
+        else:
+            label = rng.choice(HR_SLIDERS)
+            runs.append(_drag(session, label, HR_SLIDER_RANGES[label], rng))
+    return runs
+
+
+def _read_report(path, since, sessions):
+    """Wait for a memory sweep taken after ``since`` that sees at least ``sessions`` connected sessions."""
+    deadline = time.monotonic() + REPORT_TIMEOUT_SECONDS
+    while time.monotonic() < deadline:
+        try:
+            with open(path) as f:
+                report = json.load(f)
+            connected = [s for s in report["sessions"] if s["connected"]]
+            if report["time"] >= since and len(connected) >= sessions:
+                return report
+        except (OSError, ValueError):
+            pass
+        time.sleep(0.2)
+    return None
+
+
+def run_level(url, pid, report_path, count, actions, think_seconds, seed):
+    stats = [[] for _ in range(count)]
+    errors = []
+    connected = threading.Barrier(count + 1)
+    finished = threading.Barrier(count + 1)
+    release = threading.Event()
+
+    def rep(index):
+        rng = random.Random(seed * 100_003 + index)
+        session = None
+        try:
+            session = StreamlitSession(url)
+            connected.wait()
+            stats[index] = replay(session, actions, think_seconds, rng)
+        except Exception as exc:
+            errors.append(repr(exc))
+            connected.abort()
+        finally:
+            try:
+                finished.wait()
+            except threading.BrokenBarrierError:
+                pass
+            # Stay connected until the server's memory has been sampled
+            release.wait(REPORT_TIMEOUT_SECONDS * 2)
+            if session is not None:
+                session.close()
+
+    threads = [threading.Thread(target=rep, args=(i,), daemon=True) for i in range(count)]
+    for thread in threads:
+        thread.start()
+    try:
+        connected.wait()
+    except threading.BrokenBarrierError:
+        finished.abort()
+    cpu_before = _cpu_seconds(pid)
+    began = time.perf_counter()
+    try:
+        finished.wait()
+    except threading.BrokenBarrierError:
+        pass
+    elapsed = time.perf_counter() - began
+    cpu_after = _cpu_seconds(pid)
+    report = _read_report(report_path, time.time(), count) if not errors else None
+    release.set()
+    for thread in threads:
+        thread.join()
+    if errors:
+        raise RuntimeError(f"{len(errors)} of {count} sessions failed ({errors[0]})")
+
+    runs = [run for per_session in stats for run in per_session]
+    seconds = sorted(run.seconds for run in runs)
+    result = {
+        "sessions": count,
+        "reruns": len(runs),
+        "p50_ms": statistics.median(seconds) * 1000,
+        "p95_ms": seconds[min(len(seconds) - 1, int(len(seconds) * 0.95))] * 1000,
+        "p99_ms": seconds[min(len(seconds) - 1, int(len(seconds) * 0.99))] * 1000,
+        "reruns_per_sec": len(runs) / elapsed,
+        "mean_bytes_per_rerun": statistics.mean(run.bytes_received for run in runs),
+        "cpu_ms_per_rerun": (cpu_after - cpu_before) / len(runs) * 1000 if cpu_before is not None else None,
+    }
+    if report is not None:
+        states = [s["session_state_bytes"] for s in report["sessions"] if s["connected"]]
+        result.update({
+            "mean_session_state_kb": statistics.mean(states) / 1024,
+            "max_session_state_kb": max(states) / 1024,
+            "figure_cache_mb": report["figure_cache_bytes"] / 2**20,
+            "shared_cache_mb": report["shared_bytes"] / 2**20,
+            "figure_cache_entries": report["figure_cache_entries"],
+            "rss_mb": report["rss_bytes"] / 2**20 if report["rss_bytes"] is not None else None,
+        })
+    return result
+
+
+def measure(app="app.py", levels=(1, 10, 50, 100, 200), actions=10, think_ms=500, seed=0, idle_seconds=None):
+    with tempfile.TemporaryDirectory() as tmp:
+        report_path = os.path.join(tmp, "memory.json")
+        env = {"CONNEXUS_MEMORY_REPORT": report_path, "CONNEXUS_SESSION_SWEEP_SECONDS": "1"}
+        if idle_seconds is not None:
+            env["CONNEXUS_SESSION_IDLE_SECONDS"] = str(idle_seconds)
+        with running_server(app, env=env) as (url, proc):
+            # Warm the process so level 1 doesn't pay for imports and asset builds
+            with StreamlitSession(url) as session:
+                session.rerun()
+            results = []
+            for count in levels:
+                result = run_level(url, proc.pid, report_path, count, actions, think_ms / 1000, seed + count)
+                results.append(result)
+                print(json.dumps(result), file=sys.stderr)
+    if results and results[0].get("rss_mb") is not None:
+        base = results[0]
+        for result in results[1:]:
+            if result.get("rss_mb") is not None:
+                result["rss_mb_per_extra_session"] = (
+                    (result["rss_mb"] - base["rss_mb"]) / (result["sessions"] - base["sessions"])
+                )
+    return results
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--app", default="app.py")
+    parser.add_argument("--sessions", type=int, nargs="+", default=[1, 10, 50, 100, 200])
+    parser.add_argument("--actions", type=int, default=10, help="interactions per session after the page load")
+    parser.add_argument("--think-ms", type=float, default=500, help="mean pause between a rep's actions")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--idle-seconds", type=float,
+                        help="server idle-session timeout (default: session_memory.IDLE_TIMEOUT_SECONDS)")
+    args = parser.parse_args(argv)
+    results = measure(args.app, args.sessions, args.actions, args.think_ms, args.seed, args.idle_seconds)
+    print(json.dumps(results, indent=2))
+
+
+if __name__ == "__main__":
+    main()
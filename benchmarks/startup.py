@@ -0,0 +1,138 @@
+"""Cold-start time of a new worker, checked against a budget.
+
+Usage:
+    python -m benchmarks.startup [--app app.py] [--runs 3] [--budget first_render_seconds=1.5 ...]
+
+Measures, each in a fresh process:
+
+- import time of the app's top-level imports (``python -X importtime``),
+  broken down by top-level import;
+- seconds from ``streamlit run`` to a healthy server;
+- time to first render: the first session's full script run, which pays
+  for everything loaded or built lazily on first use.
+
+Reports the median over ``--runs`` and exits with status 1 when a metric is
+over budget. Pre-build the static assets (``python assets.py``) as a deploy
+would; a worker without them pays for encoding the images on first render.
+"""
+import argparse
+import ast
+import json
+import os
+import statistics
+import subprocess
+import sys
+import time
+
+from benchmarks.streamlit_client import REPO_ROOT, StreamlitSession, running_server
+
+# Seconds, on a developer laptop / CI runner
+BUDGET = {
+    "import_seconds": 0.8,
+    "server_ready_seconds": 3.0,
+    "first_render_seconds": 1.5,
+}
+# Modules the hot path must not import
+FORBIDDEN_MODULES = ("pandas", "matplotlib", "pyarrow")
+TOP_IMPORTS = 10
+
+
+def top_level_imports(app):
+    """Modules imported at the top level of the app script (not inside functions)."""
+    with open(os.path.join(REPO_ROOT, app)) as f:
+        tree = ast.parse(f.read())
+    modules = []
+    for node in tree.body:
+        if isinstance(node, ast.Import):
+            modules.extend(alias.name for alias in node.names)
+        elif isinstance(node, ast.ImportFrom) and node.level == 0:
+            modules.append(node.module)
+    return modules
+
+
+def import_breakdown(app="app.py"):
+    """Cumulative import seconds of each top-level import, plus the heavy modules that got loaded."""
+    modules = top_level_imports(app)
+    code = (
+        f"import sys; import {', '.join(modules)}; "
+        f"print(','.join(m for m in {FORBIDDEN_MODULES!r} if m in sys.modules))"
+    )
+    proc = subprocess.run([sys.executable, "-X", "importtime", "-c", code], cwd=REPO_ROOT,
+                          capture_output=True, text=True, check=True)
+    packages = {module.split(".")[0] for module in modules}
+    cumulative = {}
+    for line in proc.stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, cumulative_us, name = (part for part in line[len("import time:"):].split("|"))
+        # Imported directly by the app, not by another module or interpreter startup
+        if not name.startswith("  ") and name.strip().split(".")[0] in packages:
+            cumulative[name.strip()] = int(cumulative_us) / 1e6
+    loaded = [m for m in proc.stdout.strip().split(",") if m]
+    return sum(cumulative.values()), cumulative, loaded
+
+
+def first_render(app="app.py"):
+    began = time.perf_counter()
+    with running_server(app) as (url, _):
+        ready = time.perf_counter() - began
+        with StreamlitSession(url) as session:
+            first = session.rerun()
+        with StreamlitSession(url) as session:
+            warm = session.rerun()
+    return ready, first, warm
+
+
+def measure(app="app.py", runs=3):
+    imports, renders = [], []
+    for _ in range(runs):
+        imports.append(import_breakdown(app))
+        renders.append(first_render(app))
+    _, cumulative, loaded = imports[-1]
+    slowest = sorted(cumulative.items(), key=lambda item: -item[1])[:TOP_IMPORTS]
+    return {
+        "app": app,
+        "runs": runs,
+        "import_seconds": statistics.median(i[0] for i in imports),
+        "server_ready_seconds": statistics.median(r[0] for r in renders),
+        "first_render_seconds": statistics.median(r[1].seconds for r in renders),
+        "warm_render_seconds": statistics.median(r[2].seconds for r in renders),
+        "first_render_bytes": renders[-1][1].bytes_received,
+        "slowest_imports": {name: round(seconds, 4) for name, seconds in slowest},
+        "forbidden_modules_loaded": loaded,
+    }
+
+
+def over_budget(result, budget):
+    failures = [
+        f"{metric} {result[metric]:.3f}s > {limit:.3f}s"
+        for metric, limit in budget.items() if result[metric] > limit
+    ]
+    failures.extend(f"{module} imported on startup" for module in result["forbidden_modules_loaded"])
+    return failures
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--app", default="app.py")
+    parser.add_argument("--runs", type=int, default=3)
+    parser.add_argument("--budget", nargs="*", default=[], metavar="METRIC=SECONDS",
+                        help=f"override a budget ({', '.join(BUDGET)})")
+    args = parser.parse_args(argv)
+
+    budget = dict(BUDGET)
+    for override in args.budget:
+        metric, _, seconds = override.partition("=")
+        if metric not in BUDGET:
+            parser.error(f"unknown budget metric {metric!r}")
+        budget[metric] = float(seconds)
+
+    result = measure(args.app, args.runs)
+    result["budget"] = budget
+    result["failures"] = over_budget(result, budget)
+    print(json.dumps(result, indent=2))
+    return 1 if result["failures"] else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,162 @@
+"""Minimal headless Streamlit browser session for benchmarks.
+
+Speaks the same websocket protocol as the Streamlit frontend: sends
+``BackMsg.rerun_script`` with the current widget states and reads
+``ForwardMsg`` frames until the script (or fragment) run finishes, counting
+the bytes that would have gone to the browser. Widgets are addressed by
+their label, e.g. ``session.set("Monthly Attrition Rate (%)", 20)``.
+
+Only the widget types the calculator uses (slider, number_input, checkbox)
+are tracked; anything else keeps its default value. Needs the
+``websockets`` client from requirements-dev.txt.
+"""
+import contextlib
+import os
+import socket
+import subprocess
+import sys
+import time
+import urllib.request
+from dataclasses import dataclass
+
+from websockets.sync.client import connect
+
+from streamlit.proto.BackMsg_pb2 import BackMsg
+from streamlit.proto.ForwardMsg_pb2 import ForwardMsg
+from streamlit.proto.NumberInput_pb2 import NumberInput
+
+_WIDGET_TYPES = ("slider", "number_input", "checkbox")
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def _free_port():
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+@contextlib.contextmanager
+def running_server(app="app.py", port=None, extra_args=(), startup_timeout=60, env=None):
+    """Start ``streamlit run`` headless on a local port; yields the websocket URL.
+
+    ``env`` adds environment variables for the server process.
+    """
+    port = port or _free_port()
+    cmd = [
+        sys.executable, "-m", "streamlit", "run", app,
+        "--server.headless=true", f"--server.port={port}", "--server.address=127.0.0.1",
+        "--browser.gatherUsageStats=false", *extra_args,
+    ]
+    proc = subprocess.Popen(cmd, cwd=REPO_ROOT, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
+                            env={**os.environ, **env} if env else None)
+    try:
+        deadline = time.monotonic() + startup_timeout
+        while True:
+            try:
+                with urllib.request.urlopen(f"http://127.0.0.1:{port}/_stcore/health", timeout=1):
+                    break
+            except OSError:
+                if proc.poll() is not None or time.monotonic() > deadline:
+                    raise RuntimeError(f"Streamlit server did not start: {' '.join(cmd)}")
+                time.sleep(0.2)
+        yield f"ws://127.0.0.1:{port}/_stcore/stream", proc
+    finally:
+        proc.terminate()
+        proc.wait(timeout=10)
+
+
+@dataclass
+class RunStats:
+    seconds: float
+    bytes_received: int
+    messages: int
+    fragment_run: bool
+
+
+class StreamlitSession:
+    def __init__(self, url="ws://localhost:8501/_stcore/stream", timeout=120):
+        self.timeout = timeout
+        self.widgets = {}
+        self._ws = connect(url, subprotocols=["streamlit"], max_size=None, open_timeout=timeout)
+
+    def close(self):
+        self._ws.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def rerun(self, fragment_id=""):
+        """Rerun the script with the current widget states and wait for it to finish."""
+        msg = BackMsg()
+        state = msg.rerun_script
+        state.fragment_id = fragment_id
+        for widget in self.widgets.values():
+            self._encode(state.widget_states.widgets.add(), widget)
+
+        start = time.perf_counter()
+        self._ws.send(msg.SerializeToString())
+        received = 0
+        messages = 0
+        while True:
+            frame = self._ws.recv(timeout=self.timeout)
+            received += len(frame)
+            messages += 1
+            fwd = ForwardMsg()
+            fwd.ParseFromString(frame)
+            kind = fwd.WhichOneof("type")
+            if kind == "delta":
+                self._track(fwd.delta)
+            elif kind == "script_finished":
+                if fwd.script_finished == ForwardMsg.FINISHED_EARLY_FOR_RERUN:
+                    continue
+                break
+        return RunStats(time.perf_counter() - start, received, messages, bool(fragment_id))
+
+    def set(self, label, value):
+        """Change a widget the way a user would and rerun (only its fragment, if it has one)."""
+        widget = self.widgets[label]
+        widget["value"] = value
+        return self.rerun(widget["fragment_id"])
+
+    def _track(self, delta):
+        if delta.WhichOneof("type") != "new_element":
+            return
+        element = delta.new_element
+        kind = element.WhichOneof("type")
+        if kind not in _WIDGET_TYPES:
+            return
+        proto = getattr(element, kind)
+        previous = self.widgets.get(proto.label)
+        if previous is not None and previous["id"] == proto.id:
+            value = previous["value"]
+        elif kind == "slider":
+            value = list(proto.value if proto.set_value else proto.default)
+            value = value[0] if len(value) == 1 else value
+        elif kind == "checkbox":
+            value = proto.value if proto.set_value else proto.default
+        else:
+            value = proto.value if proto.set_value else proto.default
+            if proto.data_type == NumberInput.INT:
+                value = int(value)
+        self.widgets[proto.label] = {
+            "id": proto.id,
+            "kind": kind,
+            "value": value,
+            "fragment_id": delta.fragment_id,
+        }
+
+    @staticmethod
+    def _encode(state, widget):
+        state.id = widget["id"]
+        value = widget["value"]
+        if widget["kind"] == "slider":
+            state.double_array_value.data.extend(value if isinstance(value, (list, tuple)) else [value])
+        elif widget["kind"] == "checkbox":
+            state.bool_value = bool(value)
+        elif isinstance(value, int):
+            state.int_value = value
+        else:
+            state.double_value = float(value)
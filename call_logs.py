@@ -0,0 +1,372 @@
+"""Derive calculator inputs from raw ACD / call-detail exports.
+
+Usage:
+    python call_logs.py calls.parquet
+    python call_logs.py calls.csv --timestamp-column "Call Start" --handle-column "Handle Time"
+
+One row per call, with a call start timestamp and a handle time (or
+talk/hold/after-call-work columns that add up to it). Only those columns
+are read, in Arrow record batches, and folded into fixed-size aggregates,
+so memory stays bounded however many rows the export has.
+
+From the aggregates we derive weekly_interactions, aht (minutes), the
+weekly volume profile by 15-minute interval (for Erlang C staffing), a
+seasonal index by calendar month, and how often and how far volume peaks
+above a normal week (hr_peak_frequency / hr_peak_staffing).
+
+Results are cached on disk under ``.cache/call_logs`` by a hash of the
+file contents, so re-opening the same export skips the parse entirely.
+"""
+import argparse
+import hashlib
+import json
+import os
+import sys
+import threading
+from collections import OrderedDict
+
+import numpy as np
+
+import staffing
+
+APP_DIR = os.path.dirname(os.path.abspath(__file__))
+CACHE_DIR = os.path.join(APP_DIR, ".cache", "call_logs")
+CACHE_VERSION = 1
+
+# Column names recognised without configuration (compared after normalizing case and separators)
+TIMESTAMP_COLUMNS = ("call_start", "start_time", "call_start_time", "start_timestamp", "timestamp",
+                     "datetime", "date_time", "start")
+HANDLE_COLUMNS = ("handle_time", "handle_seconds", "handle_time_seconds", "aht", "duration")
+# Summed into a handle time when the export has no single handle-time column
+HANDLE_PART_COLUMNS = ("talk_time", "hold_time", "acw_time", "wrap_time", "after_call_work")
+
+HANDLE_UNITS = {"seconds": 1.0, "minutes": 60.0}
+TIMESTAMP_FORMATS = ("%Y-%m-%d %H:%M:%S", "%Y-%m-%d %H:%M", "%m/%d/%Y %H:%M:%S", "%m/%d/%Y %H:%M",
+                     "%d/%m/%Y %H:%M:%S", "%d/%m/%Y %H:%M")
+
+# The streaming CSV reader keeps ~30 blocks in flight; 1 MiB blocks cap that at ~30 MiB
+CSV_BLOCK_SIZE = 1 << 20
+PARQUET_BATCH_ROWS = 1_000_000
+
+# A week is a peak when its volume is this far above the median full week
+PEAK_THRESHOLD = 0.15
+MIN_WEEKS_FOR_PEAKS = 4
+WEEKS_PER_YEAR = 52.18
+
+_SECONDS_PER_DAY = 86_400
+_INTERVAL_SECONDS = staffing.INTERVAL_MINUTES * 60
+_INTERVALS_PER_DAY = _SECONDS_PER_DAY // _INTERVAL_SECONDS
+# 1970-01-01 was a Thursday; shift so Monday is weekday 0
+_EPOCH_WEEKDAY = 3
+
+# Summaries kept in memory (each is a few KB); older ones are re-read from the disk cache
+MEMO_ENTRIES = 64
+
+_lock = threading.Lock()  # guards _memo and _loading; never held while a file is parsed
+_memo = OrderedDict()  # cache key -> summary, least recently used first
+_loading = {}  # cache key -> lock held by the one thread summarizing that file
+
+
+def _normalize_name(name):
+    return "_".join(str(name).strip().lower().replace("-", " ").replace("/", " ").split())
+
+
+def _file_format(name):
+    ext = os.path.splitext(str(name))[1].lower()
+    if ext in (".parquet", ".pq"):
+        return "parquet"
+    if ext in (".csv", ".txt"):
+        return "csv"
+    raise ValueError(f"Unsupported file type: {name} (expected .csv or .parquet)")
+
+
+def resolve_columns(names, timestamp_column=None, handle_column=None):
+    """Pick the timestamp and handle-time column(s) out of an export's header."""
+    by_normalized = {_normalize_name(name): name for name in names}
+
+    def find(wanted, candidates):
+        if wanted is not None:
+            if wanted in names:
+                return wanted
+            if _normalize_name(wanted) in by_normalized:
+                return by_normalized[_normalize_name(wanted)]
+            raise ValueError(f"Column {wanted!r} not found; the file has {list(names)}")
+        return next((by_normalized[c] for c in candidates if c in by_normalized), None)
+
+    timestamp = find(timestamp_column, TIMESTAMP_COLUMNS)
+    if timestamp is None:
+        raise ValueError(f"No call start timestamp column found (looked for {', '.join(TIMESTAMP_COLUMNS)})")
+    handle = find(handle_column, HANDLE_COLUMNS)
+    if handle is not None:
+        return timestamp, (handle,)
+    parts = tuple(by_normalized[c] for c in HANDLE_PART_COLUMNS if c in by_normalized)
+    if not parts:
+        raise ValueError(f"No handle time column found (looked for {', '.join(HANDLE_COLUMNS + HANDLE_PART_COLUMNS)})")
+    return timestamp, parts
+
+
+def _rewind(source):
+    if hasattr(source, "seek"):
+        source.seek(0)
+    return source
+
+
+def _record_batches(source, fmt, timestamp_column=None, handle_column=None):
+    """Yield (timestamp column name, handle column names, record batch) with only those columns read."""
+    import pyarrow as pa
+
+    if fmt == "parquet":
+        import pyarrow.parquet as pq
+
+        # Without pre-buffering only the current row group's columns are held in memory
+        parquet_file = pq.ParquetFile(_rewind(source), pre_buffer=False)
+        timestamp, handles = resolve_columns(parquet_file.schema_arrow.names, timestamp_column, handle_column)
+        for batch in parquet_file.iter_batches(batch_size=PARQUET_BATCH_ROWS, columns=[timestamp, *handles]):
+            yield timestamp, handles, batch
+        return
+
+    import pyarrow.csv as pa_csv
+
+    read_options = pa_csv.ReadOptions(block_size=CSV_BLOCK_SIZE)
+    header = pa_csv.open_csv(_rewind(source), read_options=read_options).schema.names
+    timestamp, handles = resolve_columns(header, timestamp_column, handle_column)
+    convert_options = pa_csv.ConvertOptions(
+        include_columns=[timestamp, *handles],
+        column_types={timestamp: pa.timestamp("s"), **{h: pa.float64() for h in handles}},
+        timestamp_parsers=[pa_csv.ISO8601, *TIMESTAMP_FORMATS],
+    )
+    reader = pa_csv.open_csv(_rewind(source), read_options=read_options, convert_options=convert_options)
+    for batch in reader:
+        yield timestamp, handles, batch
+
+
+def _epoch_seconds(column):
+    """Local wall-clock seconds since the epoch, with nulls dropped."""
+    import pyarrow as pa
+    import pyarrow.compute as pc
+
+    if pa.types.is_string(column.type) or pa.types.is_large_string(column.type):
+        column = pc.cast(column, pa.timestamp("s"))
+    elif pa.types.is_date(column.type):
+        column = pc.cast(column, pa.timestamp("s"))
+    if getattr(column.type, "tz", None):
+        column = pc.local_timestamp(column)
+    valid = column.is_valid()
+    seconds = pc.cast(pc.cast(column, pa.timestamp("s")), pa.int64())
+    return valid, seconds
+
+
+class _Aggregates:
+    """Running totals that are all a call log is reduced to."""
+
+    def __init__(self):
+        self.calls = 0
+        self.handled_calls = 0
+        self.handle_seconds = 0.0
+        self.interval_volume = np.zeros(staffing.INTERVALS_PER_WEEK, dtype=np.int64)
+        self.daily_volume = {}  # days since epoch -> calls
+
+    def add(self, seconds, handle_seconds):
+        if seconds.size == 0:
+            return
+        days = seconds // _SECONDS_PER_DAY
+        weekday = (days + _EPOCH_WEEKDAY) % 7
+        interval = weekday * _INTERVALS_PER_DAY + (seconds % _SECONDS_PER_DAY) // _INTERVAL_SECONDS
+        self.interval_volume += np.bincount(interval, minlength=staffing.INTERVALS_PER_WEEK)
+
+        first_day = int(days.min())
+        counts = np.bincount(days - first_day)
+        for offset in np.flatnonzero(counts).tolist():
+            day = first_day + offset
+            self.daily_volume[day] = self.daily_volume.get(day, 0) + int(counts[offset])
+
+        handled = np.isfinite(handle_seconds) & (handle_seconds >= 0)
+        self.calls += seconds.size
+        self.handled_calls += int(handled.sum())
+        self.handle_seconds += float(handle_seconds[handled].sum())
+
+
+def aggregate(source, name=None, timestamp_column=None, handle_column=None, handle_unit="seconds"):
+    """Stream a CSV/Parquet call log (path or binary file object) into ``_Aggregates``."""
+    import pyarrow.compute as pc
+
+    fmt = _file_format(name if name is not None else source)
+    unit = HANDLE_UNITS[handle_unit]
+    totals = _Aggregates()
+    for timestamp, handles, batch in _record_batches(source, fmt, timestamp_column, handle_column):
+        valid, seconds = _epoch_seconds(batch.column(timestamp))
+        handle = batch.column(handles[0])
+        for part in handles[1:]:
+            handle = pc.add(pc.fill_null(handle, 0.0), pc.fill_null(batch.column(part), 0.0))
+        handle = pc.filter(handle, valid).to_numpy(zero_copy_only=False).astype(np.float64) * unit
+        totals.add(pc.filter(seconds, valid).to_numpy(), handle)
+    return totals
+
+
+def _weekly_volumes(daily_volume):
+    """Calls per full Monday-to-Sunday week in the export."""
+    days = np.array(sorted(daily_volume), dtype=np.int64)
+    counts = np.array([daily_volume[d] for d in days.tolist()], dtype=np.float64)
+    first_monday = days[0] + (-(days[0] + _EPOCH_WEEKDAY)) % 7
+    weeks = (days[-1] + 1 - first_monday) // 7
+    if weeks <= 0:
+        return np.zeros(0)
+    inside = (days >= first_monday) & (days < first_monday + weeks * 7)
+    return np.bincount((days[inside] - first_monday) // 7, weights=counts[inside], minlength=weeks)
+
+
+def _seasonal_index(daily_volume):
+    """Average daily volume per calendar month relative to the overall average (None if unseen)."""
+    days = np.array(sorted(daily_volume), dtype=np.int64)
+    counts = np.array([daily_volume[d] for d in days.tolist()], dtype=np.float64)
+    span = np.arange(days[0], days[-1] + 1)
+    month_of_day = span.astype("datetime64[D]").astype("datetime64[M]").astype(np.int64) % 12
+    calendar_days = np.bincount(month_of_day, minlength=12)
+    calls = np.bincount(month_of_day[days - days[0]], weights=counts, minlength=12)
+    average = counts.sum() / span.size
+    return [round(float(calls[m] / calendar_days[m] / average), 4) if calendar_days[m] else None
+            for m in range(12)]
+
+
+def _peaks(weekly):
+    """(peak staffing increase %, peak occurrences per year) from weekly volumes, or None."""
+    if weekly.size < MIN_WEEKS_FOR_PEAKS:
+        return None
+    baseline = np.median(weekly)
+    if baseline <= 0:
+        return None
+    peak = weekly > baseline * (1 + PEAK_THRESHOLD)
+    # Consecutive peak weeks are one peak occurrence
+    occurrences = int(np.count_nonzero(peak & ~np.r_[False, peak[:-1]]))
+    if occurrences == 0:
+        return 0, 0
+    increase = float(np.mean(weekly[peak] / baseline - 1) * 100)
+    per_year = occurrences * WEEKS_PER_YEAR / weekly.size
+    return int(round(min(increase, 50))), int(round(min(per_year, 12)))
+
+
+def summarize(totals):
+    """Calculator inputs derived from aggregated call-log totals (JSON-serializable)."""
+    if totals.calls == 0:
+        raise ValueError("The call log has no rows with a valid call start timestamp")
+    first_day, last_day = min(totals.daily_volume), max(totals.daily_volume)
+    days = last_day - first_day + 1
+    weekly = _weekly_volumes(totals.daily_volume)
+    peaks = _peaks(weekly)
+    return {
+        "calls": totals.calls,
+        "first_day": str(np.datetime64(first_day, "D")),
+        "last_day": str(np.datetime64(last_day, "D")),
+        "days": int(days),
+        "weekly_interactions": totals.calls * 7 / days,
+        "aht": totals.handle_seconds / totals.handled_calls / 60 if totals.handled_calls else None,
+        "interval_volume": totals.interval_volume.tolist(),
+        "weekly_volume": weekly.tolist(),
+        "seasonal_index": _seasonal_index(totals.daily_volume),
+        "hr_peak_staffing": peaks[0] if peaks else None,
+        "hr_peak_frequency": peaks[1] if peaks else None,
+    }
+
+
+def volume_profile(summary):
+    """The summary's 672-interval volume profile as shares of the week (for staffing)."""
+    return staffing.normalize_profile(summary["interval_volume"])
+
+
+def file_digest(source):
+    """SHA-256 of a file path, bytes-like object or binary file object."""
+    if isinstance(source, (bytes, bytearray, memoryview)):
+        return hashlib.sha256(source).hexdigest()
+    if hasattr(source, "getbuffer"):
+        return hashlib.sha256(source.getbuffer()).hexdigest()
+    if hasattr(source, "read"):
+        digest = hashlib.file_digest(_rewind(source), "sha256").hexdigest()
+        _rewind(source)
+        return digest
+    with open(source, "rb") as f:
+        return hashlib.file_digest(f, "sha256").hexdigest()
+
+
+def _cache_path(key):
+    return os.path.join(CACHE_DIR, f"{key}.json")
+
+
+def load(source, name=None, timestamp_column=None, handle_column=None, handle_unit="seconds"):
+    """Summary of a call log, from cache when this exact file was seen before.
+
+    ``source`` is a path or a binary file object (e.g. a Streamlit upload);
+    ``name`` supplies the file name/extension when ``source`` has none.
+    """
+    name = name if name is not None else getattr(source, "name", source)
+    options = json.dumps([CACHE_VERSION, _file_format(name), timestamp_column, handle_column, handle_unit])
+    key = hashlib.sha256(f"{file_digest(source)}:{options}".encode()).hexdigest()[:32]
+
+    summary = _remembered(key)
+    if summary is not None:
+        return summary
+    with _lock:
+        key_lock = _loading.setdefault(key, threading.Lock())
+    # Other files load in parallel; the same file is parsed once and its other callers wait for it
+    with key_lock:
+        summary = _remembered(key)
+        if summary is None:
+            try:
+                with open(_cache_path(key)) as f:
+                    summary = json.load(f)
+            except (OSError, ValueError):
+                summary = summarize(aggregate(source, name, timestamp_column, handle_column, handle_unit))
+                os.makedirs(CACHE_DIR, exist_ok=True)
+                tmp_path = f"{_cache_path(key)}.{os.getpid()}.{threading.get_ident()}.tmp"
+                with open(tmp_path, "w") as f:
+                    json.dump(summary, f)
+                os.replace(tmp_path, _cache_path(key))
+            _remember(key, summary)
+    with _lock:
+        if _loading.get(key) is key_lock:
+            del _loading[key]
+    return summary
+
+
+def cached_summaries():
+    """Snapshot of the in-memory summaries (for memory accounting)."""
+    with _lock:
+        return list(_memo.values())
+
+
+def _remembered(key):
+    with _lock:
+        summary = _memo.get(key)
+        if summary is not None:
+            _memo.move_to_end(key)
+        return summary
+
+
+def _remember(key, summary):
+    with _lock:
+        _memo[key] = summary
+        _memo.move_to_end(key)
+        while len(_memo) > MEMO_ENTRIES:
+            _memo.popitem(last=False)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Derive calculator inputs from a call-detail export.")
+    parser.add_argument("input", help="CSV or Parquet file, one call per row")
+    parser.add_argument("--timestamp-column", help="call start column (default: auto-detect)")
+    parser.add_argument("--handle-column", help="handle time column (default: auto-detect)")
+    parser.add_argument("--handle-unit", choices=sorted(HANDLE_UNITS), default="seconds")
+    args = parser.parse_args(argv)
+
+    summary = load(args.input, None, args.timestamp_column, args.handle_column, args.handle_unit)
+    print(f"{summary['calls']:,} calls from {summary['first_day']} to {summary['last_day']}")
+    print(f"weekly_interactions  {summary['weekly_interactions']:,.1f}")
+    if summary["aht"] is not None:
+        print(f"aht                  {summary['aht']:.2f} minutes")
+    if summary["hr_peak_staffing"] is not None:
+        print(f"hr_peak_staffing     {summary['hr_peak_staffing']}%")
+        print(f"hr_peak_frequency    {summary['hr_peak_frequency']} per year")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,110 @@
+"""Plotly figure builders for the dashboard charts.
+
+Each builder takes only the values its figure depends on, so the figures
+can be cached (figure_cache.py) and reused outside Streamlit.
+"""
+import plotly.graph_objects as go
+
+
+def investment_gauge(investment_roi):
+    return go.Figure(go.Indicator(
+        mode="gauge+number+delta",
+        value=investment_roi,
+        delta={'reference': 100},
+        # Removed hardcoded font size for dynamic scaling
+        title={'text': 'Investment ROI (%)', 'font': {'color': 'white'}},
+        gauge={'axis': {'range': [0, 200]}}
+    ))
+
+
+def payback_gauge(investment_payback_months):
+    return go.Figure(go.Indicator(
+        mode="gauge+number",
+        value=investment_payback_months,
+        # Also removed font size for responsive behavior
+        title={'text': "Payback Period (Months)", 'font': {'color': 'white'}},
+        gauge={
+            'axis': {'range': [0, 30]},
+            'bar': {'color': "black"},
+            'steps': [
+                {'range': [0, 7], 'color': "lightgreen"},
+                {'range': [7, 14], 'color': "yellow"},
+                {'range': [14, 30], 'color': "tomato"}
+            ],
+            'threshold': {'line': {'color': "red", 'width': 4}, 'value': 15}
+        }
+    ))
+
+
+def cost_waterfall(baseline_human_cost, residual_cost, ai_cost, subscription, ai_enabled_cost):
+    waterfall_fig = go.Figure(go.Waterfall(
+        measure=["absolute","relative","relative","relative","absolute"],
+        x=["100% Human Cost","- Reduced Labor","+ AI Usage","+ Subscription","Net AI-Enabled Cost"],
+        y=[baseline_human_cost, -residual_cost, ai_cost, subscription, ai_enabled_cost],
+        connector={'line':{'color':'rgb(63,63,63)'}}
+    ))
+    waterfall_fig.update_layout(plot_bgcolor='rgba(0,0,0,0)', yaxis_title='Monthly Cost ($)')
+    return waterfall_fig
+
+
+def savings_line(months, cumulative_savings, integration, discounted_savings=None):
+    line_fig = go.Figure()
+    line_fig.add_trace(go.Scatter(x=months, y=cumulative_savings, mode='lines+markers', name='Savings', line=dict(color='green')))
+    if discounted_savings is not None:
+        line_fig.add_trace(go.Scatter(x=months, y=discounted_savings, mode='lines', name='Discounted Savings', line=dict(color='#00FFAA', dash='dot')))
+    line_fig.add_trace(go.Scatter(x=months, y=[integration]*len(months), mode='lines', name='Integration Cost', line=dict(color='red', dash='dash')))
+    line_fig.update_layout(plot_bgcolor='rgba(0,0,0,0)', xaxis_title='Month', yaxis_title='Cumulative Savings ($)')
+    return line_fig
+
+
+def monthly_outlook(months, baseline_human_cost, ai_enabled_cost, net_savings):
+    outlook_fig = go.Figure()
+    outlook_fig.add_trace(go.Bar(x=months, y=baseline_human_cost, name='Baseline Human Cost', marker_color='tomato'))
+    outlook_fig.add_trace(go.Bar(x=months, y=ai_enabled_cost, name='AI-Enabled Cost', marker_color='#1f77b4'))
+    outlook_fig.add_trace(go.Scatter(x=months, y=net_savings, mode='lines+markers', name='Net Savings', line=dict(color='#00FFAA')))
+    outlook_fig.update_layout(plot_bgcolor='rgba(0,0,0,0)', barmode='group', xaxis_title='Month', yaxis_title='Monthly Amount ($)')
+    return outlook_fig
+
+
+def cost_donut(ai_cost, residual_cost, subscription):
+    donut_fig = go.Figure(data=[go.Pie(
+        labels=["AI Usage", "Residual Labor", "Subscription"],
+        values=[ai_cost, residual_cost, subscription],
+        hole=0.5,
+        textinfo="label+percent+value",
+        textfont=dict(size=18),  # Match HR donut
+        marker=dict(colors=["#1f77b4", "#aec7e8", "#ff9896"])  # Optional: set consistent colors
+    )])
+
+    donut_fig.update_layout(
+        height=550,
+        showlegend=True,
+        title="AI-Enabled Monthly Cost Breakdown",
+        plot_bgcolor="rgba(0,0,0,0)",
+        font=dict(size=16),
+        legend=dict(font=dict(size=22)),  # Match other donut
+        margin=dict(t=40, b=40, l=60, r=60)
+    )
+    return donut_fig
+
+
+def hr_donut(recruiting_savings, absentee_cost, seasonal_savings):
+    hr_donut = go.Figure(data=[go.Pie(
+        labels=["Recruiting Savings", "Absenteeism Savings", "Seasonal Staffing Savings"],
+        values=[recruiting_savings, absentee_cost, seasonal_savings],
+        hole=0.5,
+        texttemplate='%{label}<br>$%{value:,.0f}<br>%{percent}',  # 👈 Format with $ and no decimals
+        textfont=dict(size=18),
+        marker=dict(colors=["#e377c2", "#bcbd22", "#17becf"])
+    )])
+
+    hr_donut.update_layout(
+        height=550,
+        showlegend=True,
+        title="Strategic Operational Impact Composition",
+        plot_bgcolor="rgba(0,0,0,0)",
+        font=dict(size=16),
+        legend=dict(font=dict(size=22)),
+        margin=dict(t=80, b=40, l=60, r=60)  # 👈 bump top to 80
+    )
+    return hr_donut
@@ -0,0 +1,356 @@
+"""Batch client reports: the dashboard's metrics and charts as self-contained files.
+
+Usage:
+    python client_reports.py prospects.csv reports/
+    python client_reports.py prospects.parquet reports/ --workers 0 --plotly-js shared
+    python client_reports.py --scenario 12 --scenario 40 reports/ --format pdf
+
+Each input row (same columns as batch_quote.py, plus optional ``client``
+and ``name`` columns) or saved scenario becomes one report with the
+dashboard's core, indirect and investment metrics, both gauges, the cost
+waterfall, the cumulative savings line, the cost donut, cost efficiency
+and, when use_hr_impact is on, the HR metrics and HR donut.
+
+Rows are evaluated a batch at a time with the vectorized engine and
+projection, and batches are rendered in parallel over a process pool.
+The page shell (styles, plotly.js and the chart template) is rendered once
+per worker; each figure carries only its own data and layout, and
+plotly.js is embedded once per report (``--plotly-js inline``, fully
+self-contained), written once next to the reports (``shared``) or loaded
+from the CDN (``cdn``). ``index.csv`` lists every report with its size.
+
+PDF output needs the optional kaleido (static charts) and weasyprint
+(HTML to PDF) packages.
+"""
+import argparse
+import csv
+import functools
+import html
+import os
+import re
+import sys
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from datetime import date
+
+import numpy as np
+
+import roi_engine
+
+PLOTLY_JS_MODES = ("inline", "shared", "cdn")
+FORMATS = ("html", "pdf")
+SHARED_PLOTLY_JS = "plotly.min.js"
+CHART_TEMPLATE = "plotly_dark"
+DEFAULT_BATCH_SIZE = 50
+PROJECTION_MONTHS = 12
+
+INDEX_COLUMNS = ("file", "bytes", "client", "name", "net_savings", "payback_days", "roi_percent",
+                 "investment_roi")
+
+_STYLE = """
+body { background: #0e1117; color: white; font-family: "Source Sans Pro", Arial, sans-serif; margin: 2rem auto; max-width: 1200px; }
+h1 { font-size: 2.4rem; font-weight: 800; margin-bottom: 0.5rem; }
+h2 { margin-top: 2rem; }
+.caption { color: white; font-size: 15px; margin-bottom: 10px; }
+.row { display: flex; flex-wrap: wrap; gap: 20px; }
+.metric { background-color: #111; border: 2px solid; border-radius: 12px; padding: 15px; width: fit-content; margin-bottom: 25px; }
+.metric .label { color: white; font-size: 16px; margin-bottom: 5px; }
+.metric .value { font-size: 36px; font-weight: bold; }
+.banner { background-color: #111; border: 2px solid #00FFAA; border-radius: 12px; padding: 20px 30px; margin: 10px 0 20px; font-size: 30px; font-weight: 500; text-align: center; }
+.chart { min-height: 450px; }
+.charts { display: grid; grid-template-columns: 1fr 1fr; gap: 20px; }
+@media print { .charts { grid-template-columns: 1fr; } }
+"""
+
+
+# --- Page shell (rendered once per process) ---
+@functools.lru_cache(maxsize=None)
+def _shell(plotly_js, fmt):
+    """(before title, after title, footer) of every report page."""
+    import plotly.io as pio
+
+    head = '<!DOCTYPE html>\n<html lang="en">\n<head>\n<meta charset="utf-8">\n<title>'
+    after_title = [f"</title>\n<style>{_STYLE}</style>\n"]
+    if fmt == "html":
+        if plotly_js == "inline":
+            import plotly.offline
+
+            after_title.append(f'<script type="text/javascript">{plotly.offline.get_plotlyjs()}</script>\n')
+        elif plotly_js == "shared":
+            after_title.append(f'<script src="{SHARED_PLOTLY_JS}"></script>\n')
+        else:
+            import plotly.offline
+
+            version = plotly.offline.get_plotlyjs_version()
+            after_title.append(f'<script src="https://cdn.plot.ly/plotly-{version}.min.js"></script>\n')
+        # The chart template is ~95% of a figure's JSON: send it once and attach it in the browser
+        template = pio.json.to_json_plotly(pio.templates[CHART_TEMPLATE].to_plotly_json())
+        after_title.append(
+            "<script>\n"
+            f"const TEMPLATE = {template};\n"
+            "function draw(id, fig) {\n"
+            "  fig.layout.template = TEMPLATE;\n"
+            "  Plotly.newPlot(id, fig.data, fig.layout, {responsive: true, displaylogo: false});\n"
+            "}\n"
+            "</script>\n"
+        )
+    after_title.append("</head>\n<body>\n")
+    return head, "".join(after_title), "</body>\n</html>\n"
+
+
+def write_shared_plotly_js(out_dir):
+    import plotly.offline
+
+    path = os.path.join(out_dir, SHARED_PLOTLY_JS)
+    with open(path, "w", encoding="utf-8") as f:
+        f.write(plotly.offline.get_plotlyjs())
+    return path
+
+
+def _require_pdf_backend():
+    try:
+        import kaleido  # noqa: F401  (Figure.to_image renders static charts with it)
+        import weasyprint
+    except (ImportError, OSError) as exc:
+        raise RuntimeError(
+            "PDF reports need the optional kaleido and weasyprint packages "
+            "(pip install kaleido weasyprint; weasyprint also needs Pango)"
+        ) from exc
+    return weasyprint
+
+
+# --- Report body ---
+def _metric(label, value, color="#00FFAA", prefix="", suffix="", decimals=1):
+    return (
+        f"<div class='metric' style='border-color: {color};'>"
+        f"<div class='label'>{label}</div>"
+        f"<div class='value' style='color: {color};'>{prefix}{value:,.{decimals}f}{suffix}</div>"
+        "</div>"
+    )
+
+
+def _chart(fig_id, fig, fmt):
+    if fmt == "pdf":
+        fig.update_layout(template=CHART_TEMPLATE)
+        return f"<div class='chart'>{fig.to_image(format='svg').decode()}</div>"
+    import plotly.io as pio
+
+    spec = fig.to_plotly_json()
+    spec["layout"].pop("template", None)
+    return f"<div id='{fig_id}' class='chart'></div><script>draw('{fig_id}', {pio.json.to_json_plotly(spec)});</script>"
+
+
+def render_report(r, months, cumulative, client="", name="", plotly_js="inline", fmt="html", created=None):
+    """One report page for a single scenario's outputs ``r`` (plain floats) and its projection."""
+    import charts
+
+    head, after_title, footer = _shell(plotly_js, fmt)
+    client_text = html.escape(client) or "Your Call Center"
+    title = f"ConnexUS AI ROI Report — {client_text}"
+    subtitle = " · ".join(part for part in (html.escape(name), (created or date.today()).isoformat()) if part)
+
+    body = [
+        f"<h1>{title}</h1><div class='caption'>{subtitle}</div><hr>",
+        "<h2>📊 Core Financial Metrics (Operating Basis)</h2>",
+        "<div class='caption'>These values reflect cost savings compared to your human-only baseline.</div>",
+        "<div class='row'>",
+        _metric("💰 Net Monthly Savings", r["net_savings"], prefix="$"),
+        _metric("🧾 Break-even Period", r["payback_days"], suffix=" days"),
+        _metric("📈 ROI on Operating Cost (Monthly)", r["roi_percent"], suffix="%"),
+        _metric("📈 ROI on Operating Cost (Annual)", r["annual_roi_percent"], suffix="%"),
+        "</div>",
+        "<h2>🧩 Indirect Impact from AI (Performance Uplift)</h2>",
+        "<div class='row'>",
+        _metric("🧠 Production Dollar Savings", r["production_dollar_savings"], prefix="$"),
+        _metric("🛒 Upsell Dollar Savings", r["upsell_dollar_savings"], color="#1f77b4", prefix="$"),
+        _metric("🎯 Total Monthly Value", r["net_savings"] + r["indirect_savings"], color="#FFD700", prefix="$"),
+        "</div>",
+        "<h2>💡 AI Investment Impact</h2>",
+        "<div class='banner'>For every <span style='color:#FFD700; font-size: 46px; font-weight:800;'>$1</span> "
+        "you invest in AI, you save: "
+        f"<span style='color:#00FFAA; font-size: 50px; font-weight:900;'>${r['dollar_saved_per_ai_dollar']:,.2f}</span></div>",
+        "<h2>💼 ROI & Break-even Based on Investment</h2>",
+        "<div class='charts'>",
+        _chart("investment-gauge", charts.investment_gauge(r["investment_roi"]), fmt),
+        _chart("payback-gauge", charts.payback_gauge(r["investment_payback_months"]), fmt),
+        "</div>",
+        "<h2>💧 Monthly Cost Breakdown</h2>",
+        _chart("cost-waterfall", charts.cost_waterfall(r["baseline_human_cost"], r["residual_cost"], r["ai_cost"],
+                                                       r["subscription"], r["ai_enabled_cost"]), fmt),
+        "<h2>📈 Savings vs Integration Cost Over Time</h2>",
+        _chart("savings-line", charts.savings_line(months, cumulative, r["integration"]), fmt),
+        "<h2>🍩 AI Cost Composition</h2>",
+        _chart("cost-donut", charts.cost_donut(r["ai_cost"], r["residual_cost"], r["subscription"]), fmt),
+        "<h2>💸 Monthly Cost Efficiency</h2>",
+        _metric("Cost Efficiency", r["cost_efficiency_percent"], suffix="%", decimals=2),
+    ]
+    if r["use_hr_impact"]:
+        body += [
+            "<h2>🧠 Strategic Operational Impact (HR & Seasonal Savings)</h2>",
+            "<div class='row'>",
+            _metric("🧾 Recruiting Savings", r["recruiting_savings"], color="#1f77b4", prefix="$"),
+            _metric("🚫 Absenteeism Savings", r["absentee_cost"], color="#bcbd22", prefix="$"),
+            _metric("📈 Seasonal Staffing Savings", r["seasonal_savings"], color="#17becf", prefix="$"),
+            _metric("⭐ Combined HR Efficiency Gains", r["strategic_total"], color="#FFD700", prefix="$"),
+            "</div>",
+            _chart("hr-donut", charts.hr_donut(r["recruiting_savings"], r["absentee_cost"], r["seasonal_savings"]), fmt),
+        ]
+    return head + title + after_title + "\n".join(body) + "\n" + footer
+
+
+# --- Batches ---
+def _slug(text):
+    return re.sub(r"[^A-Za-z0-9]+", "-", text).strip("-").lower()[:60] or "report"
+
+
+def render_batch(batch, out_dir, plotly_js="inline", fmt="html"):
+    """Evaluate and write one batch of scenarios; returns an index row per report.
+
+    ``batch`` is ``(first_number, inputs, clients, names, profile)`` where
+    ``inputs`` maps engine fields to equal-length columns (or scalars).
+    """
+    import projection
+
+    first, inputs, clients, names, profile = batch
+    count = len(clients)
+    x = roi_engine.prepare_inputs(inputs)
+    results = roi_engine.compute(inputs, profile)
+    proj = projection.project(inputs, horizon_months=PROJECTION_MONTHS, profile=profile)
+    months = tuple(proj["months"].tolist())
+    cumulative = proj["cumulative"].reshape(-1, len(months))
+    columns = {name: np.broadcast_to(values, (count,)) for name, values in {**x, **results}.items()}
+    cumulative = np.broadcast_to(cumulative, (count, len(months)))
+
+    weasyprint = _require_pdf_backend() if fmt == "pdf" else None
+    rows = []
+    for i in range(count):
+        r = {name: column[i].item() for name, column in columns.items()}
+        page = render_report(r, months, tuple(cumulative[i].tolist()), clients[i], names[i], plotly_js, fmt)
+        filename = f"{first + i:06d}-{_slug(clients[i])}.{fmt}"
+        path = os.path.join(out_dir, filename)
+        if fmt == "pdf":
+            weasyprint.HTML(string=page).write_pdf(path)
+        else:
+            with open(path, "w", encoding="utf-8") as f:
+                f.write(page)
+        rows.append({
+            "file": filename,
+            "bytes": os.path.getsize(path),
+            "client": clients[i],
+            "name": names[i],
+            **{metric: r[metric] for metric in INDEX_COLUMNS[4:]},
+        })
+    return rows
+
+
+def _text_column(chunk, column):
+    if column not in chunk.columns:
+        return [""] * len(chunk)
+    return ["" if value != value else str(value) for value in chunk[column].tolist()]
+
+
+def file_batches(path, batch_size=DEFAULT_BATCH_SIZE):
+    """Batches of prospect rows streamed from a CSV/Parquet file (see batch_quote.py)."""
+    import batch_quote
+
+    first = 1
+    for chunk in batch_quote.read_chunks(path, batch_size):
+        yield first, batch_quote.chunk_inputs(chunk), _text_column(chunk, "client"), _text_column(chunk, "name"), None
+        first += len(chunk)
+
+
+def store_batches(scenario_ids):
+    """One batch per saved scenario (each may carry its own volume profile)."""
+    import scenario_store
+
+    for number, scenario_id in enumerate(scenario_ids, start=1):
+        scenario = scenario_store.get(scenario_id)
+        if scenario is None:
+            raise ValueError(f"No saved scenario #{scenario_id}")
+        yield number, scenario["inputs"], [scenario["client"]], [scenario["name"]], scenario["volume_profile"]
+
+
+def _rendered(batches, out_dir, plotly_js, fmt, workers):
+    if workers <= 1:
+        for batch in batches:
+            yield render_batch(batch, out_dir, plotly_js, fmt)
+        return
+
+    # Keep at most two batches per worker in flight so memory stays bounded
+    max_pending = workers * 2
+    pending = deque()
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        for batch in batches:
+            pending.append(pool.submit(render_batch, batch, out_dir, plotly_js, fmt))
+            if len(pending) >= max_pending:
+                yield pending.popleft().result()
+        while pending:
+            yield pending.popleft().result()
+
+
+def run(batches, out_dir, plotly_js="inline", fmt="html", workers=1, progress=None):
+    """Render every batch into ``out_dir``; returns (reports, total bytes, seconds)."""
+    os.makedirs(out_dir, exist_ok=True)
+    start = time.perf_counter()
+    reports = 0
+    total_bytes = 0
+    if fmt == "html" and plotly_js == "shared":
+        total_bytes += os.path.getsize(write_shared_plotly_js(out_dir))
+    with open(os.path.join(out_dir, "index.csv"), "w", newline="", encoding="utf-8") as f:
+        index = csv.DictWriter(f, fieldnames=INDEX_COLUMNS)
+        index.writeheader()
+        for rows in _rendered(batches, out_dir, plotly_js, fmt, workers):
+            index.writerows(rows)
+            reports += len(rows)
+            total_bytes += sum(row["bytes"] for row in rows)
+            if progress is not None:
+                progress(reports, total_bytes, time.perf_counter() - start)
+    return reports, total_bytes, time.perf_counter() - start
+
+
+def _print_progress(reports, total_bytes, elapsed):
+    rate = reports / elapsed if elapsed > 0 else 0.0
+    print(f"\r{reports:,} reports  {total_bytes / 2**20:,.1f} MB  {rate:,.1f} reports/sec",
+          end="", file=sys.stderr, flush=True)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Render client ROI reports for many scenarios.")
+    parser.add_argument("input", nargs="?", help="CSV or Parquet file, one prospect per row")
+    parser.add_argument("output", help="directory to write the reports and index.csv into")
+    parser.add_argument("--scenario", type=int, action="append", default=[], metavar="ID",
+                        help="saved scenario id (repeatable) instead of an input file")
+    parser.add_argument("--format", choices=FORMATS, default="html")
+    parser.add_argument("--plotly-js", choices=PLOTLY_JS_MODES, default="inline",
+                        help="embed plotly.js in every report, write it once next to them, or use the CDN")
+    parser.add_argument("--batch-size", type=int, default=DEFAULT_BATCH_SIZE, help="reports per worker task")
+    parser.add_argument("--workers", type=int, default=1, help="worker processes (0 = one per CPU core)")
+    parser.add_argument("--quiet", action="store_true", help="don't print running progress")
+    args = parser.parse_args(argv)
+
+    if args.input is None and not args.scenario:
+        parser.error("give an input file or --scenario ids")
+    if args.input is not None and args.scenario:
+        parser.error("give either an input file or --scenario ids, not both")
+    if args.format == "pdf":
+        try:
+            _require_pdf_backend()
+        except RuntimeError as exc:
+            parser.error(str(exc))
+
+    batches = file_batches(args.input, args.batch_size) if args.input else store_batches(args.scenario)
+    workers = args.workers or os.cpu_count() or 1
+    reports, total_bytes, elapsed = run(batches, args.output, args.plotly_js, args.format, workers,
+                                        progress=None if args.quiet else _print_progress)
+    if not args.quiet:
+        print(file=sys.stderr)
+    rate = reports / elapsed if elapsed > 0 else 0.0
+    mean_kb = total_bytes / reports / 1024 if reports else 0.0
+    print(f"Rendered {reports:,} reports ({total_bytes / 2**20:,.1f} MB, {mean_kb:,.0f} KB each) "
+          f"in {elapsed:.2f}s ({rate:,.1f} reports/sec) -> {args.output}", file=sys.stderr)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
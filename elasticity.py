@@ -0,0 +1,197 @@
+"""Input elasticities of the headline metrics, by forward-mode differentiation.
+
+Every numeric input enters the engine as a ``Dual``: its value plus one
+derivative per differentiated input, carried along a leading axis. The
+engine's own ``_evaluate`` runs once on those duals, so each output comes
+back with its partial derivatives with respect to every input from the
+same vectorized pass, with no re-run per input and no finite-difference
+step size. The piecewise points are settled the way the engine settles
+its values:
+
+- ``np.maximum``/``np.minimum`` take the slope of the branch they pick (on a
+  tie, the first argument: ``max(agents, required_agents)`` follows agents);
+- ``np.where`` takes the slope of the selected branch, so the
+  use_indirects/use_hr_impact toggles switch their terms' derivatives on
+  and off, and the constant ``inf`` payback branch has none;
+- steps that convert to a plain array (Erlang C agent counts) count as
+  locally constant, and a pricing schedule contributes its marginal rate;
+- a derivative of a non-finite output (never pays back) is NaN.
+
+Elasticity is the percentage change in a metric per 1% change in the
+input: d metric / d input * input / metric (NaN where the metric is 0 or
+not finite).
+"""
+import numpy as np
+
+import roi_engine
+
+METRICS = ("net_savings", "roi_percent", "payback_days")
+
+# Rows per pass: the derivatives are (inputs x rows) per intermediate
+_CHUNK_ROWS = 4096
+
+_COMPARISONS = {np.greater, np.greater_equal, np.less, np.less_equal, np.equal, np.not_equal}
+
+
+def _grad(value):
+    return value.grad if isinstance(value, Dual) else 0.0
+
+
+def _value(value):
+    return value.value if isinstance(value, Dual) else value
+
+
+def _strip(items):
+    if isinstance(items, dict):
+        return {key: _strip(item) for key, item in items.items()}
+    if isinstance(items, (list, tuple)):
+        return type(items)(_strip(item) for item in items)
+    return _value(items)
+
+
+def _select(first_wins, a, b):
+    return np.where(first_wins, _grad(a), _grad(b))
+
+
+# ufunc -> derivative of its output given (output, *inputs)
+_RULES = {
+    np.add: lambda out, a, b: _grad(a) + _grad(b),
+    np.subtract: lambda out, a, b: _grad(a) - _grad(b),
+    np.multiply: lambda out, a, b: _grad(a) * _value(b) + _value(a) * _grad(b),
+    np.true_divide: lambda out, a, b: (_grad(a) - out * _grad(b)) / _value(b),
+    np.negative: lambda out, a: -_grad(a),
+    np.positive: lambda out, a: _grad(a),
+    np.maximum: lambda out, a, b: _select(_value(a) >= _value(b), a, b),
+    np.minimum: lambda out, a, b: _select(_value(a) <= _value(b), a, b),
+}
+
+
+class Dual(np.lib.mixins.NDArrayOperatorsMixin):
+    """An array ``value`` with its derivatives ``grad`` (shape ``(inputs, *value.shape)``)."""
+
+    def __init__(self, value, grad):
+        self.value = value
+        self.grad = grad
+
+    @property
+    def shape(self):
+        return np.shape(self.value)
+
+    @property
+    def size(self):
+        return np.size(self.value)
+
+    def __getitem__(self, index):
+        return Dual(self.value[index], self.grad[(slice(None),) + (index if isinstance(index, tuple) else (index,))])
+
+    def __array__(self, dtype=None, copy=None):
+        # Plain-array consumers (the Erlang C solver) see a locally constant value
+        return np.asarray(self.value, dtype=dtype)
+
+    def __array_ufunc__(self, ufunc, method, *inputs, **kwargs):
+        if method != "__call__" or kwargs:
+            return NotImplemented
+        value = ufunc(*(_value(item) for item in inputs))
+        if ufunc in _COMPARISONS:
+            return value
+        if ufunc not in _RULES:
+            raise TypeError(f"No derivative rule for np.{ufunc.__name__}")
+        grad = _RULES[ufunc](value, *inputs)
+        return Dual(value, np.broadcast_to(grad, (self.grad.shape[0],) + np.shape(value)))
+
+    def __array_function__(self, func, types, args, kwargs):
+        if func is np.where and not kwargs and len(args) == 3:
+            condition, a, b = args
+            value = np.where(condition, _value(a), _value(b))
+            grad = np.where(condition, _grad(a), _grad(b))
+            return Dual(value, np.broadcast_to(grad, (self.grad.shape[0],) + np.shape(value)))
+        if func is np.shape:
+            return self.shape
+        # Anything else (np.concatenate, np.tile...) works on the values: a locally constant step
+        return func(*_strip(args), **_strip(kwargs))
+
+
+class _DualPricing:
+    # A pricing schedule billing dual minutes: marginal rate times the minutes' derivatives
+    def __init__(self, pricing):
+        self.pricing = pricing
+
+    def ai_cost(self, minutes):
+        if not isinstance(minutes, Dual):
+            return self.pricing.ai_cost(minutes)
+        return Dual(self.pricing.ai_cost(minutes.value), self.pricing.marginal_rate(minutes.value) * minutes.grad)
+
+
+def _differentiate(x, fields, profile, pricing):
+    shape = x["automation"].shape
+    seeds = np.eye(len(fields)).reshape((len(fields), len(fields)) + (1,) * len(shape))
+    duals = dict(x)
+    for i, field in enumerate(fields):
+        duals[field] = Dual(x[field], np.broadcast_to(seeds[i], (len(fields),) + shape))
+    return roi_engine._evaluate(duals, profile, None if pricing is None else _DualPricing(pricing))
+
+
+def compute(inputs=None, fields=None, metrics=METRICS, profile=None, pricing=None):
+    """Values, derivatives and elasticities of ``metrics`` for one or many scenarios.
+
+    ``inputs`` is anything ``roi_engine.compute`` accepts; scenarios are
+    flattened to rows. ``fields`` defaults to every numeric input. Returns
+    a dict with ``fields``, the per-row ``inputs`` {field: (rows,)} and
+    ``value`` {metric: (rows,)}, and ``derivative`` and ``elasticity``
+    {metric: (fields, rows)}.
+    """
+    fields = tuple(fields or roi_engine.NUMERIC_FIELDS)
+    unknown = [field for field in fields if field not in roi_engine.NUMERIC_FIELDS]
+    if unknown:
+        raise ValueError(f"Can't differentiate with respect to {', '.join(unknown)}")
+
+    x = roi_engine.prepare_inputs(inputs)
+    rows = x["automation"].size
+    x = {name: values.reshape(rows) for name, values in x.items()}
+
+    value = {metric: np.empty(rows) for metric in metrics}
+    derivative = {metric: np.empty((len(fields), rows)) for metric in metrics}
+    for first in range(0, rows, _CHUNK_ROWS):
+        chunk = {name: values[first:first + _CHUNK_ROWS] for name, values in x.items()}
+        results = _differentiate(chunk, fields, profile, pricing)
+        for metric in metrics:
+            result = results[metric]
+            if isinstance(result, Dual):
+                value[metric][first:first + _CHUNK_ROWS] = result.value
+                derivative[metric][:, first:first + _CHUNK_ROWS] = result.grad
+            else:
+                # Doesn't depend on any differentiated input
+                value[metric][first:first + _CHUNK_ROWS] = result
+                derivative[metric][:, first:first + _CHUNK_ROWS] = 0.0
+
+    points = np.stack([x[field] for field in fields])
+    elasticity = {}
+    with np.errstate(divide="ignore", invalid="ignore"):
+        for metric in metrics:
+            finite = np.isfinite(value[metric])
+            derivative[metric][:, ~finite] = np.nan
+            elasticity[metric] = np.where(
+                finite & (value[metric] != 0), derivative[metric] * points / value[metric], np.nan
+            )
+    return {
+        "fields": fields,
+        "inputs": {field: x[field] for field in fields},
+        "value": value,
+        "derivative": derivative,
+        "elasticity": elasticity,
+    }
+
+
+def ranked(result, metric="net_savings", row=0):
+    """``(field, input value, {metric: derivative}, {metric: elasticity})`` for one row.
+
+    Sorted by the size of ``metric``'s elasticity, largest first (NaN last).
+    """
+    rows = [
+        (field, float(result["inputs"][field][row]),
+         {name: float(values[i, row]) for name, values in result["derivative"].items()},
+         {name: float(values[i, row]) for name, values in result["elasticity"].items()})
+        for i, field in enumerate(result["fields"])
+    ]
+    rows.sort(key=lambda entry: -abs(entry[3][metric]) if np.isfinite(entry[3][metric]) else 0.0)
+    return rows
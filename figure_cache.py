@@ -0,0 +1,103 @@
+"""Process-wide LRU cache of rendered chart specs.
+
+Figures are keyed on the builder and the (quantized) values it depends on,
+so every session on the server shares them: the default demo scenario is
+built once per process and then served from memory to every rep.
+
+``st.plotly_chart`` calls ``Figure.to_dict()`` on every render, which walks
+and deep-copies the whole figure. Cached entries are ``FrozenFigure``
+objects that hand back the spec computed when the figure was first built.
+"""
+import threading
+from collections import OrderedDict
+
+import plotly.graph_objects as go
+
+DEFAULT_MAX_ENTRIES = 512
+SIGNIFICANT_DIGITS = 12
+
+
+class FrozenFigure(go.Figure):
+    """A read-only figure that returns a precomputed spec instead of re-serializing."""
+
+    def __init__(self, spec):
+        super().__init__()
+        self._frozen_spec = spec
+
+    def to_dict(self):
+        return self._frozen_spec
+
+    def to_plotly_json(self):
+        return self._frozen_spec
+
+
+def quantize(value):
+    """Round floats to SIGNIFICANT_DIGITS so float noise doesn't defeat the cache."""
+    if isinstance(value, float):
+        return float(f"{value:.{SIGNIFICANT_DIGITS}g}")
+    if isinstance(value, tuple):
+        return tuple(quantize(item) for item in value)
+    return value
+
+
+class FigureCache:
+    def __init__(self, max_entries=DEFAULT_MAX_ENTRIES):
+        self.max_entries = max_entries
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(self, builder, *args):
+        """Return the cached figure for ``builder(*args)``, building it on a miss."""
+        args = tuple(quantize(arg) for arg in args)
+        key = (builder.__module__, builder.__qualname__, args)
+        with self._lock:
+            figure = self._entries.get(key)
+            if figure is not None:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return figure
+            self.misses += 1
+
+        # Build outside the lock; two sessions racing on the same key just both build it
+        figure = FrozenFigure(builder(*args).to_dict())
+        with self._lock:
+            self._entries[key] = figure
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+        return figure
+
+    def specs(self):
+        """Snapshot of the cached figure specs (for memory accounting)."""
+        with self._lock:
+            return [figure._frozen_spec for figure in self._entries.values()]
+
+    def trim(self, max_entries):
+        """Drop least recently used figures until at most ``max_entries`` remain."""
+        with self._lock:
+            while len(self._entries) > max(max_entries, 0):
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self):
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "entries": len(self._entries),
+                "max_entries": self.max_entries,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "hit_rate": self.hits / lookups if lookups else 0.0,
+            }
+
+
+FIGURES = FigureCache()
@@ -0,0 +1,242 @@
+"""Goal seek: solve for the input value that hits a target metric.
+
+Usage:
+    python goal_seek.py prospects.csv solved.csv --solve ai_cost_per_min --target "investment_payback_months<=6"
+    python goal_seek.py prospects.parquet solved.parquet --solve automation --target "payback_days<=90"
+
+Every target is turned into a gap g such that the target is met exactly
+where g >= 0, and g is a linear combination of engine outputs (e.g.
+payback_days <= T becomes value_basis * T - 30 * integration >= 0). Inputs
+that enter those outputs linearly (prices, fees, automation %...) make g
+affine, so two engine evaluations give the break-even value in closed form.
+Everything else (kinks from max(), Erlang C staffing steps) falls back to a
+vectorized Illinois bracketing solve. Both work on whole batches at once.
+"""
+import argparse
+import re
+import sys
+import time
+
+import numpy as np
+
+import roi_engine
+
+# Metric -> (label, comparison it is usually targeted with, typical target)
+TARGET_METRICS = {
+    "payback_days": ("Break-even Period (days)", "<=", 90.0),
+    "investment_payback_months": ("Investment Payback (months)", "<=", 6.0),
+    "investment_roi": ("Investment ROI (%)", ">=", 150.0),
+    "roi_percent": ("ROI on Operating Cost (%)", ">=", 100.0),
+    "dollar_saved_per_ai_dollar": ("Saved per AI Dollar ($)", ">=", 3.0),
+    "net_savings": ("Net Monthly Savings ($)", ">=", 10_000.0),
+}
+
+# Input that can be solved for -> (label, search range)
+FREE_VARIABLES = {
+    "automation": ("AI Automation % Target", 0.0, 100.0),
+    "ai_cost_per_min": ("AI Cost per Minute ($)", 0.0, 10.0),
+    "subscription": ("AI Monthly Subscription ($)", 0.0, 1_000_000.0),
+    "integration": ("One-time Integration Fee ($)", 0.0, 10_000_000.0),
+    "hourly_cost": ("Agent Hourly Cost ($)", 0.0, 500.0),
+    "monthly_revenue": ("Monthly Revenue ($)", 0.0, 1_000_000_000.0),
+    "upsell_percent": ("Upsell Improvement (%)", 0.0, 100.0),
+    "production_percent": ("Production Improvement (%)", 0.0, 100.0),
+    "weekly_interactions": ("Weekly Interactions", 0.0, 10_000_000.0),
+    "aht": ("Average Handle Time (minutes)", 0.1, 120.0),
+    "agents": ("Agents (FTE)", 0.0, 100_000.0),
+}
+
+SOLVED = "solved"
+ALWAYS = "always"  # target met over the whole search range
+NEVER = "never"    # target not met anywhere in the search range
+
+# Relative gap accepted from the closed-form step before falling back to bracketing
+_AFFINE_TOLERANCE = 1e-12
+_BRACKET_ITERATIONS = 200
+_XTOL = 1e-10
+
+_TARGET_PATTERN = re.compile(r"^\s*(\w+)\s*(<=|>=)\s*(-?[\d.]+(?:e-?\d+)?)\s*$")
+
+
+def parse_target(text):
+    """``"payback_days<=90"`` -> ``("payback_days", "<=", 90.0)``."""
+    match = _TARGET_PATTERN.match(text)
+    if match is None or match.group(1) not in TARGET_METRICS:
+        raise ValueError(f"Bad target {text!r}: expected <metric><=|>=<value> with metric one of "
+                         f"{', '.join(TARGET_METRICS)}")
+    return match.group(1), match.group(2), float(match.group(3))
+
+
+def gap(results, metric, op, target):
+    """Signed distance to the target: >= 0 exactly where ``metric op target`` holds.
+
+    Ratios are cross-multiplied by their (positive) denominators so the gap
+    stays linear in the engine outputs.
+    """
+    with np.errstate(invalid="ignore"):
+        if metric == "payback_days":
+            g = results["value_basis"] * target - 30 * results["integration_fee"]
+            return g if op == "<=" else -g
+        if metric == "investment_payback_months":
+            g = results["annual_net_savings"] * target - 12 * results["integration_fee"]
+            return g if op == "<=" else -g
+        if metric == "investment_roi":
+            integration = results["integration_fee"]
+            g = np.where(integration > 0, 100 * (results["annual_net_savings"] - integration) - target * integration,
+                         -target)
+        elif metric == "roi_percent":
+            cost = results["ai_enabled_cost"]
+            g = np.where(cost > 0, 100 * results["value_basis"] - target * cost, -target)
+        elif metric == "dollar_saved_per_ai_dollar":
+            ai_cost = results["total_ai_monthly_cost"]
+            g = np.where(ai_cost > 0, results["value_basis"] - target * ai_cost, -target)
+        elif metric == "net_savings":
+            g = results["net_savings"] - target
+        else:
+            raise ValueError(f"Unknown target metric: {metric!r}")
+    return g if op == ">=" else -g
+
+
+def _gap_at(inputs, field, values, metric, op, target, profile, pricing):
+    x = roi_engine.prepare_inputs(inputs, **{field: values})
+    results = roi_engine.compute(x, profile, pricing)
+    results["integration_fee"] = x["integration"]
+    return gap(results, metric, op, target)
+
+
+def solve(inputs, field, metric, op, target, low=None, high=None, profile=None, pricing=None):
+    """Break-even value of ``field`` for ``metric op target``, for one or many scenarios.
+
+    ``inputs`` is anything ``roi_engine.compute`` accepts; scenarios are
+    flattened to rows. Returns a dict of per-row arrays: ``value`` (the
+    break-even input, NaN unless solved), ``status`` (``"solved"``,
+    ``"always"`` or ``"never"``) and ``side`` (``"<="`` when the target
+    holds at or below ``value``, ``">="`` when at or above it).
+    """
+    if field not in FREE_VARIABLES:
+        raise ValueError(f"Can't solve for {field!r}; expected one of {', '.join(FREE_VARIABLES)}")
+    _, default_low, default_high = FREE_VARIABLES[field]
+    low = default_low if low is None else low
+    high = default_high if high is None else high
+
+    x = roi_engine.prepare_inputs(inputs)
+    rows = x["automation"].size
+    x = {name: values.reshape(rows) for name, values in x.items()}
+    lo = np.full(rows, float(low))
+    hi = np.full(rows, float(high))
+
+    g_lo = _gap_at(x, field, lo, metric, op, target, profile, pricing)
+    g_hi = _gap_at(x, field, hi, metric, op, target, profile, pricing)
+    met_lo, met_hi = g_lo >= 0, g_hi >= 0
+    status = np.where(met_lo & met_hi, ALWAYS, np.where(~met_lo & ~met_hi, NEVER, SOLVED)).astype(object)
+    side = np.where(met_lo, "<=", ">=").astype(object)
+    value = np.full(rows, np.nan)
+
+    crossing = np.flatnonzero(met_lo != met_hi)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        # Closed form: exact wherever the gap is affine in the field
+        a, b, ga, gb = lo[crossing], hi[crossing], g_lo[crossing], g_hi[crossing]
+        root = np.clip(a - ga * (b - a) / (gb - ga), a, b)
+        g_root = _gap_at(_take(x, crossing), field, root, metric, op, target, profile, pricing)
+        exact = np.abs(g_root) <= _AFFINE_TOLERANCE * np.maximum(np.abs(ga), np.abs(gb))
+        value[crossing[exact]] = root[exact]
+
+        # Illinois bracketing for the rest, starting from the closed-form guess
+        rest = crossing[~exact]
+        if rest.size:
+            a, b, ga, gb = a[~exact], b[~exact], ga[~exact], gb[~exact]
+            keep_a = np.sign(g_root[~exact]) == np.sign(ga)
+            a = np.where(keep_a, root[~exact], a)
+            ga = np.where(keep_a, g_root[~exact], ga)
+            b = np.where(keep_a, b, root[~exact])
+            gb = np.where(keep_a, gb, g_root[~exact])
+            value[rest] = _illinois(_take(x, rest), field, metric, op, target, profile, pricing, a, b, ga, gb)
+    return {"value": value, "status": status, "side": side}
+
+
+def _take(x, rows):
+    return {name: values[rows] for name, values in x.items()}
+
+
+def _illinois(x, field, metric, op, target, profile, pricing, a, b, ga, gb):
+    """Vectorized regula falsi with the Illinois modification on brackets [a, b].
+
+    Returns the end of the final bracket where the target is met, so a
+    step in the gap (Erlang C staffing) still yields a feasible value.
+    """
+    active = np.arange(a.size)
+    last_side = np.zeros(a.size, dtype=np.int8)
+    for _ in range(_BRACKET_ITERATIONS):
+        if active.size == 0:
+            break
+        aa, bb, gaa, gbb = a[active], b[active], ga[active], gb[active]
+        c = np.where(gbb != gaa, bb - gbb * (bb - aa) / (gbb - gaa), (aa + bb) / 2)
+        c = np.where((c > aa) & (c < bb), c, (aa + bb) / 2)
+        gc = _gap_at(_take(x, active), field, c, metric, op, target, profile, pricing)
+
+        # Replace the endpoint with the same sign; halve the stale one if it survives twice
+        same_a = np.sign(gc) == np.sign(gaa)
+        a[active] = np.where(same_a, c, aa)
+        ga[active] = np.where(same_a, gc, np.where(last_side[active] == -1, gaa / 2, gaa))
+        b[active] = np.where(same_a, bb, c)
+        gb[active] = np.where(same_a, np.where(last_side[active] == 1, gbb / 2, gbb), gc)
+        last_side[active] = np.where(same_a, 1, -1)
+        hit = gc == 0
+        a[active[hit]] = b[active[hit]] = c[hit]
+
+        done = hit | (b[active] - a[active] <= _XTOL * np.maximum(1.0, np.abs(c)))
+        active = active[~done]
+    return np.where(ga >= 0, a, b)
+
+
+def solve_chunk(chunk, field, metric, op, target, low=None, high=None):
+    """Append ``<field>_breakeven``, ``breakeven_status`` and ``breakeven_side`` to prospect rows."""
+    from batch_quote import chunk_inputs
+
+    result = solve(chunk_inputs(chunk), field, metric, op, target, low, high)
+    chunk = chunk.copy()
+    chunk[f"{field}_breakeven"] = np.broadcast_to(result["value"], (len(chunk),))
+    chunk["breakeven_status"] = np.broadcast_to(result["status"], (len(chunk),))
+    chunk["breakeven_side"] = np.broadcast_to(result["side"], (len(chunk),))
+    return chunk
+
+
+def run(input_path, output_path, field, target, chunksize=None, low=None, high=None):
+    """Solve every row of ``input_path`` into ``output_path``; returns (rows, seconds)."""
+    import pyarrow as pa
+
+    from batch_quote import DEFAULT_CHUNKSIZE, ChunkWriter, read_chunks
+
+    metric, op, value = parse_target(target)
+    writer = ChunkWriter(output_path)
+    rows = 0
+    start = time.perf_counter()
+    try:
+        for chunk in read_chunks(input_path, chunksize or DEFAULT_CHUNKSIZE):
+            solved = solve_chunk(chunk, field, metric, op, value, low, high)
+            writer.write(pa.Table.from_pandas(solved, preserve_index=False))
+            rows += len(solved)
+    finally:
+        writer.close()
+    return rows, time.perf_counter() - start
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Solve each prospect for the input value that hits a target.")
+    parser.add_argument("input", help="CSV or Parquet file, one prospect per row")
+    parser.add_argument("output", help="CSV or Parquet file to write (format taken from the extension)")
+    parser.add_argument("--solve", required=True, choices=sorted(FREE_VARIABLES), help="input to solve for")
+    parser.add_argument("--target", required=True, help='e.g. "investment_payback_months<=6"')
+    parser.add_argument("--low", type=float, help="lower end of the search range")
+    parser.add_argument("--high", type=float, help="upper end of the search range")
+    parser.add_argument("--chunksize", type=int, help="rows per chunk")
+    args = parser.parse_args(argv)
+
+    rows, elapsed = run(args.input, args.output, args.solve, args.target, args.chunksize, args.low, args.high)
+    rate = rows / elapsed if elapsed > 0 else 0.0
+    print(f"Solved {rows:,} rows in {elapsed:.2f}s ({rate:,.0f} rows/sec) -> {args.output}", file=sys.stderr)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
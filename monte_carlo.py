@@ -0,0 +1,137 @@
+"""Monte Carlo uncertainty mode for the ROI engine.
+
+Any numeric sidebar input can be given a distribution instead of a point
+value; ``simulate`` draws all of them at once, pushes the draws through
+``roi_engine.compute`` in fixed-size chunks and reports percentiles of the
+headline metrics. Chunks get independent child seeds from one
+``SeedSequence`` so a run is reproducible for a given seed regardless of
+how many worker processes it is split across.
+"""
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+import roi_engine
+
+METRICS = ("net_savings", "roi_percent", "payback_days", "investment_payback_months")
+PERCENTILES = (10, 50, 90)
+DEFAULT_DRAWS = 1_000_000
+DEFAULT_CHUNK_SIZE = 250_000
+
+# Physical limits applied to sampled values (a normal draw can go negative)
+_BOUNDS = {
+    "automation": (0, 100),
+    "hr_attrition": (0, 100),
+    "hr_no_show": (0, 100),
+    "hr_peak_staffing": (0, None),
+    "aht": (1e-6, None),
+    "weekly_interactions": (0, None),
+    "hourly_cost": (0, None),
+    "ai_cost_per_min": (0, None),
+    "agents": (0, None),
+}
+
+# z-score of the 90th percentile, used to turn P10/P90 bounds into a normal sd
+_Z90 = 1.2815515655446004
+
+
+def triangular(low, mode, high):
+    return ("triangular", float(low), float(mode), float(high))
+
+
+def uniform(low, high):
+    return ("uniform", float(low), float(high))
+
+
+def normal(mean, sd):
+    return ("normal", float(mean), float(sd))
+
+
+def normal_from_bounds(low, high):
+    """Normal distribution whose P10 and P90 are ``low`` and ``high``."""
+    return normal((low + high) / 2, (high - low) / (2 * _Z90))
+
+
+def sample(distribution, rng, size):
+    kind, *params = distribution
+    if kind == "triangular":
+        low, mode, high = params
+        if low == high:
+            return np.full(size, low)
+        return rng.triangular(low, mode, high, size)
+    if kind == "uniform":
+        low, high = params
+        return rng.uniform(low, high, size)
+    if kind == "normal":
+        mean, sd = params
+        return rng.normal(mean, sd, size)
+    raise ValueError(f"Unknown distribution: {kind!r}")
+
+
+def _simulate_chunk(inputs, distributions, size, seed_seq, metrics, profile=None, pricing=None):
+    rng = np.random.default_rng(seed_seq)
+    overrides = {}
+    for name, distribution in distributions.items():
+        values = sample(distribution, rng, size)
+        low, high = _BOUNDS.get(name, (None, None))
+        if low is not None or high is not None:
+            values = np.clip(values, low, high)
+        overrides[name] = values
+    results = roi_engine.compute(inputs, profile, pricing, **overrides)
+    return {name: np.broadcast_to(results[name], (size,)) for name in metrics}
+
+
+def percentiles(samples, q=PERCENTILES):
+    """Percentiles per metric; inverted-CDF so infinite paybacks stay well defined."""
+    return {
+        name: dict(zip(q, np.percentile(values, q, method="inverted_cdf").tolist()))
+        for name, values in samples.items()
+    }
+
+
+def histogram(values, bins=60):
+    """Histogram of the finite values plus the share of infinite ones (never pays back)."""
+    finite = np.isfinite(values)
+    counts, edges = np.histogram(values[finite], bins=bins)
+    return counts, edges, 1.0 - finite.mean()
+
+
+def simulate(inputs, distributions, draws=DEFAULT_DRAWS, seed=None, chunk_size=DEFAULT_CHUNK_SIZE,
+             workers=1, metrics=METRICS, on_progress=None, profile=None, pricing=None):
+    """Run ``draws`` scenarios with ``distributions`` layered over the point ``inputs``.
+
+    ``on_progress(done, percentile_estimates)`` is called after each chunk with
+    running percentile estimates over the draws completed so far. Returns a
+    dict with the final ``percentiles`` and the raw per-metric ``samples``.
+    ``profile`` and ``pricing`` are passed through to ``roi_engine.compute``.
+    """
+    n_chunks = max(1, -(-draws // chunk_size))
+    sizes = [chunk_size] * (n_chunks - 1) + [draws - chunk_size * (n_chunks - 1)]
+    seeds = np.random.SeedSequence(seed).spawn(n_chunks)
+    inputs = dict(inputs or {})
+
+    samples = {name: np.empty(draws) for name in metrics}
+    done = 0
+
+    def collect(chunk):
+        nonlocal done
+        size = len(chunk[metrics[0]])
+        for name in metrics:
+            samples[name][done:done + size] = chunk[name]
+        done += size
+        if on_progress is not None:
+            on_progress(done, percentiles({name: values[:done] for name, values in samples.items()}))
+
+    if workers <= 1:
+        for size, seed_seq in zip(sizes, seeds):
+            collect(_simulate_chunk(inputs, distributions, size, seed_seq, metrics, profile, pricing))
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            futures = [
+                pool.submit(_simulate_chunk, inputs, distributions, size, seed_seq, metrics, profile, pricing)
+                for size, seed_seq in zip(sizes, seeds)
+            ]
+            for future in futures:
+                collect(future.result())
+
+    return {"draws": draws, "percentiles": percentiles(samples), "samples": samples}
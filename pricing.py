@@ -0,0 +1,129 @@
+"""Tiered and volume-discounted pricing of AI minutes.
+
+The flat model bills ``ai_minutes * ai_cost_per_min``. A ``PricingSchedule``
+bills a month's AI minutes the way they are actually sold:
+
+- ``included_minutes`` come with the subscription at no usage charge;
+- the rest are priced over tiers of total monthly minutes, either
+  ``"graduated"`` (each tier's rate applies to the minutes inside it) or
+  ``"volume"`` (every billable minute at the rate of the tier the month
+  reaches); the last tier's rate is the overage rate and has no upper bound;
+- a committed monthly spend earns ``commit_discount_percent`` off usage,
+  and the usage bill never falls below the commitment.
+
+Tier bounds, rates and the cumulative cost at each tier's lower bound are
+worked out once, so pricing any array of monthly minutes (a portfolio file,
+Monte Carlo draws, a sensitivity grid) is one ``np.searchsorted`` (O(log
+tiers) per value) and a gather, with no Python loop over rows. The
+subscription input stays the monthly platform fee; ``ai_cost_per_min`` is
+not used when a schedule is given.
+"""
+import json
+
+import numpy as np
+
+TIER_MODES = ("graduated", "volume")
+
+
+class PricingSchedule:
+    """Monthly AI usage bill as a function of monthly AI minutes.
+
+    ``tiers`` is a sequence of ``(up_to_minutes, rate_per_minute)`` with
+    increasing bounds on total monthly minutes; the last bound may be
+    ``None`` (it is open-ended either way).
+    """
+
+    def __init__(self, tiers, included_minutes=0.0, mode="graduated", commit_spend=0.0,
+                 commit_discount_percent=0.0):
+        if mode not in TIER_MODES:
+            raise ValueError(f"Unknown tier mode: {mode!r} (expected one of {', '.join(TIER_MODES)})")
+        if not tiers:
+            raise ValueError("A pricing schedule needs at least one tier")
+        bounds = [np.inf if up_to is None else float(up_to) for up_to, _ in tiers[:-1]] + [np.inf]
+        rates = [float(rate) for _, rate in tiers]
+        included_minutes = float(included_minutes)
+        if included_minutes < 0 or commit_spend < 0 or any(rate < 0 for rate in rates):
+            raise ValueError("Included minutes, rates and committed spend can't be negative")
+        if not 0 <= commit_discount_percent < 100:
+            raise ValueError("commit_discount_percent must be between 0 and 100")
+        if bounds[0] <= included_minutes or any(b <= a for a, b in zip(bounds, bounds[1:])):
+            raise ValueError("Tier bounds must increase and start above the included minutes")
+
+        self.tiers = tuple(zip([None if np.isinf(b) else b for b in bounds], rates))
+        self.included_minutes = included_minutes
+        self.mode = mode
+        self.commit_spend = float(commit_spend)
+        self.commit_discount_percent = float(commit_discount_percent)
+
+        # The included bundle is a zero-rate first tier
+        self._uppers = np.array([included_minutes] + bounds)
+        self._lowers = np.concatenate([[0.0], self._uppers[:-1]])
+        self._rates = np.array([0.0] + rates)
+        widths = np.diff(self._lowers)
+        self._base = np.concatenate([[0.0], np.cumsum(widths * self._rates[:-1])])
+
+    @classmethod
+    def from_dict(cls, spec):
+        return cls(
+            [tuple(tier) for tier in spec["tiers"]],
+            included_minutes=spec.get("included_minutes", 0.0),
+            mode=spec.get("mode", "graduated"),
+            commit_spend=spec.get("commit_spend", 0.0),
+            commit_discount_percent=spec.get("commit_discount_percent", 0.0),
+        )
+
+    def to_dict(self):
+        return {
+            "tiers": [list(tier) for tier in self.tiers],
+            "included_minutes": self.included_minutes,
+            "mode": self.mode,
+            "commit_spend": self.commit_spend,
+            "commit_discount_percent": self.commit_discount_percent,
+        }
+
+    def key(self):
+        """Stable string identifying the schedule (for cache keys)."""
+        return json.dumps(self.to_dict(), sort_keys=True, separators=(",", ":"))
+
+    def __eq__(self, other):
+        return isinstance(other, PricingSchedule) and self.key() == other.key()
+
+    def __hash__(self):
+        return hash(self.key())
+
+    def __repr__(self):
+        return f"PricingSchedule({self.to_dict()!r})"
+
+    def usage_cost(self, minutes):
+        """Undiscounted usage charge for ``minutes`` (any shape)."""
+        minutes = np.maximum(np.asarray(minutes, dtype=np.float64), 0.0)
+        tier = np.searchsorted(self._uppers, minutes, side="left")
+        tier = np.minimum(tier, self._uppers.size - 1)  # NaN sorts past the end
+        if self.mode == "graduated":
+            return self._base[tier] + (minutes - self._lowers[tier]) * self._rates[tier]
+        return np.maximum(minutes - self.included_minutes, 0.0) * self._rates[tier]
+
+    def ai_cost(self, minutes):
+        """Monthly AI bill for ``minutes``: discounted usage, at least the committed spend."""
+        usage = self.usage_cost(minutes) * (1 - self.commit_discount_percent / 100)
+        return np.maximum(usage, self.commit_spend)
+
+    def marginal_rate(self, minutes):
+        """Billed dollars for one more AI minute (0 inside the bundle or while the commitment binds)."""
+        minutes = np.maximum(np.asarray(minutes, dtype=np.float64), 0.0)
+        tier = np.minimum(np.searchsorted(self._uppers, minutes, side="left"), self._uppers.size - 1)
+        discount = 1 - self.commit_discount_percent / 100
+        binding = self.usage_cost(minutes) * discount < self.commit_spend
+        return np.where(binding, 0.0, self._rates[tier] * discount)
+
+    def effective_rate(self, minutes):
+        """Average billed dollars per AI minute (NaN at zero minutes)."""
+        minutes = np.asarray(minutes, dtype=np.float64)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            return np.where(minutes > 0, self.ai_cost(minutes) / minutes, np.nan)
+
+
+def load(path):
+    """Read a schedule from a JSON file in the ``PricingSchedule.to_dict`` layout."""
+    with open(path) as f:
+        return PricingSchedule.from_dict(json.load(f))
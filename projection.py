@@ -0,0 +1,169 @@
+"""Multi-year monthly cash-flow projection on top of the ROI engine.
+
+Each scenario is expanded along a trailing months axis: the automation
+target ramps up over the first months, hourly_cost grows with annual wage
+inflation and the AI bill with annual AI price changes (both stepped once
+per contract year; a tiered pricing schedule's bill scales with its
+rates), and the engine evaluates every (scenario, month)
+cell in one broadcast pass. Month 0 carries the one-time integration fee.
+
+NPV, IRR and (discounted) payback are computed with array operations over
+all scenarios at once; IRR uses a vectorized, bracketed Newton iteration on the monthly rate.
+"""
+import numpy as np
+
+import roi_engine
+
+MAX_HORIZON_MONTHS = 120
+RAMP_CURVES = ("none", "linear", "s-curve")
+CASH_FLOW_METRIC = "net_savings"
+
+# Rows per engine pass: bounds the (rows x months x outputs) temporaries
+_CHUNK_ROWS = 2048
+_IRR_ITERATIONS = 100
+
+
+def ramp_fraction(months, ramp_months, curve="linear", start_fraction=0.0):
+    """Share of the automation target reached in each month (1-based)."""
+    months = np.asarray(months, dtype=np.float64)
+    if curve == "none" or ramp_months <= 0:
+        return np.ones_like(months)
+    t = np.clip(months / ramp_months, 0.0, 1.0)
+    if curve == "s-curve":
+        t = t * t * (3 - 2 * t)
+    elif curve != "linear":
+        raise ValueError(f"Unknown ramp curve: {curve!r} (expected one of {RAMP_CURVES})")
+    return start_fraction + (1 - start_fraction) * t
+
+
+def monthly_rate(annual_rate):
+    return (1 + annual_rate) ** (1 / 12) - 1
+
+
+def _payback_month(cumulative, investment):
+    """Fractional month in which ``cumulative`` first reaches ``investment`` (inf if never)."""
+    reached = cumulative >= investment[:, np.newaxis]
+    ever = reached.any(axis=1)
+    first = np.argmax(reached, axis=1)
+    rows = np.arange(len(first))
+    before = np.where(first > 0, cumulative[rows, np.maximum(first - 1, 0)], 0.0)
+    step = cumulative[rows, first] - before
+    with np.errstate(divide="ignore", invalid="ignore"):
+        partial = np.where(step > 0, (investment - before) / step, 1.0)
+    month = first + np.clip(partial, 0.0, 1.0)
+    month = np.where(investment <= 0, 0.0, month)
+    return np.where(ever | (investment <= 0), month, np.inf)
+
+
+def _npv_and_slope(v, investment, flows_by_month):
+    # Horner's scheme in the discount factor v = 1 / (1 + r): no per-cell powers
+    acc = np.zeros_like(v)
+    slope = np.zeros_like(v)
+    for flows in flows_by_month[::-1]:
+        slope = slope * v + acc
+        acc = acc * v + flows
+    return v * acc - investment, acc + v * slope
+
+
+def irr(investment, cash_flows, low=-0.9, high=10.0, tol=1e-12):
+    """Monthly IRR of ``-investment`` at month 0 followed by ``cash_flows``.
+
+    Newton iteration on the discount factor, kept inside a shrinking
+    bracket and falling back to bisection whenever a Newton step leaves the
+    bracket or stalls; NaN where NPV doesn't change sign over [low, high].
+    """
+    investment = np.asarray(investment, dtype=np.float64)
+    flows_by_month = np.ascontiguousarray(cash_flows.T)
+    v_lo = np.full(len(investment), 1 / (1 + high))
+    v_hi = np.full(len(investment), 1 / (1 + low))
+    f_lo, _ = _npv_and_slope(v_lo, investment, flows_by_month)
+    f_hi, _ = _npv_and_slope(v_hi, investment, flows_by_month)
+    valid = np.sign(f_lo) != np.sign(f_hi)
+
+    with np.errstate(divide="ignore", invalid="ignore", over="ignore"):
+        # Start from the perpetuity rate (mean monthly flow / investment)
+        guess = np.nan_to_num(cash_flows.mean(axis=1) / investment, nan=0.0, posinf=high, neginf=low)
+        v = np.clip(1 / (1 + np.clip(guess, low, high)), v_lo, v_hi)
+        last_step = v_hi - v_lo
+
+        # Iterate only on the rows that haven't converged yet
+        active = np.flatnonzero(valid)
+        for _ in range(_IRR_ITERATIONS):
+            if active.size == 0:
+                break
+            va, lo, hi, flo = v[active], v_lo[active], v_hi[active], f_lo[active]
+            f, slope = _npv_and_slope(va, investment[active], flows_by_month[:, active])
+            left = np.sign(f) == np.sign(flo)
+            lo = np.where(left, va, lo)
+            hi = np.where(left, hi, va)
+            f_lo[active] = np.where(left, f, flo)
+            v_lo[active], v_hi[active] = lo, hi
+
+            newton = va - f / slope
+            bisect = (
+                ~np.isfinite(newton) | (newton < lo) | (newton > hi)
+                | (np.abs(2 * f) > np.abs(last_step[active] * slope))
+            )
+            v_next = np.where(bisect, (lo + hi) / 2, newton)
+            v_next = np.where(f == 0, va, v_next)
+            last_step[active] = v_next - va
+            v[active] = v_next
+            active = active[np.abs(v_next - va) > tol * v_next]
+    return np.where(valid, 1 / v - 1, np.nan)
+
+
+def project(inputs=None, horizon_months=12, ramp_months=0, ramp_curve="linear", ramp_start_percent=0.0,
+            wage_inflation_percent=0.0, ai_price_change_percent=0.0, discount_rate_percent=0.0, profile=None,
+            pricing=None):
+    """Monthly cash flows and investment metrics for one or many scenarios.
+
+    ``inputs`` is the same mapping ``roi_engine.compute`` accepts (``profile``
+    and ``pricing`` are passed through to it); scenarios are flattened to rows. Returns a dict
+    with ``months`` (horizon,), the per-row arrays ``cash_flows``,
+    ``cumulative`` and ``discounted_cumulative`` (rows, horizon), and ``npv``,
+    ``irr_annual_percent``, ``payback_months`` and
+    ``discounted_payback_months`` (rows,).
+    """
+    if not 1 <= horizon_months <= MAX_HORIZON_MONTHS:
+        raise ValueError(f"horizon_months must be between 1 and {MAX_HORIZON_MONTHS}")
+
+    months = np.arange(1, horizon_months + 1)
+    year = (months - 1) // 12
+    ramp = ramp_fraction(months, ramp_months, ramp_curve, ramp_start_percent / 100)
+    wage_growth = (1 + wage_inflation_percent / 100) ** year
+    price_growth = (1 + ai_price_change_percent / 100) ** year
+    discount = (1 + monthly_rate(discount_rate_percent / 100)) ** -months
+
+    x = roi_engine.prepare_inputs(inputs)
+    rows = x["automation"].size
+    x = {name: values.reshape(rows) for name, values in x.items()}
+
+    cash_flows = np.empty((rows, horizon_months))
+    for start in range(0, rows, _CHUNK_ROWS):
+        chunk = {name: values[start:start + _CHUNK_ROWS, np.newaxis] for name, values in x.items()}
+        chunk["automation"] = chunk["automation"] * ramp
+        chunk["hourly_cost"] = chunk["hourly_cost"] * wage_growth
+        if pricing is None:
+            chunk["ai_cost_per_min"] = chunk["ai_cost_per_min"] * price_growth
+            flows = roi_engine.compute(chunk, profile)[CASH_FLOW_METRIC]
+        else:
+            # Scaling every rate and the commitment scales the bill by the same factor
+            results = roi_engine.compute(chunk, profile, pricing)
+            flows = results[CASH_FLOW_METRIC] - results["ai_cost"] * (price_growth - 1)
+        cash_flows[start:start + _CHUNK_ROWS] = flows
+
+    investment = x["integration"]
+    cumulative = np.cumsum(cash_flows, axis=1)
+    discounted_cumulative = np.cumsum(cash_flows * discount, axis=1)
+    monthly_irr = irr(investment, cash_flows)
+
+    return {
+        "months": months,
+        "cash_flows": cash_flows,
+        "cumulative": cumulative,
+        "discounted_cumulative": discounted_cumulative,
+        "npv": discounted_cumulative[:, -1] - investment,
+        "irr_annual_percent": ((1 + monthly_irr) ** 12 - 1) * 100,
+        "payback_months": _payback_month(cumulative, investment),
+        "discounted_payback_months": _payback_month(discounted_cumulative, investment),
+    }
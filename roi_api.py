@@ -0,0 +1,309 @@
+"""Local JSON API for the ROI engine (standard library HTTP server).
+
+Usage:
+    python roi_api.py [--host 127.0.0.1] [--port 8765]
+
+Endpoints (HTTP/1.1, connections are kept alive):
+    GET  /health
+    GET  /v1/fields        input names with their defaults, and output names
+    GET  /v1/stats         cache and batching counters
+    POST /v1/roi           {"automation": 70, ...}              -> {"outputs": {...}}
+    POST /v1/roi/batch     {"scenarios": [{...}, {...}, ...]}   -> {"results": [{...}, ...]}
+
+Inputs are the sidebar fields of app.py; missing ones fall back to
+``roi_engine.DEFAULT_INPUTS`` and the outputs are the same numbers the app
+shows. Non-finite outputs (a payback that never happens) come back as null.
+
+Concurrent single requests are queued to one worker that evaluates whatever
+has queued up while it was busy in a single vectorized ``roi_engine.compute``
+call, so batches grow with the load without delaying a lone request.
+Encoded responses are kept in an LRU cache keyed on the inputs that affect
+the results.
+"""
+import argparse
+import json
+import math
+import queue
+import sys
+import threading
+from collections import OrderedDict
+from concurrent.futures import Future
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import numpy as np
+
+import roi_engine
+import scenario_store
+
+DEFAULT_PORT = 8765
+CACHE_ENTRIES = 100_000
+MAX_BATCH = 1024
+MAX_BATCH_SCENARIOS = 100_000
+MAX_BODY_BYTES = 64 * 1024 * 1024
+
+
+def _is_finite(value):
+    try:
+        return math.isfinite(float(value))
+    except OverflowError:  # a JSON integer too large for a float
+        return False
+
+
+def parse_scenario(scenario):
+    """Validate one request's inputs; raises ValueError with a client-facing message."""
+    if not isinstance(scenario, dict):
+        raise ValueError("Each scenario must be a JSON object of input fields")
+    unknown = sorted(set(scenario) - set(roi_engine.INPUT_FIELDS))
+    if unknown:
+        raise ValueError(f"Unknown input fields: {', '.join(unknown)}")
+    for name, value in scenario.items():
+        if name in roi_engine.TOGGLE_FIELDS:
+            if not isinstance(value, bool):
+                raise ValueError(f"{name} must be true or false")
+        elif isinstance(value, bool) or not isinstance(value, (int, float)) or not _is_finite(value):
+            raise ValueError(f"{name} must be a finite number")
+    if not roi_engine.workload_is_finite(
+        scenario.get("weekly_interactions", roi_engine.DEFAULT_INPUTS["weekly_interactions"]),
+        scenario.get("aht", roi_engine.DEFAULT_INPUTS["aht"]),
+    ):
+        raise ValueError("weekly_interactions × aht is too large")
+    return scenario
+
+
+def _cache_key(scenario):
+    return json.dumps(scenario_store.changed_inputs(scenario), sort_keys=True, separators=(",", ":"))
+
+
+def evaluate(scenarios):
+    """Engine outputs for a list of input dicts, each encoded as a JSON object (bytes)."""
+    columns = {
+        name: [scenario.get(name, default) for scenario in scenarios]
+        for name, default in roi_engine.DEFAULT_INPUTS.items()
+    }
+    results = roi_engine.compute(columns)
+    names = [json.dumps(name) for name in roi_engine.OUTPUT_FIELDS]
+    values = []
+    for name in roi_engine.OUTPUT_FIELDS:
+        column = results[name]
+        # JSON has no Infinity/NaN: send null
+        column = np.where(np.isfinite(column), column, np.nan).tolist()
+        values.append(["null" if v != v else repr(v) for v in column])
+    return [
+        ("{" + ",".join(f"{name}:{row[i]}" for i, name in enumerate(names)) + "}").encode()
+        for row in zip(*values)
+    ]
+
+
+class ResponseCache:
+    """Thread-safe LRU of encoded outputs."""
+
+    def __init__(self, max_entries=CACHE_ENTRIES):
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        with self._lock:
+            value = self._entries.get(key)
+            if value is None:
+                self.misses += 1
+            else:
+                self.hits += 1
+                self._entries.move_to_end(key)
+            return value
+
+    def put(self, key, value):
+        with self._lock:
+            self._entries[key] = value
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def __len__(self):
+        return len(self._entries)
+
+
+class MicroBatcher:
+    """Evaluates concurrent single requests together on one worker thread."""
+
+    def __init__(self, max_batch=MAX_BATCH):
+        self.max_batch = max_batch
+        self.batches = 0
+        self.scenarios = 0
+        self._queue = queue.SimpleQueue()
+        self._worker = threading.Thread(target=self._run, name="roi-batcher", daemon=True)
+        self._worker.start()
+
+    def submit(self, scenario):
+        """Future resolving to the encoded outputs of ``scenario``."""
+        future = Future()
+        self._queue.put((scenario, future))
+        return future
+
+    def _run(self):
+        while True:
+            batch = [self._queue.get()]
+            # Take whatever queued up while the last batch was computing; never wait for more
+            while len(batch) < self.max_batch:
+                try:
+                    batch.append(self._queue.get_nowait())
+                except queue.Empty:
+                    break
+            try:
+                encoded = evaluate([scenario for scenario, _ in batch])
+            except Exception as exc:
+                for _, future in batch:
+                    future.set_exception(exc)
+                continue
+            self.batches += 1
+            self.scenarios += len(batch)
+            for (_, future), outputs in zip(batch, encoded):
+                future.set_result(outputs)
+
+
+class ROIService:
+    """Cache in front of the micro-batcher; shared by all request threads."""
+
+    def __init__(self, cache_entries=CACHE_ENTRIES, max_batch=MAX_BATCH):
+        self.cache = ResponseCache(cache_entries)
+        self.batcher = MicroBatcher(max_batch)
+
+    def single(self, scenario):
+        key = _cache_key(parse_scenario(scenario))
+        outputs = self.cache.get(key)
+        if outputs is None:
+            outputs = self.batcher.submit(scenario).result()
+            self.cache.put(key, outputs)
+        return b'{"outputs":' + outputs + b"}"
+
+    def batch(self, scenarios):
+        if not isinstance(scenarios, list):
+            raise ValueError('Expected {"scenarios": [...]}')
+        if len(scenarios) > MAX_BATCH_SCENARIOS:
+            raise ValueError(f"At most {MAX_BATCH_SCENARIOS:,} scenarios per batch")
+        keys = [_cache_key(parse_scenario(scenario)) for scenario in scenarios]
+        outputs = [self.cache.get(key) for key in keys]
+        missing = [i for i, value in enumerate(outputs) if value is None]
+        if missing:
+            # Already a batch: one engine pass for every miss, no need to queue
+            for i, value in zip(missing, evaluate([scenarios[i] for i in missing])):
+                outputs[i] = value
+                self.cache.put(keys[i], value)
+        return b'{"results":[' + b",".join(outputs) + b"]}"
+
+    def stats(self):
+        batcher = self.batcher
+        return {
+            "cache_entries": len(self.cache),
+            "cache_hits": self.cache.hits,
+            "cache_misses": self.cache.misses,
+            "batches": batcher.batches,
+            "batched_scenarios": batcher.scenarios,
+            "mean_batch_size": batcher.scenarios / batcher.batches if batcher.batches else 0.0,
+        }
+
+
+class ROIRequestHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"  # keep-alive: every response carries a Content-Length
+    # Headers and body go out in separate writes; without TCP_NODELAY the body waits ~40 ms
+    # on the client's delayed ACK for every request after the first on a connection
+    disable_nagle_algorithm = True
+    service = None
+    quiet = True
+
+    def _send(self, status, body, content_type="application/json"):
+        self.send_response(status)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _send_json(self, status, payload):
+        self._send(status, json.dumps(payload).encode())
+
+    def do_GET(self):
+        if self.path == "/health":
+            self._send(200, b"ok", "text/plain")
+        elif self.path == "/v1/fields":
+            self._send_json(200, {"inputs": roi_engine.DEFAULT_INPUTS, "outputs": list(roi_engine.OUTPUT_FIELDS)})
+        elif self.path == "/v1/stats":
+            self._send_json(200, self.service.stats())
+        else:
+            self._send_json(404, {"error": f"No such endpoint: GET {self.path}"})
+
+    def do_POST(self):
+        try:
+            length = int(self.headers.get("Content-Length") or 0)
+        except ValueError:
+            length = -1
+        if length < 0:
+            # Can't tell where this body ends, so the connection can't be reused
+            self.close_connection = True
+            self._send_json(400, {"error": "Invalid Content-Length"})
+            return
+        if length > MAX_BODY_BYTES:
+            self.close_connection = True
+            self._send_json(413, {"error": "Request body too large"})
+            return
+        body = self.rfile.read(length)
+        if self.path not in ("/v1/roi", "/v1/roi/batch"):
+            self._send_json(404, {"error": f"No such endpoint: POST {self.path}"})
+            return
+        try:
+            payload = json.loads(body or b"{}")
+            if self.path == "/v1/roi":
+                response = self.service.single(payload)
+            else:
+                if not isinstance(payload, dict):
+                    raise ValueError('Expected {"scenarios": [...]}')
+                response = self.service.batch(payload.get("scenarios"))
+        except ValueError as exc:  # includes malformed JSON
+            self._send_json(400, {"error": str(exc)})
+            return
+        except Exception as exc:  # an engine failure, raised here from the batcher's future
+            self.log_error("Error evaluating %s: %r", self.path, exc)
+            self._send_json(500, {"error": "Internal error evaluating the scenario"})
+            return
+        self._send(200, response)
+
+    def log_message(self, format, *args):
+        if not self.quiet:
+            super().log_message(format, *args)
+
+
+class ROIServer(ThreadingHTTPServer):
+    daemon_threads = True
+    # The socketserver default backlog of 5 resets connections when many clients connect at once
+    request_queue_size = 256
+
+
+def make_server(host="127.0.0.1", port=DEFAULT_PORT, service=None, quiet=True):
+    """An HTTP server bound to ``host:port`` (port 0 picks a free one); call ``serve_forever()``."""
+    handler = type("Handler", (ROIRequestHandler,), {"service": service or ROIService(), "quiet": quiet})
+    return ROIServer((host, port), handler)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Serve the ROI engine as a local JSON API.")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT)
+    parser.add_argument("--cache-entries", type=int, default=CACHE_ENTRIES)
+    parser.add_argument("--verbose", action="store_true", help="log every request")
+    args = parser.parse_args(argv)
+
+    server = make_server(args.host, args.port, ROIService(args.cache_entries), quiet=not args.verbose)
+    host, port = server.server_address[:2]
+    print(f"Serving the ROI API on http://{host}:{port}", file=sys.stderr)
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
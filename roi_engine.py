@@ -0,0 +1,315 @@
+"""Vectorized ROI engine behind the ConnexUS calculator.
+
+Every sidebar input may be a scalar or a NumPy array; all inputs are
+broadcast together and every output column is computed in one pass.
+The formulas mirror the single-scenario math that used to live inline in
+app.py, operation for operation, so scalar results are bit-for-bit the same.
+"""
+import numpy as np
+
+import staffing
+
+# --- Model Conventions ---
+WEEKS_PER_MONTH = 4.33
+FULLY_LOADED_MULTIPLIER = 1.222431
+WORKING_DAYS_PER_YEAR = 260
+
+# Sidebar inputs and their default values (same defaults as the widgets in app.py).
+# Saved-scenario URLs refer to inputs by position: add new inputs at the end.
+DEFAULT_INPUTS = {
+    "monthly_revenue": 250000,
+    "weekly_interactions": 10000,
+    "aht": 6,
+    "agents": 25,
+    "hourly_cost": 15.0,
+    "hours_per_week": 40,
+    "shift_hours": 8.5,
+    "production_percent": 25.0,
+    "upsell_percent": 10.0,
+    "automation": 50,
+    "subscription": 2000,
+    "integration": 15000,
+    "ai_cost_per_min": 0.18,
+    "use_indirects": True,
+    "use_hr_impact": False,
+    "hr_attrition": 10,
+    "hr_no_show": 5,
+    "hr_pto_days": 5,
+    "hr_new_hire_cost": 2000,
+    "hr_peak_staffing": 10,
+    "hr_peak_frequency": 3,
+    "use_erlang_staffing": False,
+    "service_level_percent": 80,
+    "answer_time_seconds": 20,
+}
+
+INPUT_FIELDS = tuple(DEFAULT_INPUTS)
+TOGGLE_FIELDS = ("use_indirects", "use_hr_impact", "use_erlang_staffing")
+NUMERIC_FIELDS = tuple(f for f in INPUT_FIELDS if f not in TOGGLE_FIELDS)
+
+OUTPUT_FIELDS = (
+    "monthly_minutes",
+    "ai_minutes",
+    "residual_minutes",
+    "ai_cost",
+    "residual_cost",
+    "ai_enabled_cost",
+    "total_ai_monthly_cost",
+    "production_dollar_savings",
+    "upsell_dollar_savings",
+    "indirect_savings",
+    "total_monthly_value",
+    "agent_monthly_hours",
+    "required_agents",
+    "residual_required_agents",
+    "effective_agents",
+    "base_labor_cost",
+    "baseline_human_cost",
+    "net_savings",
+    "value_basis",
+    "roi_percent",
+    "annual_roi_percent",
+    "payback_days",
+    "annual_net_savings",
+    "investment_roi",
+    "investment_payback_months",
+    "dollar_saved_per_ai_dollar",
+    "cost_efficiency_percent",
+    "recruiting_savings",
+    "absentee_cost",
+    "seasonal_savings",
+    "strategic_total",
+)
+
+
+def prepare_inputs(inputs=None, **overrides):
+    """Resolve inputs against the defaults and broadcast them to one shape.
+
+    ``inputs`` may be any mapping of column name to scalar/array (a dict,
+    a pandas DataFrame, a dict of Arrow-backed columns...). Missing fields
+    fall back to ``DEFAULT_INPUTS``; keyword overrides win over both.
+    """
+    columns = {}
+    for name in INPUT_FIELDS:
+        if name in overrides:
+            value = overrides[name]
+        elif inputs is not None and name in inputs:
+            value = inputs[name]
+        else:
+            value = DEFAULT_INPUTS[name]
+        dtype = bool if name in TOGGLE_FIELDS else np.float64
+        columns[name] = np.asarray(value, dtype=dtype)
+
+    shape = np.broadcast_shapes(*(col.shape for col in columns.values()))
+    return {name: np.broadcast_to(col, shape) for name, col in columns.items()}
+
+
+def workload_is_finite(weekly_interactions, aht):
+    """Whether the monthly minutes ``weekly_interactions × aht`` make (elementwise).
+
+    Finite inputs whose product overflows to inf would otherwise run through
+    the engine, and the Erlang C staffing, as an infinite workload.
+    """
+    with np.errstate(over="ignore", invalid="ignore"):
+        return np.isfinite(np.asarray(weekly_interactions, dtype=np.float64) * aht * WEEKS_PER_MONTH)
+
+
+def compute(inputs=None, profile=None, pricing=None, *, volume_weeks=None, staffed_weeks=None, lap=None,
+            **overrides):
+    """Evaluate every ROI output for a batch of scenarios.
+
+    Returns a dict mapping each name in ``OUTPUT_FIELDS`` to a float64 array
+    with the broadcast shape of the inputs (0-d for all-scalar inputs).
+    ``profile`` is the weekly volume profile used by scenarios with
+    ``use_erlang_staffing`` on (default: ``staffing.DEFAULT_PROFILE``).
+    ``pricing`` is a ``pricing.PricingSchedule`` that bills the AI minutes
+    in place of the flat ``ai_cost_per_min``. ``volume_weeks`` (weeks of
+    contacts in the month) and ``staffed_weeks`` (weeks of paid agent time)
+    replace ``WEEKS_PER_MONTH`` for calendar-accurate months; they broadcast
+    with the inputs (see seasonality.py). ``lap``, if given, is called with
+    the name of each calculation step as it finishes.
+    """
+    x = prepare_inputs(inputs, **overrides)
+    if volume_weeks is None and staffed_weeks is None:
+        return _evaluate(x, profile, pricing, lap=lap)
+    weeks = [np.asarray(WEEKS_PER_MONTH if w is None else w, dtype=np.float64) for w in (volume_weeks, staffed_weeks)]
+    shape = np.broadcast_shapes(x["automation"].shape, *(w.shape for w in weeks))
+    x = {name: np.broadcast_to(col, shape) for name, col in x.items()}
+    return _evaluate(x, profile, pricing, *(np.broadcast_to(w, shape) for w in weeks), lap=lap)
+
+
+def compute_scalar(inputs=None, profile=None, pricing=None, lap=None, **overrides):
+    """Single-scenario convenience wrapper returning plain Python floats."""
+    return {name: float(value) for name, value in compute(inputs, profile, pricing, lap=lap, **overrides).items()}
+
+
+def _erlang_staffed_minutes(x, profile):
+    """Erlang C weekly staffed minutes for the human-only and the post-automation load, where the toggle is on."""
+    on = x["use_erlang_staffing"]
+    calls = x["weekly_interactions"][on]
+    residual_calls = calls * (1 - x["automation"][on] / 100)
+    staffed = staffing.weekly_staffed_minutes(
+        np.concatenate([calls, residual_calls]),
+        np.tile(x["aht"][on], 2),
+        np.tile(x["service_level_percent"][on], 2),
+        np.tile(x["answer_time_seconds"][on], 2),
+        profile,
+    )
+
+    required, residual = np.zeros(on.shape), np.zeros(on.shape)
+    required[on], residual[on] = staffed[:calls.size], staffed[calls.size:]
+    return required, residual
+
+
+def _evaluate(x, profile=None, pricing=None, volume_weeks=WEEKS_PER_MONTH, staffed_weeks=WEEKS_PER_MONTH,
+              lap=None):
+    flm = FULLY_LOADED_MULTIPLIER
+    hourly_cost = x["hourly_cost"]
+    use_indirects = x["use_indirects"]
+    use_hr_impact = x["use_hr_impact"]
+    use_erlang = x["use_erlang_staffing"]
+
+    # Called with each numbered step's name as it finishes (app.py passes timings.laps)
+    lap = lap or _no_lap
+    with np.errstate(divide="ignore", invalid="ignore"):
+        # --- 1. Total Monthly Workload ---
+        monthly_minutes = x["weekly_interactions"] * x["aht"] * volume_weeks
+        ai_minutes = (x["automation"] / 100) * monthly_minutes
+        residual_minutes = monthly_minutes - ai_minutes
+
+        # Agents needed: raw workload by default, Erlang C interval staffing when toggled on
+        agent_monthly_hours = x["hours_per_week"] * staffed_weeks
+        minutes_per_agent = agent_monthly_hours * 60
+        required_agents = monthly_minutes / minutes_per_agent
+        residual_required_agents = residual_minutes / minutes_per_agent
+        if use_erlang.any():
+            erlang_minutes, erlang_residual_minutes = _erlang_staffed_minutes(x, profile)
+            required_agents = np.where(use_erlang, erlang_minutes * volume_weeks / minutes_per_agent, required_agents)
+            residual_required_agents = np.where(
+                use_erlang, erlang_residual_minutes * volume_weeks / minutes_per_agent, residual_required_agents
+            )
+        lap("1_workload")
+
+        # --- 2. AI vs Residual Human Cost ---
+        if pricing is None:
+            ai_cost = ai_minutes * x["ai_cost_per_min"]
+        else:
+            ai_cost = pricing.ai_cost(ai_minutes)
+        residual_cost = (residual_minutes / 60) * hourly_cost * flm
+        if use_erlang.any():
+            # Staffed hours, not just handle time, for the residual human queue
+            residual_cost = np.where(
+                use_erlang, residual_required_agents * agent_monthly_hours * hourly_cost * flm, residual_cost
+            )
+        ai_enabled_cost = ai_cost + residual_cost + x["subscription"]
+        total_ai_monthly_cost = ai_cost + x["subscription"]
+        lap("2_ai_vs_human_cost")
+
+        # --- 3. Indirect Value (Production & Upsell) ---
+        production_minutes_saved = monthly_minutes * (x["production_percent"] / 100)
+        production_hours_saved = production_minutes_saved / 60
+        production_dollar_savings = production_hours_saved * hourly_cost * flm
+        upsell_dollar_savings = x["monthly_revenue"] * (x["upsell_percent"] / 100)
+        indirect_savings = production_dollar_savings + upsell_dollar_savings
+
+        # Kept identical to the dashboard: "total monthly value" is the AI-enabled cost
+        total_monthly_value = ai_enabled_cost
+        lap("3_indirect_value")
+
+        # --- 4. Baseline Human Cost Calculation ---
+        effective_agents = np.maximum(x["agents"], required_agents)
+        base_labor_cost = effective_agents * agent_monthly_hours * hourly_cost
+        baseline_human_cost = base_labor_cost * flm
+        lap("4_baseline_cost")
+
+        # --- 5. Net Direct Savings ---
+        net_savings = baseline_human_cost - ai_enabled_cost
+        lap("5_net_savings")
+
+        # --- 6. ROI Value Basis (Direct + Optional Indirect) ---
+        value_basis = np.where(use_indirects, net_savings + indirect_savings, net_savings)
+        lap("6_value_basis")
+
+        # --- 7. ROI & Payback on Operating Cost ---
+        integration = x["integration"]
+        roi_percent = np.where(ai_enabled_cost > 0, (value_basis / ai_enabled_cost) * 100, 0.0)
+        annual_roi_percent = roi_percent * 12
+        payback_days = np.where(value_basis > 0, (integration / value_basis) * 30, np.inf)
+        lap("7_operating_roi")
+
+        # --- 8. ROI vs Investment (Integration) ---
+        annual_net_savings = total_monthly_value * 12
+        investment_roi = np.where(
+            integration > 0, ((annual_net_savings - integration) / integration) * 100, 0.0
+        )
+        investment_payback_months = np.where(
+            annual_net_savings > 0, (integration / annual_net_savings) * 12, np.inf
+        )
+        dollar_saved_per_ai_dollar = np.where(
+            total_ai_monthly_cost > 0, value_basis / total_ai_monthly_cost, 0.0
+        )
+        cost_efficiency_percent = net_savings / baseline_human_cost * 100
+        lap("8_investment_roi")
+
+        # --- Strategic HR Impact (only when use_hr_impact is on) ---
+        total_annual_attrition = x["hr_attrition"] / 100 * effective_agents * 12
+        absence_rate = (x["hr_no_show"] / 100) + (x["hr_pto_days"] / WORKING_DAYS_PER_YEAR)
+        recruiting_savings = total_annual_attrition * x["hr_new_hire_cost"]
+        seasonal_hours = (
+            (x["hr_peak_staffing"] / 100) * required_agents * x["shift_hours"] * x["hr_peak_frequency"]
+        )
+        seasonal_savings = seasonal_hours * hourly_cost * flm
+        absentee_cost = absence_rate * base_labor_cost
+        strategic_total = recruiting_savings + absentee_cost + seasonal_savings
+
+        recruiting_savings = np.where(use_hr_impact, recruiting_savings, 0.0)
+        absentee_cost = np.where(use_hr_impact, absentee_cost, 0.0)
+        seasonal_savings = np.where(use_hr_impact, seasonal_savings, 0.0)
+        strategic_total = np.where(use_hr_impact, strategic_total, 0.0)
+        lap("hr_impact")
+
+    outputs = {
+        "monthly_minutes": monthly_minutes,
+        "ai_minutes": ai_minutes,
+        "residual_minutes": residual_minutes,
+        "ai_cost": ai_cost,
+        "residual_cost": residual_cost,
+        "ai_enabled_cost": ai_enabled_cost,
+        "total_ai_monthly_cost": total_ai_monthly_cost,
+        "production_dollar_savings": production_dollar_savings,
+        "upsell_dollar_savings": upsell_dollar_savings,
+        "indirect_savings": indirect_savings,
+        "total_monthly_value": total_monthly_value,
+        "agent_monthly_hours": agent_monthly_hours,
+        "required_agents": required_agents,
+        "residual_required_agents": residual_required_agents,
+        "effective_agents": effective_agents,
+        "base_labor_cost": base_labor_cost,
+        "baseline_human_cost": baseline_human_cost,
+        "net_savings": net_savings,
+        "value_basis": value_basis,
+        "roi_percent": roi_percent,
+        "annual_roi_percent": annual_roi_percent,
+        "payback_days": payback_days,
+        "annual_net_savings": annual_net_savings,
+        "investment_roi": investment_roi,
+        "investment_payback_months": investment_payback_months,
+        "dollar_saved_per_ai_dollar": dollar_saved_per_ai_dollar,
+        "cost_efficiency_percent": cost_efficiency_percent,
+        "recruiting_savings": recruiting_savings,
+        "absentee_cost": absentee_cost,
+        "seasonal_savings": seasonal_savings,
+        "strategic_total": strategic_total,
+    }
+    return {name: _as_output(value) for name, value in outputs.items()}
+
+
+def _no_lap(name):
+    pass
+
+
+def _as_output(value):
+    # Forward-mode duals (elasticity.py) carry their derivatives out as they are
+    if hasattr(value, "grad"):
+        return value
+    return np.asarray(value, dtype=np.float64)
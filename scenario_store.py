@@ -0,0 +1,313 @@
+"""Saved scenarios: an embedded SQLite store plus compact URL encoding.
+
+A scenario is every sidebar input plus the computed outputs, stored with
+the client name and a timestamp. The headline outputs are also kept as
+indexed columns so paged listings and filters such as "payback under 60
+days" stay fast with hundreds of thousands of rows (keyset pagination,
+never OFFSET).
+
+Results are cached by a hash of the inputs (and the volume profile, when
+Erlang C staffing uses one, any pricing schedule and ``RESULTS_VERSION``):
+in-process first, then in the ``results`` table, so reopening a saved
+scenario doesn't run the engine again. All threads share one SQLite
+connection per database file.
+
+The current inputs round-trip through a short URL query parameter (only
+the fields that differ from the defaults, deflated and base64url-encoded),
+so a page reload restores them.
+"""
+import base64
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+import zlib
+from collections import OrderedDict
+from contextlib import contextmanager
+
+import numpy as np
+
+import roi_engine
+
+APP_DIR = os.path.dirname(os.path.abspath(__file__))
+DB_PATH = os.environ.get("SCENARIO_DB", os.path.join(APP_DIR, "data", "scenarios.sqlite3"))
+
+METRIC_COLUMNS = ("net_savings", "roi_percent", "payback_days", "investment_roi", "investment_payback_months")
+SORT_COLUMNS = ("created_at", "client") + METRIC_COLUMNS
+FILTER_OPERATORS = ("<", "<=", ">", ">=", "=")
+DEFAULT_PAGE_SIZE = 50
+RESULTS_CACHE_ENTRIES = 1024
+# Part of every results key: bump it when the engine's outputs change so stale cached results are never served
+RESULTS_VERSION = 1
+
+_HR_FIELDS = tuple(name for name in roi_engine.INPUT_FIELDS if name.startswith("hr_"))
+
+_SCHEMA = f"""
+CREATE TABLE IF NOT EXISTS scenarios (
+    id INTEGER PRIMARY KEY,
+    client TEXT NOT NULL DEFAULT '' COLLATE NOCASE,
+    name TEXT NOT NULL DEFAULT '',
+    created_at REAL NOT NULL,
+    inputs_key TEXT NOT NULL,
+    inputs TEXT NOT NULL,
+    volume_profile TEXT,
+    {", ".join(f"{column} REAL" for column in METRIC_COLUMNS)}
+);
+CREATE TABLE IF NOT EXISTS results (
+    inputs_key TEXT PRIMARY KEY,
+    outputs TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS scenarios_created ON scenarios (created_at, id);
+CREATE INDEX IF NOT EXISTS scenarios_client ON scenarios (client, created_at, id);
+{"".join(f"CREATE INDEX IF NOT EXISTS scenarios_{column} ON scenarios ({column}, id);" for column in METRIC_COLUMNS)}
+"""
+
+_lock = threading.Lock()
+_results = OrderedDict()  # inputs key -> outputs
+_connections = {}  # path -> (connection, lock serializing its use)
+
+
+def connect(path=None):
+    """The process-wide connection to the store and its lock (created with the schema on first use).
+
+    Every thread (each Streamlit session runs its own) shares the one
+    connection; hold the lock while using it, or use ``_store``.
+    """
+    path = path or DB_PATH
+    with _lock:
+        entry = _connections.get(path)
+        if entry is None:
+            os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+            conn = sqlite3.connect(path, timeout=30, check_same_thread=False)
+            conn.row_factory = sqlite3.Row
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.executescript(_SCHEMA)
+            # Re-entrant: save_many looks up cached results inside its transaction
+            entry = _connections[path] = (conn, threading.RLock())
+    return entry
+
+
+@contextmanager
+def _store(path=None):
+    conn, lock = connect(path)
+    with lock:
+        yield conn
+
+
+# --- Inputs ---
+
+def _plain(value):
+    if isinstance(value, (bool, np.bool_)):
+        return bool(value)
+    value = float(value)
+    return int(value) if value.is_integer() else value
+
+
+def canonical_inputs(inputs):
+    """Every engine input as a plain bool/int/float, defaults filled in."""
+    return {name: _plain(inputs.get(name, default)) for name, default in roi_engine.DEFAULT_INPUTS.items()}
+
+
+def changed_inputs(inputs):
+    """Only the inputs that differ from ``roi_engine.DEFAULT_INPUTS`` and affect the results."""
+    canonical = canonical_inputs(inputs)
+    # The engine ignores the HR assumptions while the HR toggle is off
+    ignored = () if canonical["use_hr_impact"] else _HR_FIELDS
+    return {
+        name: value for name, value in canonical.items()
+        if value != roi_engine.DEFAULT_INPUTS[name] and name not in ignored
+    }
+
+
+def _dumps(value):
+    return json.dumps(value, separators=(",", ":"))
+
+
+def inputs_key(inputs, profile=None, pricing=None):
+    """Stable hash of the inputs, the volume profile when Erlang C staffing uses it, and any pricing schedule."""
+    changed = changed_inputs(inputs)
+    payload = _dumps([RESULTS_VERSION, changed])
+    if profile is not None and changed.get("use_erlang_staffing"):
+        payload += hashlib.sha256(np.ascontiguousarray(profile, dtype=np.float64).tobytes()).hexdigest()
+    if pricing is not None:
+        payload += pricing.key()
+    return hashlib.sha256(payload.encode()).hexdigest()[:32]
+
+
+def encode_inputs(inputs):
+    """Compact URL-safe token for the inputs that differ from the defaults ('' when none do)."""
+    changed = {str(roi_engine.INPUT_FIELDS.index(name)): value for name, value in changed_inputs(inputs).items()}
+    if not changed:
+        return ""
+    raw = zlib.compress(_dumps(changed).encode(), 9)
+    return base64.urlsafe_b64encode(raw).rstrip(b"=").decode()
+
+
+def decode_inputs(token):
+    """Inverse of ``encode_inputs``: the changed inputs, or {} for an unreadable token."""
+    try:
+        raw = zlib.decompress(base64.urlsafe_b64decode(token + "=" * (-len(token) % 4)))
+        changed = json.loads(raw)
+    except (ValueError, zlib.error):
+        return {}
+    if not isinstance(changed, dict):
+        return {}
+    inputs = {}
+    for index, value in changed.items():
+        if not index.isdigit() or int(index) >= len(roi_engine.INPUT_FIELDS):
+            continue
+        name = roi_engine.INPUT_FIELDS[int(index)]
+        if name in roi_engine.TOGGLE_FIELDS:
+            inputs[name] = bool(value)
+        elif isinstance(value, (int, float)) and not isinstance(value, bool) and np.isfinite(value):
+            inputs[name] = value
+    return inputs
+
+
+# --- Results Cache ---
+
+def _remember(key, outputs):
+    with _lock:
+        _results[key] = outputs
+        _results.move_to_end(key)
+        while len(_results) > RESULTS_CACHE_ENTRIES:
+            _results.popitem(last=False)
+
+
+def cached_outputs():
+    """Snapshot of the in-process results cache (for memory accounting)."""
+    with _lock:
+        return list(_results.values())
+
+
+def cached_results(inputs, profile=None, path=None, pricing=None, lap=None):
+    """``roi_engine.compute_scalar`` outputs, from cache when these inputs were seen before.
+
+    ``lap`` is passed to the engine when it runs.
+    """
+    key = inputs_key(inputs, profile, pricing)
+    with _lock:
+        outputs = _results.get(key)
+        if outputs is not None:
+            _results.move_to_end(key)
+            return outputs
+    with _store(path) as conn:
+        row = conn.execute("SELECT outputs FROM results WHERE inputs_key = ?", (key,)).fetchone()
+    if row is not None:
+        outputs = json.loads(row["outputs"])
+    else:
+        outputs = roi_engine.compute_scalar(inputs, profile, pricing, lap=lap)
+    _remember(key, outputs)
+    return outputs
+
+
+# --- Scenarios ---
+
+def save(inputs, outputs=None, client="", name="", profile=None, path=None):
+    """Store a scenario; returns its id."""
+    return save_many([(inputs, outputs, client, name, profile)], path)[0]
+
+
+def save_many(scenarios, path=None):
+    """Store ``(inputs, outputs, client, name, profile)`` tuples in one transaction; returns their ids."""
+    ids = []
+    now = time.time()
+    with _store(path) as conn, conn:
+        for inputs, outputs, client, name, profile in scenarios:
+            key = inputs_key(inputs, profile)
+            if outputs is None:
+                outputs = cached_results(inputs, profile, path)
+            conn.execute("INSERT OR IGNORE INTO results (inputs_key, outputs) VALUES (?, ?)", (key, _dumps(outputs)))
+            profile_json = None if profile is None else _dumps(np.asarray(profile).tolist())
+            cursor = conn.execute(
+                f"INSERT INTO scenarios (client, name, created_at, inputs_key, inputs, volume_profile, "
+                f"{', '.join(METRIC_COLUMNS)}) VALUES (?, ?, ?, ?, ?, ?{', ?' * len(METRIC_COLUMNS)})",
+                (client.strip(), name.strip(), now, key, _dumps(changed_inputs(inputs)), profile_json,
+                 *(float(outputs[column]) for column in METRIC_COLUMNS)),
+            )
+            ids.append(cursor.lastrowid)
+    return ids
+
+
+def get(scenario_id, path=None):
+    """A saved scenario with all its ``inputs``, ``outputs`` and ``volume_profile`` (None if missing)."""
+    with _store(path) as conn:
+        row = conn.execute(
+            "SELECT s.*, r.outputs FROM scenarios s LEFT JOIN results r ON r.inputs_key = s.inputs_key WHERE s.id = ?",
+            (scenario_id,),
+        ).fetchone()
+    if row is None:
+        return None
+    scenario = dict(row)
+    scenario["inputs"] = canonical_inputs(json.loads(scenario["inputs"]))
+    scenario["outputs"] = json.loads(scenario["outputs"]) if scenario["outputs"] else None
+    if scenario["volume_profile"] is not None:
+        scenario["volume_profile"] = np.asarray(json.loads(scenario["volume_profile"]))
+    # Outputs saved under an older RESULTS_VERSION are returned as saved, but never cached
+    # as the current engine's results for these inputs
+    if scenario["outputs"] is not None and scenario["inputs_key"] == inputs_key(
+        scenario["inputs"], scenario["volume_profile"]
+    ):
+        _remember(scenario["inputs_key"], scenario["outputs"])
+    return scenario
+
+
+def delete(scenario_id, path=None):
+    with _store(path) as conn, conn:
+        conn.execute("DELETE FROM scenarios WHERE id = ?", (scenario_id,))
+
+
+def _where(client, filters):
+    clauses, params = [], []
+    if client:
+        clauses.append("client = ?")
+        params.append(client.strip())
+    for column, op, value in filters:
+        if column not in METRIC_COLUMNS + ("created_at",) or op not in FILTER_OPERATORS:
+            raise ValueError(f"Unsupported filter: {column} {op} {value}")
+        clauses.append(f"{column} {op} ?")
+        params.append(float(value))
+    return clauses, params
+
+
+def count(client=None, filters=(), path=None):
+    clauses, params = _where(client, filters)
+    where = f"WHERE {' AND '.join(clauses)}" if clauses else ""
+    with _store(path) as conn:
+        return conn.execute(f"SELECT COUNT(*) FROM scenarios {where}", params).fetchone()[0]
+
+
+def list_page(client=None, filters=(), order_by="created_at", descending=True, limit=DEFAULT_PAGE_SIZE,
+              cursor=None, path=None):
+    """One page of scenario summaries (no input/output blobs) and the cursor of the next page.
+
+    ``filters`` are ``(column, op, value)`` triples on ``created_at`` or a
+    metric column, e.g. ``[("payback_days", "<", 60)]``. ``cursor`` is the
+    value returned with the previous page (None for the first page); the
+    next cursor is None on the last page.
+    """
+    if order_by not in SORT_COLUMNS:
+        raise ValueError(f"Can't sort by {order_by!r}; expected one of {', '.join(SORT_COLUMNS)}")
+    clauses, params = _where(client, filters)
+    comparison = "<" if descending else ">"
+    if cursor is not None:
+        sort_value, last_id = cursor
+        clauses.append(f"({order_by}, id) {comparison} (?, ?)")
+        params.extend([sort_value, last_id])
+    where = f"WHERE {' AND '.join(clauses)}" if clauses else ""
+    direction = "DESC" if descending else "ASC"
+    with _store(path) as conn:
+        rows = conn.execute(
+            f"SELECT id, client, name, created_at, {', '.join(METRIC_COLUMNS)} FROM scenarios {where} "
+            f"ORDER BY {order_by} {direction}, id {direction} LIMIT ?",
+            [*params, limit + 1],
+        ).fetchall()
+    rows = [dict(row) for row in rows]
+    next_cursor = None
+    if len(rows) > limit:
+        rows = rows[:limit]
+        next_cursor = (rows[-1][order_by], rows[-1]["id"])
+    return rows, next_cursor
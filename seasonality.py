@@ -0,0 +1,184 @@
+"""Calendar-accurate month-by-month model with seasonality profiles.
+
+The engine prices an average month: every monthly figure uses
+WEEKS_PER_MONTH = 4.33, and hr_peak_staffing/hr_peak_frequency stands in
+for seasonal peaks. This model lays each scenario out over real calendar
+months instead:
+
+- a month's contacts arrive over its calendar days (days / 7 weeks of the
+  weekly volume) and agents are paid for its working days (Monday to
+  Friday less any holidays, / 5 weeks of hours_per_week);
+- weekly_interactions, aht and agents are scaled per calendar month by
+  seasonality profiles (12 multipliers, January first, normalized to
+  average 1 so the year averages out to the sidebar inputs): a named
+  profile, or the volume observed in a call log (``observed_profile``).
+  Peak months staff up through max(agents, required_agents) exactly as
+  the engine does.
+
+Every (scenario, month) cell is evaluated by roi_engine in one broadcast
+pass, so a 12-month view of one scenario costs about what the scalar path
+does. Flow outputs (minutes, costs, savings) are summed per contract year
+and ROI is recomputed from those sums; payback is counted in calendar
+days. The strategic HR outputs are already annual estimates and are only
+reported per month.
+"""
+import numpy as np
+
+import roi_engine
+
+MAX_MONTHS = 120
+
+# Name -> (label, volume multipliers January..December)
+SEASONALITY_PROFILES = {
+    "flat": ("Flat", (1.0,) * 12),
+    "retail_holiday": ("Retail Holiday Peak", (1.05, 0.85, 0.9, 0.9, 0.95, 0.95, 0.95, 1.0, 0.95, 1.0, 1.3, 1.6)),
+    "tax_season": ("Tax Season", (1.2, 1.5, 1.7, 1.6, 0.8, 0.7, 0.7, 0.7, 0.8, 0.8, 0.7, 0.8)),
+    "summer_travel": ("Summer Travel", (0.85, 0.85, 1.0, 1.0, 1.1, 1.3, 1.35, 1.3, 0.95, 0.85, 0.75, 0.7)),
+    "open_enrollment": ("Benefits Open Enrollment", (1.4, 1.0, 0.9, 0.85, 0.85, 0.85, 0.85, 0.85, 0.9, 1.1, 1.4, 1.35)),
+    "utilities": ("Utilities (Weather Peaks)", (1.25, 1.15, 1.0, 0.85, 0.85, 1.0, 1.15, 1.15, 0.9, 0.85, 0.9, 1.1)),
+}
+
+# Outputs that add up over months; the rest are rates, ratios or headcounts
+SUMMED_FIELDS = (
+    "monthly_minutes",
+    "ai_minutes",
+    "residual_minutes",
+    "ai_cost",
+    "residual_cost",
+    "ai_enabled_cost",
+    "total_ai_monthly_cost",
+    "production_dollar_savings",
+    "upsell_dollar_savings",
+    "indirect_savings",
+    "base_labor_cost",
+    "baseline_human_cost",
+    "net_savings",
+    "value_basis",
+)
+
+# Rows per engine pass: bounds the (rows x months x outputs) temporaries
+_CHUNK_ROWS = 2048
+
+
+def calendar(start, months=12, holidays=()):
+    """Days, working days and week counts of ``months`` calendar months from ``start``.
+
+    ``start`` is anything ``np.datetime64`` reads as a month ("2026-01",
+    a date...). ``holidays`` are dates nobody is scheduled.
+    """
+    month = np.datetime64(start, "M") + np.arange(months)
+    first_day = month.astype("datetime64[D]")
+    next_first_day = (month + 1).astype("datetime64[D]")
+    days = (next_first_day - first_day).astype(np.float64)
+    working_days = np.busday_count(first_day, next_first_day, holidays=list(holidays)).astype(np.float64)
+    return {
+        "month": month,
+        "days": days,
+        "working_days": working_days,
+        "volume_weeks": days / 7,
+        "staffed_weeks": working_days / 5,
+    }
+
+
+def multipliers(profile, month):
+    """Per-month multipliers for ``month`` (datetime64[M]) from a profile name or 12 values."""
+    if isinstance(profile, str):
+        if profile not in SEASONALITY_PROFILES:
+            raise ValueError(f"Unknown seasonality profile: {profile!r}")
+        profile = SEASONALITY_PROFILES[profile][1]
+    values = np.asarray(profile, dtype=np.float64)
+    if values.shape != (12,) or not np.isfinite(values).all() or (values < 0).any() or values.sum() <= 0:
+        raise ValueError("A seasonality profile needs 12 non-negative multipliers, January first")
+    # datetime64[M] counts months from 1970-01, so this is 0 for January
+    return (values / values.mean())[month.astype(np.int64) % 12]
+
+
+def observed_profile(index):
+    """12 volume multipliers from a per-month index with gaps, or None if no month has data.
+
+    ``index`` is January first with None for months without data, as in a
+    call log summary's ``seasonal_index`` (call_logs.py); those months get
+    the average of the observed ones.
+    """
+    observed = [value for value in index if value is not None]
+    if len(index) != 12 or not observed or sum(observed) <= 0:
+        return None
+    fill = sum(observed) / len(observed)
+    return tuple(fill if value is None else float(value) for value in index)
+
+
+def _payback_days(value, days, investment):
+    """Calendar days until cumulative ``value`` covers ``investment``, per row.
+
+    Value accrues evenly over a month's days; beyond the horizon the
+    average daily value is extrapolated (inf when it isn't positive).
+    """
+    cumulative = np.cumsum(value, axis=1)
+    elapsed = np.cumsum(days)
+    reached = cumulative >= investment[:, np.newaxis]
+    month = np.argmax(reached, axis=1)
+    rows = np.arange(value.shape[0])
+    before = np.where(month > 0, cumulative[rows, month - 1], 0.0)
+    days_before = np.where(month > 0, elapsed[month - 1], 0.0)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        in_month = np.where(value[rows, month] > 0, (investment - before) / value[rows, month] * days[month], 0.0)
+        daily = cumulative[:, -1] / elapsed[-1]
+        beyond = np.where(daily > 0, elapsed[-1] + (investment - cumulative[:, -1]) / daily, np.inf)
+    payback = np.where(reached.any(axis=1), days_before + in_month, beyond)
+    return np.where(investment <= 0, 0.0, payback)
+
+
+def monthly(inputs=None, start="2026-01", months=12, volume="flat", aht="flat", staffing="flat", holidays=(),
+            profile=None, pricing=None):
+    """Month-by-month outputs and contract-year totals for one or many scenarios.
+
+    ``inputs`` is the same mapping ``roi_engine.compute`` accepts (``profile``
+    and ``pricing`` are passed through to it); scenarios are flattened to
+    rows. ``volume``, ``aht`` and ``staffing`` are seasonality profiles
+    (names in ``SEASONALITY_PROFILES`` or 12 multipliers) for
+    weekly_interactions, aht and agents. Returns a dict with the per-month
+    ``month`` (datetime64[M]), ``days`` and ``working_days`` (months,),
+    ``monthly`` {output: (rows, months)}, ``annual`` {summed output,
+    ``roi_percent`` and ``cost_efficiency_percent``: (rows, years)} and
+    ``payback_days`` (rows,).
+    """
+    if not 1 <= months <= MAX_MONTHS:
+        raise ValueError(f"months must be between 1 and {MAX_MONTHS}")
+
+    cal = calendar(start, months, holidays)
+    seasonal = {
+        "weekly_interactions": multipliers(volume, cal["month"]),
+        "aht": multipliers(aht, cal["month"]),
+        "agents": multipliers(staffing, cal["month"]),
+    }
+
+    x = roi_engine.prepare_inputs(inputs)
+    rows = x["automation"].size
+    x = {name: values.reshape(rows) for name, values in x.items()}
+
+    per_month = {name: np.empty((rows, months)) for name in roi_engine.OUTPUT_FIELDS}
+    for first in range(0, rows, _CHUNK_ROWS):
+        chunk = {name: values[first:first + _CHUNK_ROWS, np.newaxis] for name, values in x.items()}
+        for name, scale in seasonal.items():
+            chunk[name] = chunk[name] * scale
+        results = roi_engine.compute(chunk, profile, pricing, volume_weeks=cal["volume_weeks"],
+                                     staffed_weeks=cal["staffed_weeks"])
+        for name, values in results.items():
+            per_month[name][first:first + _CHUNK_ROWS] = values
+
+    year_starts = np.arange(0, months, 12)
+    annual = {name: np.add.reduceat(per_month[name], year_starts, axis=1) for name in SUMMED_FIELDS}
+    with np.errstate(divide="ignore", invalid="ignore"):
+        annual["roi_percent"] = np.where(
+            annual["ai_enabled_cost"] > 0, annual["value_basis"] / annual["ai_enabled_cost"] * 100, 0.0
+        )
+        annual["cost_efficiency_percent"] = annual["net_savings"] / annual["baseline_human_cost"] * 100
+
+    return {
+        "month": cal["month"],
+        "days": cal["days"],
+        "working_days": cal["working_days"],
+        "monthly": per_month,
+        "annual": annual,
+        "payback_days": _payback_days(per_month["value_basis"], cal["days"], x["integration"]),
+    }
@@ -0,0 +1,86 @@
+"""Two-way sensitivity grids and tornado swings on top of the ROI engine.
+
+Both are evaluated as a single batched ``roi_engine.compute`` call: a grid
+broadcasts an (n, 1) column of y values against a (1, n) row of x values,
+and the tornado stacks every low/high scenario into one array.
+"""
+import numpy as np
+
+import roi_engine
+
+GRID_METRICS = ("net_savings", "roi_percent", "payback_days")
+
+# Sweepable inputs: label shown in the sidebar and the range the sweep covers
+SWEEP_FIELDS = {
+    "monthly_revenue": ("Monthly Revenue ($)", 0, 1_000_000),
+    "weekly_interactions": ("Weekly Interactions", 1_000, 50_000),
+    "aht": ("Average Handle Time (minutes)", 1, 20),
+    "agents": ("Agents (FTE)", 1, 100),
+    "hourly_cost": ("Agent Hourly Cost ($)", 10.0, 60.0),
+    "hours_per_week": ("Weekly Hours per Agent", 35, 45),
+    "production_percent": ("Production Improvement (%)", 0.0, 50.0),
+    "upsell_percent": ("Upsell Improvement (%)", 0.0, 30.0),
+    "automation": ("AI Automation % Target", 0, 100),
+    "subscription": ("AI Monthly Subscription ($)", 0, 10_000),
+    "integration": ("One-time Integration Fee ($)", 0, 100_000),
+    "ai_cost_per_min": ("AI Cost per Minute ($)", 0.01, 1.0),
+}
+
+# None of the grid metrics depend on the strategic HR inputs
+_HR_FIELDS = tuple(f for f in roi_engine.INPUT_FIELDS if f.startswith("hr_"))
+
+
+def fixed_inputs(inputs, *swept_fields):
+    """The inputs a sweep actually depends on, as a hashable memoization key."""
+    skip = set(swept_fields) | set(_HR_FIELDS) | {"use_hr_impact"}
+    return tuple(sorted((name, value) for name, value in inputs.items() if name not in skip))
+
+
+def grid(inputs, x_field, y_field, size=200, x_range=None, y_range=None, metrics=GRID_METRICS, profile=None,
+         pricing=None):
+    """Evaluate ``metrics`` over a ``size`` x ``size`` grid of two inputs.
+
+    Returns ``(x_values, y_values, {metric: array of shape (size, size)})``
+    where rows follow ``y_values`` and columns follow ``x_values``.
+    """
+    x_low, x_high = x_range or SWEEP_FIELDS[x_field][1:]
+    y_low, y_high = y_range or SWEEP_FIELDS[y_field][1:]
+    x_values = np.linspace(x_low, x_high, size)
+    y_values = np.linspace(y_low, y_high, size)
+    results = roi_engine.compute(
+        dict(inputs), profile, pricing, **{x_field: x_values[np.newaxis, :], y_field: y_values[:, np.newaxis]}
+    )
+    shape = (size, size)
+    return x_values, y_values, {m: np.broadcast_to(results[m], shape) for m in metrics}
+
+
+def tornado(inputs, fields=None, swing=0.2, metric="net_savings", profile=None, pricing=None):
+    """Swing each input down/up by ``swing`` (clamped to its sweep range).
+
+    Returns ``(base_value, rows)`` with one ``(field, low_value, high_value,
+    low_input, high_input)`` row per field, sorted by widest swing first.
+    Fields that don't move ``metric`` at all are left out: net_savings, for
+    one, doesn't depend on revenue, the production/upsell uplifts or the
+    integration fee, and with a ``pricing`` schedule the flat
+    ``ai_cost_per_min`` has no effect on anything.
+    """
+    fields = list(fields or (f for f in SWEEP_FIELDS if pricing is None or f != "ai_cost_per_min"))
+    point = {name: float(inputs.get(name, roi_engine.DEFAULT_INPUTS[name])) for name in fields}
+
+    # Rows 2i / 2i+1 swing field i down / up; the last row is the base case
+    overrides = {name: np.full(2 * len(fields) + 1, point[name]) for name in fields}
+    for i, field in enumerate(fields):
+        _, lower, upper = SWEEP_FIELDS[field]
+        overrides[field][2 * i] = min(max(point[field] * (1 - swing), lower), upper)
+        overrides[field][2 * i + 1] = min(max(point[field] * (1 + swing), lower), upper)
+
+    results = roi_engine.compute(dict(inputs), profile, pricing, **overrides)[metric]
+    base = float(results[-1])
+    rows = [
+        (field, float(results[2 * i]), float(results[2 * i + 1]),
+         float(overrides[field][2 * i]), float(overrides[field][2 * i + 1]))
+        for i, field in enumerate(fields)
+        if not results[2 * i] == results[2 * i + 1] == base
+    ]
+    rows.sort(key=lambda row: abs(row[2] - row[1]), reverse=True)
+    return base, rows
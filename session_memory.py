@@ -0,0 +1,262 @@
+"""Per-session memory accounting and idle-session eviction for the shared server.
+
+One Streamlit process serves every rep. Streamlit already drops
+disconnected sessions after ``server.disconnectedSessionTTL``, but a tab
+left open keeps its session (and its session state) alive indefinitely.
+A background janitor thread wakes every ``SWEEP_INTERVAL_SECONDS`` and:
+
+- measures every session's session state, plus the memory shared by all
+  sessions (the figure cache, see figure_cache.py; the ``st.cache_data``
+  caches such as the sensitivity grids; scenario_store's results cache and
+  call_logs' summaries) and the process RSS;
+- closes sessions idle for longer than ``IDLE_TIMEOUT_SECONDS``;
+- while the accounted total is over ``MEMORY_CAP_BYTES``, first trims the
+  figure cache (it rebuilds on demand) to the room the sessions leave,
+  then closes the longest-idle sessions that have been idle for at least
+  ``MIN_IDLE_SECONDS`` (a rep mid-interaction is never evicted), but only
+  if closing them can actually bring the total under the cap.
+
+Listing and closing sessions goes through private Runtime attributes
+(``_session_mgr``, ``_get_async_objs``), as Streamlit has no public API for
+either. That is only done on the Streamlit versions in
+``RUNTIME_HOOK_VERSIONS``; on others the janitor still reports and trims
+the shared caches but never evicts a session.
+
+An evicted browser tab reconnects to a fresh session; its inputs come
+back from the URL (scenario_store.encode_inputs). app.py calls ``touch()``
+on every script and fragment run to mark the session active. Set
+``CONNEXUS_MEMORY_REPORT`` to a file path to get the latest sweep as JSON
+(benchmarks/session_load.py reads it).
+"""
+import functools
+import json
+import logging
+import os
+import sys
+import threading
+import time
+
+import scenario_store
+import timings
+from figure_cache import FIGURES
+
+IDLE_TIMEOUT_SECONDS = float(os.environ.get("CONNEXUS_SESSION_IDLE_SECONDS", 30 * 60))
+MEMORY_CAP_BYTES = int(float(os.environ.get("CONNEXUS_SESSION_MEMORY_MB", 512)) * 2**20)
+MIN_IDLE_SECONDS = 60.0
+SWEEP_INTERVAL_SECONDS = float(os.environ.get("CONNEXUS_SESSION_SWEEP_SECONDS", 30))
+REPORT_PATH = os.environ.get("CONNEXUS_MEMORY_REPORT")
+# [first, last] Streamlit (major, minor) whose private Runtime session APIs are used
+RUNTIME_HOOK_VERSIONS = ((1, 65), (1, 65))
+
+LOGGER = logging.getLogger("connexus.sessions")
+
+_lock = threading.Lock()
+_last_active = {}  # session id -> time.monotonic() of its latest run
+_janitor = None
+evicted_total = 0
+
+
+def touch(session_id=None):
+    """Mark the current (or given) session active and make sure the janitor is running."""
+    if session_id is None:
+        from streamlit.runtime.scriptrunner import get_script_run_ctx
+
+        ctx = get_script_run_ctx()
+        if ctx is None:
+            return
+        session_id = ctx.session_id
+    with _lock:
+        _last_active[session_id] = time.monotonic()
+    if _janitor is None:
+        _start_janitor()
+
+
+def choose_evictions(sessions, now, idle_timeout=IDLE_TIMEOUT_SECONDS, cap_bytes=MEMORY_CAP_BYTES,
+                     shared_bytes=0, min_idle=MIN_IDLE_SECONDS):
+    """Session ids to close, given ``(session_id, last_active, bytes)`` tuples.
+
+    Idle-timeout evictions first, then longest-idle sessions until the
+    accounted total (``shared_bytes`` included) fits under the cap. When
+    even closing every session idle for ``min_idle`` wouldn't fit, none
+    of them is closed for the cap: that would log reps out for nothing.
+    """
+    by_idle = sorted(sessions, key=lambda session: session[1])
+    evict = [sid for sid, last_active, _ in by_idle if now - last_active > idle_timeout]
+    kept = [session for session in by_idle if session[0] not in evict]
+    total = shared_bytes + sum(size for _, _, size in kept)
+    evictable = [session for session in kept if now - session[1] >= min_idle]
+    if total <= cap_bytes or total - sum(size for _, _, size in evictable) > cap_bytes:
+        return evict
+    for sid, _, size in evictable:
+        if total <= cap_bytes:
+            break
+        evict.append(sid)
+        total -= size
+    return evict
+
+
+def _rss_bytes():
+    try:
+        with open("/proc/self/status") as f:
+            for line in f:
+                if line.startswith("VmRSS:"):
+                    return int(line.split()[1]) * 1024
+    except OSError:
+        pass
+    return None
+
+
+@functools.cache
+def _can_manage_sessions():
+    version = timings.streamlit_version()
+    first, last = RUNTIME_HOOK_VERSIONS
+    if version is not None and first <= version <= last:
+        return True
+    LOGGER.warning("Streamlit %s isn't in RUNTIME_HOOK_VERSIONS: sessions won't be measured or evicted", version)
+    return False
+
+
+def _session_infos(runtime):
+    if not _can_manage_sessions():
+        return []
+    # SessionManager has no public accessor on Runtime; list_sessions() copies its dict
+    return runtime._session_mgr.list_sessions()
+
+
+def _shared_cache_bytes():
+    """Bytes held by each process-wide cache, whichever session filled it."""
+    from streamlit.runtime.caching import get_data_cache_stats_provider
+    from streamlit.runtime.stats import safe_sizeof
+
+    data_cache_stats = get_data_cache_stats_provider().get_stats()
+    # call_logs is only imported once a rep uploads a call log
+    call_logs = sys.modules.get("call_logs")
+    return {
+        "figure_cache_bytes": safe_sizeof(FIGURES.specs()),
+        "data_cache_bytes": sum(stat.byte_length for stats in data_cache_stats.values() for stat in stats),
+        "results_cache_bytes": safe_sizeof(scenario_store.cached_outputs()),
+        "call_log_cache_bytes": safe_sizeof(call_logs.cached_summaries()) if call_logs is not None else 0,
+    }
+
+
+def account(runtime):
+    """Memory report for every session on the server, plus the shared caches."""
+    from streamlit.runtime.stats import safe_sizeof
+
+    now = time.monotonic()
+    with _lock:
+        last_active = dict(_last_active)
+    sessions = []
+    for info in _session_infos(runtime):
+        session = info.session
+        try:
+            # Deep size; SessionState.get_stats() only counts keys unless expensive stats are on
+            state_bytes = safe_sizeof(session.session_state)
+        except RuntimeError:
+            # The session's script mutated its state mid-walk; count it next sweep
+            state_bytes = 0
+        sessions.append({
+            "session_id": session.id,
+            "connected": info.client is not None,
+            "script_runs": info.script_run_count,
+            "idle_seconds": now - last_active.get(session.id, now),
+            "session_state_bytes": state_bytes,
+        })
+    shared = _shared_cache_bytes()
+    return {
+        "time": time.time(),
+        "sessions": sessions,
+        "sessions_managed": _can_manage_sessions(),
+        "session_state_bytes": sum(session["session_state_bytes"] for session in sessions),
+        **shared,
+        "shared_bytes": sum(shared.values()),
+        "figure_cache_entries": FIGURES.stats()["entries"],
+        "rss_bytes": _rss_bytes(),
+        "evicted_total": evicted_total,
+        "idle_timeout_seconds": IDLE_TIMEOUT_SECONDS,
+        "memory_cap_bytes": MEMORY_CAP_BYTES,
+    }
+
+
+def _close_sessions(runtime, session_ids):
+    if not _can_manage_sessions():
+        return
+    # Runtime.close_session must run on the event loop thread
+    def close():
+        for session_id in session_ids:
+            info = runtime._session_mgr.get_active_session_info(session_id)
+            runtime.close_session(session_id)
+            if info is not None and hasattr(info.client, "close"):
+                # Drop the websocket too, so the browser reconnects to a fresh session
+                info.client.close()
+
+    runtime._get_async_objs().eventloop.call_soon_threadsafe(close)
+
+
+def _trim_figures(report, cap_bytes=MEMORY_CAP_BYTES):
+    # The figure cache is the cheapest memory to give back: shrink it to the room the sessions
+    # and the other (bounded) shared caches leave
+    cached = report["figure_cache_bytes"]
+    room = cap_bytes - report["session_state_bytes"] - (report["shared_bytes"] - cached)
+    if cached <= room or not report["figure_cache_entries"]:
+        return
+    from streamlit.runtime.stats import safe_sizeof
+
+    FIGURES.trim(int(report["figure_cache_entries"] * max(room, 0) / cached))
+    report["figure_cache_entries"] = FIGURES.stats()["entries"]
+    report["figure_cache_bytes"] = safe_sizeof(FIGURES.specs())
+    report["shared_bytes"] += report["figure_cache_bytes"] - cached
+
+
+def sweep(runtime):
+    """Account, trim the figure cache, evict and (optionally) write the report; returns the report."""
+    global evicted_total
+    report = account(runtime)
+    _trim_figures(report)
+    now = time.monotonic()
+    sessions = [
+        (session["session_id"], now - session["idle_seconds"], session["session_state_bytes"])
+        for session in report["sessions"]
+    ]
+    evict = choose_evictions(sessions, now, shared_bytes=report["shared_bytes"])
+    if evict:
+        LOGGER.info("evicting %d idle session(s)", len(evict))
+        _close_sessions(runtime, evict)
+        with _lock:
+            for session_id in evict:
+                _last_active.pop(session_id, None)
+        evicted_total += len(evict)
+    # Forget sessions Streamlit has already dropped
+    live = {session["session_id"] for session in report["sessions"]}
+    with _lock:
+        for session_id in [sid for sid in _last_active if sid not in live]:
+            del _last_active[session_id]
+    report["evicted"] = evict
+    report["evicted_total"] = evicted_total
+    if REPORT_PATH:
+        tmp_path = f"{REPORT_PATH}.tmp"
+        with open(tmp_path, "w") as f:
+            json.dump(report, f)
+        os.replace(tmp_path, REPORT_PATH)
+    return report
+
+
+def _run_janitor():
+    from streamlit.runtime import Runtime
+
+    while True:
+        time.sleep(SWEEP_INTERVAL_SECONDS)
+        if Runtime.exists():
+            try:
+                sweep(Runtime.instance())
+            except Exception:
+                # Accounting must never take the server down; try again next sweep
+                LOGGER.exception("session sweep failed")
+
+
+def _start_janitor():
+    global _janitor
+    with _lock:
+        if _janitor is None:
+            _janitor = threading.Thread(target=_run_janitor, name="session-janitor", daemon=True)
+            _janitor.start()
@@ -0,0 +1,47 @@
+import pyarrow as pa
+import pyarrow.csv as pa_csv
+import pyarrow.parquet as pq
+import pytest
+
+import batch_quote
+
+
+def test_column_empty_in_a_later_chunk_keeps_the_first_chunks_type(tmp_path):
+    source = tmp_path / "prospects.csv"
+    lines = ["client,crm_id,automation"]
+    lines += [f"client {i},{1000 + i},{40 + i}" for i in range(10)]
+    lines += [f"client {i},,{40 + i}" for i in range(10, 20)]
+    source.write_text("\n".join(lines) + "\n")
+    output = tmp_path / "quotes.parquet"
+
+    batch_quote.run(str(source), str(output), chunksize=10)
+
+    table = pq.read_table(output)
+    assert table.num_rows == 20
+    assert str(table.schema.field("crm_id").type) == "int64"
+    crm_ids = table.column("crm_id").to_pylist()
+    assert crm_ids[:10] == list(range(1000, 1010))
+    assert crm_ids[10:] == [None] * 10
+
+
+@pytest.mark.parametrize("suffix", [".parquet", ".csv"])
+def test_column_empty_in_the_first_chunk_takes_text_from_later_chunks(tmp_path, suffix):
+    source = tmp_path / "prospects.csv"
+    lines = ["client,notes,automation"]
+    lines += [f"client {i},,{40 + i}" for i in range(10)]
+    lines += [f"client {i},hello,{40 + i}" for i in range(10, 15)]
+    lines += [f"client {i},{i},{40 + i}" for i in range(15, 20)]
+    source.write_text("\n".join(lines) + "\n")
+    output = tmp_path / f"quotes{suffix}"
+
+    batch_quote.run(str(source), str(output), chunksize=10)
+
+    if suffix == ".parquet":
+        table = pq.read_table(output)
+    else:
+        table = pa_csv.read_csv(output, convert_options=pa_csv.ConvertOptions(column_types={"notes": pa.string()}))
+    assert table.num_rows == 20
+    notes = table.column("notes").to_pylist()
+    assert notes[10:] == ["hello"] * 5 + [str(i) for i in range(15, 20)]
+    assert all(note in (None, "") for note in notes[:10])
+    assert table.column("net_savings").type == pa.float64()
@@ -0,0 +1,35 @@
+import pytest
+
+import roi_engine
+
+# The dashboard's numbers for DEFAULT_INPUTS, from the calculation as it stood in app.py
+DIRECT = {
+    "ai_cost": 23382.0,
+    "ai_enabled_cost": 65080.446725,
+    "baseline_human_cost": 79396.89345,
+    "net_savings": 14316.446725,
+    "investment_roi": 5106.435738,
+}
+WITH_INDIRECTS = {"value_basis": 59165.6700875, "roi_percent": 90.91159182958113, "payback_days": 7.605761911163953}
+WITHOUT_INDIRECTS = {"value_basis": 14316.446725, "roi_percent": 21.998076911633248, "payback_days": 31.43238043935793}
+HR_IMPACT = {
+    "recruiting_savings": 60000.0,
+    "absentee_cost": 4496.538461538462,
+    "seasonal_savings": 1168.94964375,
+    "strategic_total": 65665.48810528846,
+}
+
+
+@pytest.mark.parametrize("use_indirects", [True, False])
+@pytest.mark.parametrize("use_hr_impact", [True, False])
+def test_default_inputs_match_the_dashboard(use_indirects, use_hr_impact):
+    inputs = dict(roi_engine.DEFAULT_INPUTS, use_indirects=use_indirects, use_hr_impact=use_hr_impact)
+
+    outputs = roi_engine.compute_scalar(inputs)
+
+    expected = dict(DIRECT)
+    expected.update(WITH_INDIRECTS if use_indirects else WITHOUT_INDIRECTS)
+    expected.update(HR_IMPACT if use_hr_impact else dict.fromkeys(HR_IMPACT, 0.0))
+    assert set(outputs) == set(roi_engine.OUTPUT_FIELDS)
+    for name, value in expected.items():
+        assert outputs[name] == pytest.approx(value, rel=1e-12), name
@@ -0,0 +1,277 @@
+"""Per-section wall time and payload bytes of each dashboard run.
+
+app.py wraps each stage (asset loading, the calculation, each metric
+group, each chart) in ``section(name)``. A run that is not enabled costs
+one thread-local lookup per section: ``section`` hands back a shared no-op
+context manager. An enabled run records ``perf_counter`` time per section
+and the bytes of the messages the script sent to the browser while the
+section was open, so time in Pillow, figure serialization and websocket
+payload can be told apart.
+
+Streamlit has no public hook for outgoing messages, so bytes are counted
+by wrapping ``ScriptRunContext._enqueue``, a private dataclass field
+(one ``ForwardMsg`` argument). That is only done on the Streamlit
+versions it was checked against (``ENQUEUE_HOOK_VERSIONS``) and when the
+field is there; otherwise runs are timed without byte counts.
+
+Finished runs are logged as one JSON line on the ``connexus.timings``
+logger and added to process-wide totals, exported in the Prometheus text
+format by ``prometheus_text``. Setting ``CONNEXUS_DEBUG_TIMINGS=1`` times
+(and logs to stderr) every run of every session.
+"""
+import contextlib
+import functools
+import json
+import logging
+import os
+import threading
+import time
+from importlib import metadata
+
+LOGGER = logging.getLogger("connexus.timings")
+ENABLED_FOR_ALL = os.environ.get("CONNEXUS_DEBUG_TIMINGS") == "1"
+if ENABLED_FOR_ALL and not LOGGER.handlers:
+    LOGGER.addHandler(logging.StreamHandler())
+    LOGGER.setLevel(logging.INFO)
+
+# [first, last] Streamlit (major, minor) whose ScriptRunContext._enqueue is wrapped to count bytes
+ENQUEUE_HOOK_VERSIONS = ((1, 65), (1, 65))
+
+_NULL_SECTION = contextlib.nullcontext()
+_state = threading.local()
+
+
+class RunTimings:
+    """Sections of one script (or fragment) run, in the order they first opened."""
+
+    def __init__(self, kind):
+        self.kind = kind
+        self.started = time.perf_counter()
+        self.seconds = 0.0
+        self.bytes_sent = 0
+        self.messages = 0
+        self.bytes_counted = False
+        self.sections = {}
+        self._ctx = None
+
+    @contextlib.contextmanager
+    def section(self, name):
+        began, bytes_before = time.perf_counter(), self.bytes_sent
+        try:
+            yield
+        finally:
+            entry = self.sections.setdefault(name, [0.0, 0, 0])
+            entry[0] += time.perf_counter() - began
+            entry[1] += self.bytes_sent - bytes_before
+            entry[2] += 1
+
+    def as_dict(self):
+        return {
+            "kind": self.kind,
+            "seconds": self.seconds,
+            "bytes": self.bytes_sent,
+            "messages": self.messages,
+            "bytes_counted": self.bytes_counted,
+            "sections": {
+                name: {"seconds": seconds, "bytes": sent, "calls": calls}
+                for name, (seconds, sent, calls) in self.sections.items()
+            },
+        }
+
+    def _count_enqueued(self, ctx):
+        original = ctx._enqueue
+
+        def enqueue(msg):
+            self.bytes_sent += msg.ByteSize()
+            self.messages += 1
+            original(msg)
+
+        enqueue.original = original
+        ctx._enqueue = enqueue
+        self._ctx = ctx
+        self.bytes_counted = True
+
+    def _restore_enqueue(self):
+        if self._ctx is not None:
+            self._ctx._enqueue = self._ctx._enqueue.original
+            self._ctx = None
+
+
+class TimingTotals:
+    """Process-wide totals per section over every enabled run, shared by all sessions."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.runs = {}
+        self.sections = {}
+
+    def add(self, run):
+        with self._lock:
+            totals = self.runs.setdefault(run.kind, [0.0, 0, 0])
+            totals[0] += run.seconds
+            totals[1] += run.bytes_sent
+            totals[2] += 1
+            for name, (seconds, sent, calls) in run.sections.items():
+                entry = self.sections.setdefault(name, [0.0, 0, 0])
+                entry[0] += seconds
+                entry[1] += sent
+                entry[2] += calls
+
+    def snapshot(self):
+        with self._lock:
+            return ({kind: tuple(v) for kind, v in self.runs.items()},
+                    {name: tuple(v) for name, v in self.sections.items()})
+
+    def clear(self):
+        with self._lock:
+            self.runs.clear()
+            self.sections.clear()
+
+
+TOTALS = TimingTotals()
+
+
+def begin_run(enabled, kind="script"):
+    """Start timing a run on this thread; returns it, or None when timing is off."""
+    previous = getattr(_state, "run", None)
+    if previous is not None:
+        # The last run stopped early (st.rerun, st.stop or an exception) and was never finished
+        previous._restore_enqueue()
+    _state.run = None
+    if not enabled:
+        return None
+
+    from streamlit.runtime.scriptrunner import get_script_run_ctx
+
+    run = RunTimings(kind)
+    ctx = get_script_run_ctx()
+    if ctx is not None and _can_wrap_enqueue() and callable(getattr(ctx, "_enqueue", None)):
+        run._count_enqueued(ctx)
+    _state.run = run
+    return run
+
+
+@functools.cache
+def streamlit_version():
+    """Installed Streamlit as ``(major, minor)``, or None when it can't be told."""
+    try:
+        return tuple(int(part) for part in metadata.version("streamlit").split(".")[:2])
+    except (metadata.PackageNotFoundError, ValueError):
+        return None
+
+
+@functools.cache
+def _can_wrap_enqueue():
+    version = streamlit_version()
+    first, last = ENQUEUE_HOOK_VERSIONS
+    if version is not None and first <= version <= last:
+        return True
+    LOGGER.warning("Streamlit %s isn't in ENQUEUE_HOOK_VERSIONS: timing runs without byte counts", version)
+    return False
+
+
+def end_run():
+    """Finish the run on this thread: log it, add it to ``TOTALS`` and return it."""
+    run = getattr(_state, "run", None)
+    if run is None:
+        return None
+    _state.run = None
+    run._restore_enqueue()
+    run.seconds = time.perf_counter() - run.started
+    TOTALS.add(run)
+    if LOGGER.isEnabledFor(logging.INFO):
+        LOGGER.info(json.dumps(run.as_dict()))
+    return run
+
+
+def current():
+    return getattr(_state, "run", None)
+
+
+def section(name):
+    """Context manager timing ``name`` in the current run (no-op when timing is off)."""
+    run = getattr(_state, "run", None)
+    if run is None:
+        return _NULL_SECTION
+    return run.section(name)
+
+
+def laps(prefix):
+    """Callable that records the time since the previous lap as ``prefix.<name>``.
+
+    For straight-line code with numbered steps, where wrapping every step in
+    a ``with`` block would re-indent it: app.py passes one to the engine
+    (``roi_engine.compute(..., lap=...)``). No-op when timing is off.
+    """
+    run = getattr(_state, "run", None)
+    if run is None:
+        return _no_lap
+    last = [time.perf_counter()]
+
+    def lap(name):
+        now = time.perf_counter()
+        entry = run.sections.setdefault(f"{prefix}.{name}", [0.0, 0, 0])
+        entry[0] += now - last[0]
+        entry[2] += 1
+        last[0] = now
+
+    return lap
+
+
+def _no_lap(name):
+    pass
+
+
+def instrumented(name, is_enabled):
+    """Decorator for fragment functions.
+
+    Inside a full-page run the fragment is one section of it; when the
+    fragment reruns on its own it is timed as a run of kind ``fragment:<name>``
+    if ``is_enabled()`` says so.
+    """
+    def decorate(func):
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            if current() is not None:
+                with section(name):
+                    return func(*args, **kwargs)
+            if not is_enabled():
+                return func(*args, **kwargs)
+            run = begin_run(True, kind=f"fragment:{name}")
+            try:
+                with run.section(name):
+                    return func(*args, **kwargs)
+            finally:
+                end_run()
+        return wrapper
+    return decorate
+
+
+def _label(value):
+    return value.replace("\\", "\\\\").replace('"', '\\"')
+
+
+def prometheus_text(totals=TOTALS):
+    """Process-wide totals in the Prometheus text exposition format."""
+    runs, sections = totals.snapshot()
+    lines = [
+        "# HELP connexus_runs_total Timed dashboard runs, by kind (script or fragment).",
+        "# TYPE connexus_runs_total counter",
+        *(f'connexus_runs_total{{kind="{_label(kind)}"}} {calls}' for kind, (_, _, calls) in runs.items()),
+        "# HELP connexus_run_seconds_total Wall time of timed dashboard runs.",
+        "# TYPE connexus_run_seconds_total counter",
+        *(f'connexus_run_seconds_total{{kind="{_label(kind)}"}} {seconds:.6f}' for kind, (seconds, _, _) in runs.items()),
+        "# HELP connexus_run_bytes_total Bytes sent to the browser by timed runs.",
+        "# TYPE connexus_run_bytes_total counter",
+        *(f'connexus_run_bytes_total{{kind="{_label(kind)}"}} {sent}' for kind, (_, sent, _) in runs.items()),
+        "# HELP connexus_section_calls_total Times each dashboard section ran.",
+        "# TYPE connexus_section_calls_total counter",
+        *(f'connexus_section_calls_total{{section="{_label(name)}"}} {calls}' for name, (_, _, calls) in sections.items()),
+        "# HELP connexus_section_seconds_total Wall time spent in each dashboard section.",
+        "# TYPE connexus_section_seconds_total counter",
+        *(f'connexus_section_seconds_total{{section="{_label(name)}"}} {seconds:.6f}' for name, (seconds, _, _) in sections.items()),
+        "# HELP connexus_section_bytes_total Bytes sent to the browser while each section ran.",
+        "# TYPE connexus_section_bytes_total counter",
+        *(f'connexus_section_bytes_total{{section="{_label(name)}"}} {sent}' for name, (_, sent, _) in sections.items()),
+    ]
+    return "\n".join(lines) + "\n"